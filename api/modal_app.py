@@ -1,6 +1,20 @@
 """Modal app for SALT-AMT calculator API."""
 
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
 import modal
+from fastapi import Response
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 # Create the Modal app
 app = modal.App("salt-amt-api")
@@ -14,6 +28,7 @@ image = (
         "numpy>=1.24.0",
         "pydantic>=2.0.0",
         "fastapi>=0.100.0",
+        "orjson>=3.9.0",
     )
     .add_local_dir("salt_amt_api", remote_path="/root/salt_amt_api")
 )
@@ -26,17 +41,353 @@ def health():
     return {"status": "healthy", "service": "salt-amt-api"}
 
 
+# Each container publishes a snapshot of its metrics here every
+# METRICS_PUBLISH_SECONDS once it has handled a request; the metrics
+# endpoint combines them
+METRICS_PUBLISH_SECONDS = 5
+metrics_store = modal.Dict.from_name("salt-amt-metrics", create_if_missing=True)
+_container_id = os.environ.get("MODAL_TASK_ID") or uuid.uuid4().hex
+_metrics_publisher = None
+_metrics_lock = threading.Lock()
+
+
+@app.function(image=image, timeout=120)
+@modal.fastapi_endpoint(method="GET")
+def metrics() -> Response:
+    """Prometheus metrics, combined across the service's containers."""
+    import sys
+    sys.path.insert(0, "/root")
+
+    from salt_amt_api.prometheus import (
+        PROMETHEUS_MEDIA_TYPE,
+        RETIRED_KEY,
+        render_metrics,
+        retire_snapshots,
+    )
+
+    snapshots = dict(metrics_store.items())
+    retired, stale = retire_snapshots(snapshots)
+    if retired is not None:
+        metrics_store.put(RETIRED_KEY, retired)
+        snapshots[RETIRED_KEY] = retired
+        for key in stale:
+            del snapshots[key]
+            try:
+                metrics_store.pop(key)
+            except KeyError:
+                pass  # Retired by a concurrent scrape
+    return Response(
+        render_metrics(list(snapshots.values())), media_type=PROMETHEUS_MEDIA_TYPE
+    )
+
+
+def _publish_metrics():
+    """Publish this container's metrics every METRICS_PUBLISH_SECONDS."""
+    from salt_amt_api.prometheus import collect
+
+    while True:
+        time.sleep(METRICS_PUBLISH_SECONDS)
+        try:
+            metrics_store.put(_container_id, collect(_result_cache))
+        except Exception:
+            logger.exception("Publishing metrics failed")
+
+
+def _instrumented(endpoint: str):
+    """Count, time and track in flight the requests a handler serves.
+
+    Requests that fail validation are answered with a 422 rather than a 500.
+    """
+
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(request: dict):
+            import sys
+            sys.path.insert(0, "/root")
+
+            from fastapi import HTTPException
+            from pydantic import ValidationError
+            from salt_amt_api.prometheus import observe_request
+
+            global _metrics_publisher
+            with _metrics_lock:
+                # Served locally, there is no store to publish to
+                if _metrics_publisher is None and not modal.is_local():
+                    _metrics_publisher = threading.Thread(
+                        target=_publish_metrics, daemon=True
+                    )
+                    _metrics_publisher.start()
+            with observe_request(endpoint):
+                try:
+                    return handler(request)
+                except ValidationError as e:
+                    detail = e.errors(
+                        include_url=False, include_context=False, include_input=False
+                    )
+                    raise HTTPException(status_code=422, detail=detail) from e
+
+        return wrapper
+
+    return decorator
+
+
+# Requests with ``profile`` set write a per-variable report and folded stacks
+# here, and log the slowest variables
+PROFILE_DIR = "/tmp/salt-amt-profiles"
+PROFILE_LOG_ROWS = 20
+
+
+@contextlib.contextmanager
+def _profiled(enabled: bool, endpoint: str):
+    """Profile the simulations run in the block if the request asked to."""
+    if not enabled:
+        yield
+        return
+
+    from salt_amt_api.simulation.profiling import profile_request
+
+    name = f"{endpoint}-{uuid.uuid4().hex[:12]}"
+    with profile_request(PROFILE_DIR, name) as profiler:
+        yield
+    logger.info(profiler.report(top=PROFILE_LOG_ROWS))
+    logger.info("Profile written to %s", ", ".join(profiler.paths))
+
+
+# Requests with ``memory`` set report their memory use in the response,
+# with the allocation sites holding the most memory at the end
+MEMORY_TOP_SITES = 10
+
+
+@contextlib.contextmanager
+def _memory_monitored(enabled: bool, endpoint: str):
+    """Monitor memory in the block if the request asked to.
+
+    Yields a dict that holds the report under ``memory`` once the block
+    exits, to merge into the response. Reports are also exported to the
+    memory metrics and logged.
+    """
+    metadata = {}
+    if not enabled:
+        yield metadata
+        return
+
+    from salt_amt_api.models import MemoryReport
+    from salt_amt_api.simulation.memory import MemoryMonitor, record_memory
+
+    with MemoryMonitor(top=MEMORY_TOP_SITES) as monitor:
+        yield metadata
+    report = MemoryReport(**monitor.report()).model_dump()
+    record_memory(endpoint, report)
+    logger.info(json.dumps({"endpoint": endpoint, "memory": report}))
+    metadata["memory"] = report
+
+
+def _serialize(model, result: dict) -> bytes:
+    """Encode ``result`` as a ``model`` response, without validating it.
+
+    Results are built by the calculation functions, whose output the contract
+    tests check against the response models.
+    """
+    from salt_amt_api.serialization import encode_response
+    from salt_amt_api.simulation.memory import stage
+
+    with stage("serialization"):
+        return encode_response(model, result)
+
+
+def _json_response(body: bytes, metadata: dict) -> Response:
+    """Return an encoded response, with any request metadata added."""
+    from salt_amt_api.serialization import JSON_MEDIA_TYPE, add_fields
+
+    return Response(add_fields(body, metadata), media_type=JSON_MEDIA_TYPE)
+
+
+# Axis requests are admitted if their estimated cost is within this share of
+# their function's timeout, leaving room for the estimate to be off.
+# Requests queued instead run in ``run_queued``, under its timeout.
+AXIS_TIMEOUT = 600
+TWO_AXES_TIMEOUT = 900
+QUEUE_TIMEOUT = 3600
+ADMISSION_TIMEOUT_SHARE = 0.5
+_queued = contextvars.ContextVar("queued", default=False)
+
+
+def _resolve_counts(endpoint: str, req):
+    """Choose an auto-resolution request's counts from the calibration table.
+
+    Raises a 422 for requests no calibrated counts can serve.
+    """
+    if req.resolution != "auto":
+        return req
+
+    from fastapi import HTTPException
+    from salt_amt_api.calibration import resolve_counts
+
+    try:
+        return resolve_counts(endpoint, req)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+
+def _admit(endpoint: str, req, timeout: int) -> dict:
+    """Decide how to serve a request from its estimated cost.
+
+    Raises a 413 for rejected requests. Requests already running queued,
+    or served locally without a queue, are not queued again.
+    """
+    from fastapi import HTTPException
+    from salt_amt_api.admission import admit
+
+    if _queued.get():
+        timeout = QUEUE_TIMEOUT
+    queue_budget = None
+    if not _queued.get() and not modal.is_local():
+        queue_budget = QUEUE_TIMEOUT * ADMISSION_TIMEOUT_SHARE
+    decision = admit(endpoint, req, timeout * ADMISSION_TIMEOUT_SHARE, queue_budget)
+    if decision["action"] == "reject":
+        raise HTTPException(status_code=413, detail=_admission_report(decision))
+    return decision
+
+
+def _admission_report(decision: dict) -> dict:
+    from salt_amt_api.models import AdmissionReport
+
+    return AdmissionReport(
+        action=decision["action"],
+        estimate=decision["estimate"],
+        budget_seconds=decision["budget_seconds"],
+        counts=decision["counts"],
+    ).model_dump()
+
+
+def _admission_fields(decision: dict) -> dict:
+    """Return the fields reporting a downscaled request's admission."""
+    if decision["action"] != "downscale":
+        return {}
+    return {"admission": _admission_report(decision)}
+
+
+def _queue(handler: str, request: dict, decision: dict) -> Response:
+    """Spawn a request to run asynchronously and return its job."""
+    from salt_amt_api.models import QueuedResponse
+    from salt_amt_api.serialization import JSON_MEDIA_TYPE
+
+    call = run_queued.spawn(handler, request)
+    body = _serialize(
+        QueuedResponse,
+        {
+            "job_id": call.object_id,
+            "status": "queued",
+            "admission": _admission_report(decision),
+        },
+    )
+    return Response(body, status_code=202, media_type=JSON_MEDIA_TYPE)
+
+
+# Concurrent single-point requests in one container are micro-batched into
+# one simulation per scenario and reform
+SINGLE_POINT_MAX_BATCH_SIZE = 64
+SINGLE_POINT_MAX_WAIT = 0.005  # seconds
+_single_point_batcher = None
+_batcher_lock = threading.Lock()
+
+# Recent results, shared by requests that reduce to the same calculation
+# (such as either baseline scenario with the same policy config). Bounded
+# by size as well as count, as dense two-axes grids run to hundreds of
+# megabytes in a 4GB container; results over the entry limit are only
+# shared with requests waiting for them
+RESULT_CACHE_SIZE = 256
+RESULT_CACHE_BYTES = 512 * 2**20
+RESULT_CACHE_ENTRY_BYTES = 32 * 2**20
+_result_cache = None
+
+# Precomputed axis results for stock households, built offline with
+# ``python -m salt_amt_api.atlas`` and uploaded to this volume
+ATLAS_DIR = "/atlas"
+atlas_volume = modal.Volume.from_name("salt-amt-atlas", create_if_missing=True)
+_atlas = None
+_atlas_loaded = False
+
+
+def _atlas_result(endpoint: str, req, reform_params):
+    """Return the atlas entry for a request, or None if it has none."""
+    from salt_amt_api.atlas import load_atlas
+
+    global _atlas, _atlas_loaded
+    with _batcher_lock:
+        if not _atlas_loaded:
+            _atlas = load_atlas(ATLAS_DIR)
+            _atlas_loaded = True
+    if _atlas is None:
+        return None
+    return _atlas.lookup_request(endpoint, req, reform_params)
+
+
+def _shared_result(endpoint: str, req, reform_params, compute):
+    """Return ``compute()``, sharing its result with equivalent requests.
+
+    Requests matching a precomputed atlas entry are answered from it.
+    Profiled and memory-monitored requests always run, so their reports
+    cover the calculation. Low-memory requests also always run: their
+    float32 outputs should neither be served to other requests nor be
+    served full-precision results held in memory.
+    """
+    from salt_amt_api.simulation.dedup import ResultCache, request_key
+
+    global _result_cache
+    if req.profile or req.memory or getattr(req, "low_memory", False):
+        return compute()
+    with _batcher_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache(
+                RESULT_CACHE_SIZE, RESULT_CACHE_BYTES, RESULT_CACHE_ENTRY_BYTES
+            )
+    # Fields that only change how the result is presented or computed are
+    # left out
+    inputs = req.model_dump(
+        exclude={
+            "baseline_scenario",
+            "policy_config",
+            "profile",
+            "memory",
+            "encoding",
+            "tolerance",
+            "resolution",
+            "max_error",
+            "oversize",
+        }
+    )
+    key = request_key(endpoint, inputs, req.baseline_scenario, reform_params)
+
+    def lookup_or_compute():
+        result = _atlas_result(endpoint, req, reform_params)
+        return compute() if result is None else result
+
+    return _result_cache.get_or_compute(key, lookup_or_compute)
+
+
 @app.function(image=image, timeout=300)
+@modal.concurrent(max_inputs=SINGLE_POINT_MAX_BATCH_SIZE)
 @modal.fastapi_endpoint(method="POST")
-def calculate_single(request: dict) -> dict:
+@_instrumented("single")
+def calculate_single(request: dict) -> Response:
     """Calculate tax values for a single household configuration."""
     import sys
     sys.path.insert(0, "/root")
 
     from salt_amt_api.models import SinglePointRequest, SinglePointResponse
+    from salt_amt_api.simulation.batching import MicroBatcher
     from salt_amt_api.simulation.calculation import calculate_single_point
     from salt_amt_api.simulation.reforms import get_reform_params_from_config
 
+    global _single_point_batcher
+    with _batcher_lock:
+        if _single_point_batcher is None:
+            _single_point_batcher = MicroBatcher(
+                max_batch_size=SINGLE_POINT_MAX_BATCH_SIZE,
+                max_wait=SINGLE_POINT_MAX_WAIT,
+            )
+
     # Parse request
     req = SinglePointRequest(**request)
 
@@ -45,138 +396,607 @@ def calculate_single(request: dict) -> dict:
     if req.policy_config:
         reform_params = get_reform_params_from_config(req.policy_config.model_dump())
 
-    result = calculate_single_point(
-        state_code=req.household.state_code,
-        real_estate_taxes=req.household.real_estate_taxes,
-        is_married=req.household.is_married,
-        num_children=req.household.num_children,
-        child_ages=req.household.child_ages,
-        qualified_dividend_income=req.household.qualified_dividend_income,
-        long_term_capital_gains=req.household.long_term_capital_gains,
-        short_term_capital_gains=req.household.short_term_capital_gains,
-        deductible_mortgage_interest=req.household.deductible_mortgage_interest,
-        charitable_cash_donations=req.household.charitable_cash_donations,
-        employment_income=req.household.employment_income,
-        baseline_scenario=req.baseline_scenario,
-        reform_params=reform_params,
+    def compute():
+        if req.profile or req.memory or req.years:
+            # Profiled, monitored and multi-year requests get their own simulation
+            # rather than a place in a shared 2026 batch
+            return calculate_single_point(
+                **req.household.model_dump(),
+                baseline_scenario=req.baseline_scenario,
+                reform_params=reform_params,
+                years=req.years,
+            )
+        return _single_point_batcher.calculate(
+            req.household.model_dump(),
+            baseline_scenario=req.baseline_scenario,
+            reform_params=reform_params,
+        )
+
+    with (
+        _memory_monitored(req.memory, "single") as metadata,
+        _profiled(req.profile, "single"),
+    ):
+        result = _shared_result("single", req, reform_params, compute)
+
+        response = _serialize(SinglePointResponse, result)
+
+    return _json_response(response, metadata)
+
+
+@app.function(image=image, timeout=300)
+@modal.fastapi_endpoint(method="POST")
+@_instrumented("sensitivity")
+def calculate_sensitivity(request: dict) -> Response:
+    """Calculate per-input sensitivities of a single household."""
+    import sys
+    sys.path.insert(0, "/root")
+
+    from salt_amt_api.models import SensitivityRequest, SensitivityResponse
+    from salt_amt_api.simulation.calculation import (
+        calculate_sensitivity as calc_sensitivity,
     )
+    from salt_amt_api.simulation.reforms import get_reform_params_from_config
 
-    return SinglePointResponse(**result).model_dump()
+    req = SensitivityRequest(**request)
 
+    reform_params = None
+    if req.policy_config:
+        reform_params = get_reform_params_from_config(req.policy_config.model_dump())
 
-@app.function(image=image, timeout=600)
+    with (
+        _memory_monitored(req.memory, "sensitivity") as metadata,
+        _profiled(req.profile, "sensitivity"),
+    ):
+        result = _shared_result(
+            "sensitivity",
+            req,
+            reform_params,
+            lambda: calc_sensitivity(
+                state_code=req.household.state_code,
+                real_estate_taxes=req.household.real_estate_taxes,
+                is_married=req.household.is_married,
+                num_children=req.household.num_children,
+                child_ages=req.household.child_ages,
+                qualified_dividend_income=req.household.qualified_dividend_income,
+                long_term_capital_gains=req.household.long_term_capital_gains,
+                short_term_capital_gains=req.household.short_term_capital_gains,
+                deductible_mortgage_interest=req.household.deductible_mortgage_interest,
+                charitable_cash_donations=req.household.charitable_cash_donations,
+                employment_income=req.household.employment_income,
+                baseline_scenario=req.baseline_scenario,
+                reform_params=reform_params,
+                delta=req.delta,
+            ),
+        )
+
+        response = _serialize(SensitivityResponse, result)
+
+    return _json_response(response, metadata)
+
+
+@app.function(image=image, timeout=AXIS_TIMEOUT, volumes={ATLAS_DIR: atlas_volume})
 @modal.fastapi_endpoint(method="POST")
-def calculate_salt_axis(request: dict) -> dict:
+@_instrumented("salt_axis")
+def calculate_salt_axis(request: dict) -> Response:
     """Calculate tax values along the SALT axis (varying SALT, fixed income)."""
     import sys
     sys.path.insert(0, "/root")
 
-    from salt_amt_api.models import SaltAxisRequest, AxisResponse
+    from salt_amt_api.models import (
+        SaltAxisRequest,
+        AxisResponse,
+        EncodedAxisResponse,
+    )
+    from salt_amt_api.simulation.encoding import encode_axis_result
     from salt_amt_api.simulation.calculation import calculate_salt_axis as calc_salt_axis
     from salt_amt_api.simulation.reforms import get_reform_params_from_config
 
-    req = SaltAxisRequest(**request)
+    req = _resolve_counts("salt_axis", SaltAxisRequest(**request))
+    decision = _admit("salt_axis", req, AXIS_TIMEOUT)
+    if decision["action"] == "queue":
+        return _queue("calculate_salt_axis", request, decision)
+    req = decision["request"]
 
     reform_params = None
     if req.policy_config:
         reform_params = get_reform_params_from_config(req.policy_config.model_dump())
 
-    result = calc_salt_axis(
-        is_married=req.household.is_married,
-        state_code=req.household.state_code,
-        num_children=req.household.num_children,
-        child_ages=req.household.child_ages,
-        qualified_dividend_income=req.household.qualified_dividend_income,
-        long_term_capital_gains=req.household.long_term_capital_gains,
-        short_term_capital_gains=req.household.short_term_capital_gains,
-        deductible_mortgage_interest=req.household.deductible_mortgage_interest,
-        charitable_cash_donations=req.household.charitable_cash_donations,
-        employment_income=req.household.employment_income,
-        baseline_scenario=req.baseline_scenario,
-        reform_params=reform_params,
-        min_salt=req.min_salt,
-        max_salt=req.max_salt,
-        count=req.count,
+    with (
+        _memory_monitored(req.memory, "salt_axis") as metadata,
+        _profiled(req.profile, "salt_axis"),
+    ):
+        result = _shared_result(
+            "salt_axis",
+            req,
+            reform_params,
+            lambda: calc_salt_axis(
+                is_married=req.household.is_married,
+                state_code=req.household.state_code,
+                num_children=req.household.num_children,
+                child_ages=req.household.child_ages,
+                qualified_dividend_income=req.household.qualified_dividend_income,
+                long_term_capital_gains=req.household.long_term_capital_gains,
+                short_term_capital_gains=req.household.short_term_capital_gains,
+                deductible_mortgage_interest=req.household.deductible_mortgage_interest,
+                charitable_cash_donations=req.household.charitable_cash_donations,
+                employment_income=req.household.employment_income,
+                baseline_scenario=req.baseline_scenario,
+                reform_params=reform_params,
+                min_salt=req.min_salt,
+                max_salt=req.max_salt,
+                count=req.count,
+                marginal_rates=req.marginal_rates,
+                marginal_delta=req.marginal_delta,
+                prune=req.prune,
+                years=req.years,
+            ),
+        )
+
+        if req.encoding == "breakpoints":
+            response = _serialize(
+                EncodedAxisResponse, encode_axis_result(result, req.tolerance)
+            )
+        else:
+            response = _serialize(AxisResponse, result)
+
+    return _json_response(response, {**metadata, **_admission_fields(decision)})
+
+
+@app.function(image=image, timeout=AXIS_TIMEOUT, volumes={ATLAS_DIR: atlas_volume})
+@modal.fastapi_endpoint(method="POST")
+@_instrumented("income_axis")
+def calculate_income_axis(request: dict) -> Response:
+    """Calculate tax values along the income axis (varying income)."""
+    import sys
+    sys.path.insert(0, "/root")
+
+    from salt_amt_api.models import (
+        IncomeAxisRequest,
+        AxisResponse,
+        EncodedAxisResponse,
     )
+    from salt_amt_api.simulation.encoding import encode_axis_result
+    from salt_amt_api.simulation.calculation import calculate_income_axis as calc_income_axis
+    from salt_amt_api.simulation.reforms import get_reform_params_from_config
 
-    return AxisResponse(**result).model_dump()
+    req = _resolve_counts("income_axis", IncomeAxisRequest(**request))
+    decision = _admit("income_axis", req, AXIS_TIMEOUT)
+    if decision["action"] == "queue":
+        return _queue("calculate_income_axis", request, decision)
+    req = decision["request"]
 
+    reform_params = None
+    if req.policy_config:
+        reform_params = get_reform_params_from_config(req.policy_config.model_dump())
 
-@app.function(image=image, timeout=600)
+    with (
+        _memory_monitored(req.memory, "income_axis") as metadata,
+        _profiled(req.profile, "income_axis"),
+    ):
+        result = _shared_result(
+            "income_axis",
+            req,
+            reform_params,
+            lambda: calc_income_axis(
+                is_married=req.household.is_married,
+                state_code=req.household.state_code,
+                num_children=req.household.num_children,
+                child_ages=req.household.child_ages,
+                qualified_dividend_income=req.household.qualified_dividend_income,
+                long_term_capital_gains=req.household.long_term_capital_gains,
+                short_term_capital_gains=req.household.short_term_capital_gains,
+                deductible_mortgage_interest=req.household.deductible_mortgage_interest,
+                charitable_cash_donations=req.household.charitable_cash_donations,
+                baseline_scenario=req.baseline_scenario,
+                reform_params=reform_params,
+                min_income=req.min_income,
+                max_income=req.max_income,
+                count=req.count,
+                marginal_rates=req.marginal_rates,
+                marginal_delta=req.marginal_delta,
+                prune=req.prune,
+                years=req.years,
+            ),
+        )
+
+        if req.encoding == "breakpoints":
+            response = _serialize(
+                EncodedAxisResponse, encode_axis_result(result, req.tolerance)
+            )
+        else:
+            response = _serialize(AxisResponse, result)
+
+    return _json_response(response, {**metadata, **_admission_fields(decision)})
+
+
+@app.function(
+    image=image,
+    timeout=TWO_AXES_TIMEOUT,
+    memory=4096,
+    volumes={ATLAS_DIR: atlas_volume},
+)
 @modal.fastapi_endpoint(method="POST")
-def calculate_income_axis(request: dict) -> dict:
-    """Calculate tax values along the income axis (varying income)."""
+@_instrumented("two_axes")
+def calculate_two_axes(request: dict) -> Response:
+    """Calculate tax values on a 2D grid (SALT x income)."""
     import sys
     sys.path.insert(0, "/root")
 
-    from salt_amt_api.models import IncomeAxisRequest, AxisResponse
-    from salt_amt_api.simulation.calculation import calculate_income_axis as calc_income_axis
+    from salt_amt_api.models import TwoAxesRequest, TwoAxesResponse
+    from salt_amt_api.simulation.calculation import calculate_two_axes as calc_two_axes
     from salt_amt_api.simulation.reforms import get_reform_params_from_config
 
-    req = IncomeAxisRequest(**request)
+    req = _resolve_counts("two_axes", TwoAxesRequest(**request))
+    decision = _admit("two_axes", req, TWO_AXES_TIMEOUT)
+    if decision["action"] == "queue":
+        return _queue("calculate_two_axes", request, decision)
+    req = decision["request"]
 
     reform_params = None
     if req.policy_config:
         reform_params = get_reform_params_from_config(req.policy_config.model_dump())
 
-    result = calc_income_axis(
-        is_married=req.household.is_married,
-        state_code=req.household.state_code,
-        num_children=req.household.num_children,
-        child_ages=req.household.child_ages,
-        qualified_dividend_income=req.household.qualified_dividend_income,
-        long_term_capital_gains=req.household.long_term_capital_gains,
-        short_term_capital_gains=req.household.short_term_capital_gains,
-        deductible_mortgage_interest=req.household.deductible_mortgage_interest,
-        charitable_cash_donations=req.household.charitable_cash_donations,
-        baseline_scenario=req.baseline_scenario,
-        reform_params=reform_params,
-        min_income=req.min_income,
-        max_income=req.max_income,
-        count=req.count,
+    with (
+        _memory_monitored(req.memory, "two_axes") as metadata,
+        _profiled(req.profile, "two_axes"),
+    ):
+        result = _shared_result(
+            "two_axes",
+            req,
+            reform_params,
+            lambda: calc_two_axes(
+                is_married=req.household.is_married,
+                state_code=req.household.state_code,
+                num_children=req.household.num_children,
+                child_ages=req.household.child_ages,
+                qualified_dividend_income=req.household.qualified_dividend_income,
+                long_term_capital_gains=req.household.long_term_capital_gains,
+                short_term_capital_gains=req.household.short_term_capital_gains,
+                deductible_mortgage_interest=req.household.deductible_mortgage_interest,
+                charitable_cash_donations=req.household.charitable_cash_donations,
+                baseline_scenario=req.baseline_scenario,
+                reform_params=reform_params,
+                min_salt=req.min_salt,
+                max_salt=req.max_salt,
+                salt_count=req.salt_count,
+                min_income=req.min_income,
+                max_income=req.max_income,
+                income_count=req.income_count,
+                amt_screening=req.amt_screening,
+                verify_amt_screening=req.verify_amt_screening,
+                prune=req.prune,
+                years=req.years,
+                low_memory=req.low_memory,
+            ),
+        )
+
+        response = _serialize(TwoAxesResponse, result)
+
+    return _json_response(response, {**metadata, **_admission_fields(decision)})
+
+
+# Computed tiles are kept here for the life of the container
+TILE_DIR = "/tmp/salt-amt-tiles"
+
+
+@app.function(image=image, timeout=900, memory=4096)
+@modal.fastapi_endpoint(method="POST")
+@_instrumented("tiles")
+def calculate_tiles(request: dict) -> Response:
+    """Calculate or load the two-axes grid tiles covering a viewport."""
+    import sys
+    sys.path.insert(0, "/root")
+
+    from salt_amt_api.models import TilesRequest, TilesResponse
+    from salt_amt_api.simulation.tiles import TileStore
+    from salt_amt_api.simulation.tiles import calculate_tiles as calc_tiles
+    from salt_amt_api.simulation.reforms import get_reform_params_from_config
+
+    req = TilesRequest(**request)
+
+    reform_params = None
+    if req.policy_config:
+        reform_params = get_reform_params_from_config(req.policy_config.model_dump())
+
+    with _memory_monitored(req.memory, "tiles") as metadata:
+        result = calc_tiles(
+            is_married=req.household.is_married,
+            state_code=req.household.state_code,
+            num_children=req.household.num_children,
+            child_ages=req.household.child_ages,
+            qualified_dividend_income=req.household.qualified_dividend_income,
+            long_term_capital_gains=req.household.long_term_capital_gains,
+            short_term_capital_gains=req.household.short_term_capital_gains,
+            deductible_mortgage_interest=req.household.deductible_mortgage_interest,
+            charitable_cash_donations=req.household.charitable_cash_donations,
+            min_salt=req.min_salt,
+            max_salt=req.max_salt,
+            min_income=req.min_income,
+            max_income=req.max_income,
+            resolution=req.resolution,
+            baseline_scenario=req.baseline_scenario,
+            reform_params=reform_params,
+            store=TileStore(TILE_DIR),
+        )
+
+        response = _serialize(TilesResponse, result)
+
+    return _json_response(response, metadata)
+
+
+@app.function(image=image, timeout=900)
+@modal.fastapi_endpoint(method="POST")
+@_instrumented("amt_frontier")
+def calculate_amt_frontier(request: dict) -> Response:
+    """Calculate the SALT level at which AMT starts to bind, per income."""
+    import sys
+    sys.path.insert(0, "/root")
+
+    from salt_amt_api.models import FrontierRequest, FrontierResponse
+    from salt_amt_api.simulation.solvers import (
+        calculate_amt_frontier as calc_amt_frontier,
     )
+    from salt_amt_api.simulation.reforms import get_reform_params_from_config
 
-    return AxisResponse(**result).model_dump()
+    req = FrontierRequest(**request)
 
+    reform_params = None
+    if req.policy_config:
+        reform_params = get_reform_params_from_config(req.policy_config.model_dump())
 
-@app.function(image=image, timeout=900, memory=4096)
+    with _memory_monitored(req.memory, "amt_frontier") as metadata:
+        result = calc_amt_frontier(
+            is_married=req.household.is_married,
+            state_code=req.household.state_code,
+            num_children=req.household.num_children,
+            child_ages=req.household.child_ages,
+            qualified_dividend_income=req.household.qualified_dividend_income,
+            long_term_capital_gains=req.household.long_term_capital_gains,
+            short_term_capital_gains=req.household.short_term_capital_gains,
+            deductible_mortgage_interest=req.household.deductible_mortgage_interest,
+            charitable_cash_donations=req.household.charitable_cash_donations,
+            baseline_scenario=req.baseline_scenario,
+            reform_params=reform_params,
+            min_salt=req.min_salt,
+            max_salt=req.max_salt,
+            min_income=req.min_income,
+            max_income=req.max_income,
+            income_count=req.income_count,
+            tolerance=req.tolerance,
+            scan_count=req.scan_count,
+        )
+
+        response = _serialize(FrontierResponse, result)
+
+    return _json_response(response, metadata)
+
+
+@app.function(image=image, timeout=900)
 @modal.fastapi_endpoint(method="POST")
-def calculate_two_axes(request: dict) -> dict:
-    """Calculate tax values on a 2D grid (SALT x income)."""
+@_instrumented("effective_salt_cap")
+def calculate_effective_salt_cap(request: dict) -> Response:
+    """Calculate the effective SALT cap and income tax kinks along SALT."""
     import sys
     sys.path.insert(0, "/root")
 
-    from salt_amt_api.models import TwoAxesRequest, TwoAxesResponse
-    from salt_amt_api.simulation.calculation import calculate_two_axes as calc_two_axes
+    from salt_amt_api.models import EffectiveSaltCapRequest, EffectiveSaltCapResponse
+    from salt_amt_api.simulation.solvers import (
+        calculate_effective_salt_cap as calc_effective_salt_cap,
+    )
+    from salt_amt_api.simulation.reforms import get_reform_params_from_config
+
+    req = EffectiveSaltCapRequest(**request)
+
+    reform_params = None
+    if req.policy_config:
+        reform_params = get_reform_params_from_config(req.policy_config.model_dump())
+
+    with _memory_monitored(req.memory, "effective_salt_cap") as metadata:
+        result = calc_effective_salt_cap(
+            is_married=req.household.is_married,
+            state_code=req.household.state_code,
+            num_children=req.household.num_children,
+            child_ages=req.household.child_ages,
+            qualified_dividend_income=req.household.qualified_dividend_income,
+            long_term_capital_gains=req.household.long_term_capital_gains,
+            short_term_capital_gains=req.household.short_term_capital_gains,
+            deductible_mortgage_interest=req.household.deductible_mortgage_interest,
+            charitable_cash_donations=req.household.charitable_cash_donations,
+            employment_incomes=req.employment_incomes
+            or [req.household.employment_income],
+            baseline_scenario=req.baseline_scenario,
+            reform_params=reform_params,
+            min_salt=req.min_salt,
+            max_salt=req.max_salt,
+            tolerance=req.tolerance,
+            delta=req.delta,
+            scan_count=req.scan_count,
+        )
+
+        response = _serialize(EffectiveSaltCapResponse, result)
+
+    return _json_response(response, metadata)
+
+
+@app.function(image=image, timeout=900)
+@modal.fastapi_endpoint(method="POST")
+@_instrumented("all_states")
+def calculate_all_states(request: dict) -> Response:
+    """Calculate one household profile in every state in a single simulation."""
+    import sys
+    sys.path.insert(0, "/root")
+
+    from salt_amt_api.models import AllStatesRequest, AllStatesResponse
+    from salt_amt_api.simulation.calculation import (
+        calculate_all_states as calc_all_states,
+    )
     from salt_amt_api.simulation.reforms import get_reform_params_from_config
 
-    req = TwoAxesRequest(**request)
+    req = AllStatesRequest(**request)
 
     reform_params = None
     if req.policy_config:
         reform_params = get_reform_params_from_config(req.policy_config.model_dump())
 
-    result = calc_two_axes(
-        is_married=req.household.is_married,
-        state_code=req.household.state_code,
-        num_children=req.household.num_children,
-        child_ages=req.household.child_ages,
-        qualified_dividend_income=req.household.qualified_dividend_income,
-        long_term_capital_gains=req.household.long_term_capital_gains,
-        short_term_capital_gains=req.household.short_term_capital_gains,
-        deductible_mortgage_interest=req.household.deductible_mortgage_interest,
-        charitable_cash_donations=req.household.charitable_cash_donations,
-        baseline_scenario=req.baseline_scenario,
-        reform_params=reform_params,
-        min_salt=req.min_salt,
-        max_salt=req.max_salt,
-        salt_count=req.salt_count,
-        min_income=req.min_income,
-        max_income=req.max_income,
-        income_count=req.income_count,
+    with _memory_monitored(req.memory, "all_states") as metadata:
+        result = calc_all_states(
+            is_married=req.household.is_married,
+            num_children=req.household.num_children,
+            child_ages=req.household.child_ages,
+            qualified_dividend_income=req.household.qualified_dividend_income,
+            long_term_capital_gains=req.household.long_term_capital_gains,
+            short_term_capital_gains=req.household.short_term_capital_gains,
+            deductible_mortgage_interest=req.household.deductible_mortgage_interest,
+            charitable_cash_donations=req.household.charitable_cash_donations,
+            employment_income=req.household.employment_income,
+            real_estate_taxes=req.household.real_estate_taxes,
+            baseline_scenario=req.baseline_scenario,
+            reform_params=reform_params,
+            state_codes=req.state_codes,
+            axis=req.axis,
+            min_salt=req.min_salt,
+            max_salt=req.max_salt,
+            min_income=req.min_income,
+            max_income=req.max_income,
+            count=req.count,
+        )
+
+        response = _serialize(AllStatesResponse, result)
+
+    return _json_response(response, metadata)
+
+
+@app.function(image=image, timeout=3600, cpu=8)
+@modal.fastapi_endpoint(method="POST")
+@_instrumented("policy_sweep")
+def calculate_policy_sweep(request: dict) -> Response:
+    """Calculate one household under many policy configurations."""
+    import sys
+    sys.path.insert(0, "/root")
+
+    from salt_amt_api.models import PolicySweepRequest, PolicySweepResponse
+    from salt_amt_api.simulation.sweep import (
+        calculate_policy_sweep as calc_policy_sweep,
+    )
+
+    req = PolicySweepRequest(**request)
+
+    policy_configs = None
+    if req.policy_configs is not None:
+        policy_configs = [config.model_dump() for config in req.policy_configs]
+
+    with _memory_monitored(req.memory, "policy_sweep") as metadata:
+        result = calc_policy_sweep(
+            state_code=req.household.state_code,
+            real_estate_taxes=req.household.real_estate_taxes,
+            is_married=req.household.is_married,
+            num_children=req.household.num_children,
+            child_ages=req.household.child_ages,
+            qualified_dividend_income=req.household.qualified_dividend_income,
+            long_term_capital_gains=req.household.long_term_capital_gains,
+            short_term_capital_gains=req.household.short_term_capital_gains,
+            deductible_mortgage_interest=req.household.deductible_mortgage_interest,
+            charitable_cash_donations=req.household.charitable_cash_donations,
+            employment_income=req.household.employment_income,
+            policy_configs=policy_configs,
+            baseline_scenario=req.baseline_scenario,
+            workers=8,
+        )
+
+        response = _serialize(PolicySweepResponse, result)
+
+    return _json_response(response, metadata)
+
+
+HANDLERS = {
+    "calculate_single": calculate_single,
+    "calculate_sensitivity": calculate_sensitivity,
+    "calculate_salt_axis": calculate_salt_axis,
+    "calculate_income_axis": calculate_income_axis,
+    "calculate_two_axes": calculate_two_axes,
+    "calculate_tiles": calculate_tiles,
+    "calculate_amt_frontier": calculate_amt_frontier,
+    "calculate_effective_salt_cap": calculate_effective_salt_cap,
+    "calculate_all_states": calculate_all_states,
+    "calculate_policy_sweep": calculate_policy_sweep,
+}
+
+
+@app.function(
+    image=image,
+    timeout=QUEUE_TIMEOUT,
+    memory=8192,
+    volumes={ATLAS_DIR: atlas_volume},
+)
+def run_queued(handler: str, request: dict) -> bytes:
+    """Run a request queued by admission control and return its response body."""
+    token = _queued.set(True)
+    try:
+        return HANDLERS[handler].local(request).body
+    finally:
+        _queued.reset(token)
+
+
+@app.function(image=image, timeout=120)
+@modal.fastapi_endpoint(method="GET")
+def job_result(job_id: str) -> Response:
+    """Return a queued request's response, or its status if it has none."""
+    import sys
+    sys.path.insert(0, "/root")
+
+    from salt_amt_api.models import QueuedResponse
+    from salt_amt_api.serialization import JSON_MEDIA_TYPE
+
+    try:
+        body = modal.FunctionCall.from_id(job_id).get(timeout=0)
+    except TimeoutError:
+        pending = _serialize(QueuedResponse, {"job_id": job_id, "status": "pending"})
+        return Response(pending, status_code=202, media_type=JSON_MEDIA_TYPE)
+    except Exception as e:
+        logger.exception("Queued job %s failed", job_id)
+        failed = _serialize(
+            QueuedResponse,
+            {"job_id": job_id, "status": "failed", "error": f"{type(e).__name__}: {e}"},
+        )
+        return Response(failed, media_type=JSON_MEDIA_TYPE)
+    return _json_response(body, {})
+
+
+def _local_route(function):
+    """Return a route calling a Modal function locally."""
+
+    def route(request: dict):
+        return function.local(request)
+
+    return route
+
+
+def local_app():
+    """Return a FastAPI app serving the handlers locally, standing in for Modal.
+
+    Each handler is served at ``/<function name>``, with health and this
+    process's metrics. Run with ``uvicorn modal_app:local_app --factory``.
+    """
+    from fastapi import FastAPI
+    from salt_amt_api.prometheus import (
+        PROMETHEUS_MEDIA_TYPE,
+        collect,
+        render_metrics,
     )
 
-    return TwoAxesResponse(**result).model_dump()
+    local = FastAPI(title="salt-amt-api (local)")
+    @local.get("/health")
+    def local_health():
+        return health.local()
+
+    @local.get("/metrics")
+    def local_metrics() -> Response:
+        content = render_metrics([collect(_result_cache)])
+        return Response(content, media_type=PROMETHEUS_MEDIA_TYPE)
+
+    for name, function in HANDLERS.items():
+        local.post(f"/{name}")(_local_route(function))
+    return local
 
 
 if __name__ == "__main__":
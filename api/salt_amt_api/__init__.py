@@ -5,20 +5,55 @@ from .models import (
     PolicyConfig,
     SinglePointRequest,
     SinglePointResponse,
+    SensitivityRequest,
+    SensitivityResponse,
     SaltAxisRequest,
     IncomeAxisRequest,
     TwoAxesRequest,
+    TilesRequest,
+    FrontierRequest,
+    EffectiveSaltCapRequest,
+    AllStatesRequest,
+    PolicySweepRequest,
     AxisResponse,
+    EncodedAxisResponse,
     TwoAxesResponse,
+    TilesResponse,
+    FrontierResponse,
+    EffectiveSaltCapResponse,
+    AllStatesResponse,
+    PolicySweepResponse,
 )
 from .simulation import (
     PolicyReforms,
     get_reform_params_from_config,
     calculate_single_point,
+    calculate_households,
+    calculate_sensitivity,
     calculate_salt_axis,
     calculate_income_axis,
     calculate_two_axes,
+    calculate_all_states,
+    calculate_tiles,
+    TileStore,
+    calculate_amt_frontier,
+    calculate_effective_salt_cap,
+    calculate_policy_sweep,
+    MicroBatcher,
+    ResultCache,
+    encode_axis_result,
+    decode_axis_result,
+    VariableProfiler,
+    profile_request,
+    MemoryMonitor,
+    memory_stats,
+    record_memory,
 )
+from .batch import run_batch
+from .atlas import Atlas, build_atlas, load_atlas
+from .calibration import auto_counts, calibrate
+from .admission import admit, estimate_cost, fit_cost_model
+from .serialization import encode_response
 
 __version__ = "0.1.0"
 
@@ -28,16 +63,61 @@ __all__ = [
     "PolicyConfig",
     "SinglePointRequest",
     "SinglePointResponse",
+    "SensitivityRequest",
+    "SensitivityResponse",
     "SaltAxisRequest",
     "IncomeAxisRequest",
     "TwoAxesRequest",
+    "TilesRequest",
+    "FrontierRequest",
+    "EffectiveSaltCapRequest",
+    "AllStatesRequest",
+    "PolicySweepRequest",
     "AxisResponse",
+    "EncodedAxisResponse",
     "TwoAxesResponse",
+    "TilesResponse",
+    "FrontierResponse",
+    "EffectiveSaltCapResponse",
+    "AllStatesResponse",
+    "PolicySweepResponse",
     # Simulation
     "PolicyReforms",
     "get_reform_params_from_config",
     "calculate_single_point",
+    "calculate_households",
+    "calculate_sensitivity",
     "calculate_salt_axis",
     "calculate_income_axis",
     "calculate_two_axes",
+    "calculate_all_states",
+    "calculate_tiles",
+    "TileStore",
+    "calculate_amt_frontier",
+    "calculate_effective_salt_cap",
+    "calculate_policy_sweep",
+    "MicroBatcher",
+    "ResultCache",
+    "encode_axis_result",
+    "decode_axis_result",
+    "VariableProfiler",
+    "profile_request",
+    "MemoryMonitor",
+    "memory_stats",
+    "record_memory",
+    # Batch
+    "run_batch",
+    # Atlas
+    "Atlas",
+    "build_atlas",
+    "load_atlas",
+    # Calibration
+    "calibrate",
+    "auto_counts",
+    # Admission control
+    "admit",
+    "estimate_cost",
+    "fit_cost_model",
+    # Serialization
+    "encode_response",
 ]
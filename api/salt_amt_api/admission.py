@@ -0,0 +1,350 @@
+"""Cost estimation and admission control for axis requests.
+
+The time a simulation takes grows with the people it simulates: households
+times persons per household, for each period, and the variables requested
+from them. ``estimate_cost`` applies a linear cost model over those sizes,
+fitted by ``fit_cost_model`` to timed benchmark calculations, before any
+simulation starts.
+
+``admit`` compares the estimate with a request's time budget. Requests
+within it are accepted; requests over it are accepted anyway, rejected,
+downscaled to the largest counts that fit, or queued to run asynchronously
+under a longer budget, as their ``oversize`` field asks. Requests that do
+not ask are rejected. Until a fitted cost model is written next to this
+module, the default coefficients are only a pessimistic guess, so requests
+that do not ask are rejected only beyond ``MAX_UNFITTED_POINTS``.
+
+Usage:
+    python -m salt_amt_api.admission cost_model.json --repeat 2
+"""
+
+import argparse
+import functools
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+from .atlas import calculation_arguments
+from .models import HouseholdInput, IncomeAxisRequest, SaltAxisRequest, TwoAxesRequest
+from .simulation.calculation import (
+    AXIS_VARIABLES,
+    TWO_AXES_VARIABLES,
+    calculate_income_axis,
+    calculate_salt_axis,
+    calculate_two_axes,
+)
+
+# Endpoint -> (calculation, request model, household variables calculated,
+# count fields whose product is the number of axis points)
+ENDPOINTS = {
+    "salt_axis": (
+        calculate_salt_axis,
+        SaltAxisRequest,
+        ["reported_salt", *AXIS_VARIABLES.values()],
+        ["count"],
+    ),
+    "income_axis": (
+        calculate_income_axis,
+        IncomeAxisRequest,
+        ["employment_income", *AXIS_VARIABLES.values()],
+        ["count"],
+    ),
+    "two_axes": (
+        calculate_two_axes,
+        TwoAxesRequest,
+        list(TWO_AXES_VARIABLES.values()),
+        ["income_count", "salt_count"],
+    ),
+}
+
+# Seconds for a simulation, plus seconds per person-period and per
+# person-period-variable. Deliberately pessimistic until replaced by a fit
+# to benchmarks on the serving containers, so requests are only turned away
+# with them when they ask to be or exceed MAX_UNFITTED_POINTS.
+DEFAULT_COST_MODEL = {
+    "fixed_seconds": 5.0,
+    "person_seconds": 2e-5,
+    "person_variable_seconds": 1e-5,
+}
+
+DEFAULT_COST_MODEL_PATH = Path(__file__).with_name("cost_model.json")
+
+# Fewest points on an axis a request is downscaled to
+MIN_COUNT = 2
+
+# Most axis points, over all periods, a request without an ``oversize`` is
+# served with while the cost model is unfitted: the default two-axes grid
+MAX_UNFITTED_POINTS = 1400 * 700
+
+# Benchmarked calculations: each endpoint at these counts, for each
+# household shape as (is_married, num_children)
+BENCHMARK_COUNTS = {
+    "salt_axis": [{"count": 200}, {"count": 1000}, {"count": 4000}],
+    "income_axis": [{"count": 200}, {"count": 1000}, {"count": 4000}],
+    "two_axes": [
+        {"income_count": 50, "salt_count": 40},
+        {"income_count": 200, "salt_count": 100},
+        {"income_count": 400, "salt_count": 250},
+    ],
+}
+BENCHMARK_HOUSEHOLDS = [(False, 0), (True, 0), (True, 3)]
+BENCHMARK_CHILD_AGES = [10, 8, 5]
+
+
+def cost_features(endpoint: str, request: BaseModel) -> dict:
+    """Return the sizes a request's cost is estimated from.
+
+    ``households`` counts axis points, doubled by marginal rates' perturbed
+    copies; ``persons`` is per household and ``periods`` the years
+    simulated.
+    """
+    if endpoint not in ENDPOINTS:
+        raise ValueError(f"Unknown endpoint: {endpoint}")
+    _, _, variables, count_fields = ENDPOINTS[endpoint]
+    households = math.prod(getattr(request, field) for field in count_fields)
+    if getattr(request, "marginal_rates", False):
+        households *= 2
+    household = request.household
+    return {
+        "households": households,
+        "persons": 1 + household.is_married + household.num_children,
+        "periods": len(request.years) if request.years else 1,
+        "variables": len(variables),
+    }
+
+
+def _design_row(features: dict) -> list[float]:
+    person_periods = features["households"] * features["persons"] * features["periods"]
+    return [1.0, person_periods, person_periods * features["variables"]]
+
+
+def _predict(cost_model: dict, features: dict) -> float:
+    coefficients = [
+        cost_model["fixed_seconds"],
+        cost_model["person_seconds"],
+        cost_model["person_variable_seconds"],
+    ]
+    return float(np.dot(_design_row(features), coefficients))
+
+
+@functools.cache
+def load_cost_model(path: Path = DEFAULT_COST_MODEL_PATH) -> dict:
+    """Load a cost model written by ``main``, or the default if there is none."""
+    if not path.exists():
+        return dict(DEFAULT_COST_MODEL)
+    with open(path) as f:
+        return json.load(f)
+
+
+def estimate_cost(
+    endpoint: str, request: BaseModel, cost_model: Optional[dict] = None
+) -> dict:
+    """Return a request's cost features and estimated ``seconds``."""
+    cost_model = load_cost_model() if cost_model is None else cost_model
+    features = cost_features(endpoint, request)
+    return {**features, "seconds": _predict(cost_model, features)}
+
+
+def fit_cost_model(benchmarks: list[dict]) -> dict:
+    """Fit a cost model to benchmarks of cost features and timed ``seconds``.
+
+    Coefficients are fitted by least squares; any that come out negative
+    are dropped and the rest refitted, so that no size lowers the estimate.
+    """
+    if not benchmarks:
+        raise ValueError("No benchmarks to fit")
+    names = list(DEFAULT_COST_MODEL)
+    design = np.array([_design_row(benchmark) for benchmark in benchmarks])
+    seconds = np.array([benchmark["seconds"] for benchmark in benchmarks])
+    kept = list(range(len(names)))
+    while True:
+        fitted, *_ = np.linalg.lstsq(design[:, kept], seconds, rcond=None)
+        if (fitted >= 0).all() or len(kept) == 1:
+            break
+        kept = [column for column, value in zip(kept, fitted) if value >= 0]
+    coefficients = dict.fromkeys(names, 0.0)
+    for column, value in zip(kept, fitted):
+        coefficients[names[column]] = max(float(value), 0.0)
+    return coefficients
+
+
+def downscale(
+    endpoint: str,
+    request: BaseModel,
+    budget_seconds: float,
+    cost_model: Optional[dict] = None,
+) -> Optional[BaseModel]:
+    """Return ``request`` with counts scaled down to fit ``budget_seconds``.
+
+    Every count is scaled by the same factor, keeping the grid's aspect,
+    and rounded down to at least ``MIN_COUNT``. Returns None if even the
+    fewest points would not fit.
+    """
+    cost_model = load_cost_model() if cost_model is None else cost_model
+    count_fields = ENDPOINTS[endpoint][3]
+    features = cost_features(endpoint, request)
+    # The estimate is linear in households, so scale them by the share of
+    # the budget left after the fixed cost
+    per_household = (
+        _predict(cost_model, {**features, "households": 1})
+        - cost_model["fixed_seconds"]
+    )
+    if per_household <= 0:
+        return request
+    share = (
+        (budget_seconds - cost_model["fixed_seconds"])
+        / per_household
+        / features["households"]
+    )
+    if share <= 0:
+        return None
+    factor = min(share, 1.0) ** (1 / len(count_fields))
+    scaled = request.model_copy(
+        update={
+            field: max(MIN_COUNT, math.floor(getattr(request, field) * factor))
+            for field in count_fields
+        }
+    )
+    if estimate_cost(endpoint, scaled, cost_model)["seconds"] > budget_seconds:
+        return None
+    return scaled
+
+
+def admit(
+    endpoint: str,
+    request: BaseModel,
+    budget_seconds: float,
+    queue_budget_seconds: Optional[float] = None,
+    cost_model: Optional[dict] = None,
+) -> dict:
+    """Decide how to serve a request given the seconds it may take.
+
+    Returns the ``action`` taken: ``"accept"`` if the estimate is within
+    ``budget_seconds``; otherwise, by the request's ``oversize``,
+    ``"downscale"`` with the largest counts that fit, ``"queue"`` if it fits
+    ``queue_budget_seconds``, ``"accept"`` or ``"reject"``. Requests cannot
+    be queued without a queue budget. Requests without an ``oversize`` are
+    rejected, unless the cost model is unfitted (neither given nor loaded
+    from a file) and they have at most ``MAX_UNFITTED_POINTS`` points. Also
+    returns the ``request`` to serve, ``estimate``, ``budget_seconds`` and,
+    when over budget, the requested ``counts``.
+    """
+    fitted = cost_model is not None or DEFAULT_COST_MODEL_PATH.exists()
+    cost_model = load_cost_model() if cost_model is None else cost_model
+    estimate = estimate_cost(endpoint, request, cost_model)
+    points = estimate["households"] * estimate["periods"]
+    if request.oversize is not None:
+        oversize = request.oversize
+    elif fitted or points > MAX_UNFITTED_POINTS:
+        oversize = "reject"
+    else:
+        oversize = "accept"
+    decision = {
+        "action": "accept",
+        "request": request,
+        "estimate": estimate,
+        "budget_seconds": budget_seconds,
+    }
+    if estimate["seconds"] <= budget_seconds:
+        return decision
+
+    decision["counts"] = {
+        field: getattr(request, field) for field in ENDPOINTS[endpoint][3]
+    }
+    if oversize == "accept":
+        return decision
+    decision["action"] = "reject"
+    if oversize == "downscale":
+        scaled = downscale(endpoint, request, budget_seconds, cost_model)
+        if scaled is not None:
+            decision["action"] = "downscale"
+            decision["request"] = scaled
+            decision["estimate"] = estimate_cost(endpoint, scaled, cost_model)
+    elif (
+        oversize == "queue"
+        and queue_budget_seconds is not None
+        and estimate["seconds"] <= queue_budget_seconds
+    ):
+        decision["action"] = "queue"
+        decision["budget_seconds"] = queue_budget_seconds
+    return decision
+
+
+def benchmark(repeat: int = 1, progress: bool = False) -> list[dict]:
+    """Time the benchmark calculations, each the best of ``repeat`` runs.
+
+    Returns each calculation's endpoint, cost features and ``seconds``.
+    Tax-benefit systems are built once, before timing, as serving
+    containers keep theirs cached.
+    """
+    benchmarks = []
+    for endpoint, counts_list in BENCHMARK_COUNTS.items():
+        calculate, model, _, _ = ENDPOINTS[endpoint]
+        for is_married, num_children in BENCHMARK_HOUSEHOLDS:
+            household = HouseholdInput(
+                state_code="NY",
+                is_married=is_married,
+                num_children=num_children,
+                child_ages=BENCHMARK_CHILD_AGES[:num_children],
+                employment_income=200000,
+            )
+            # Warm the tax-benefit system and variable caches
+            calculate(
+                **calculation_arguments(
+                    endpoint, model(household=household, **counts_list[0])
+                )
+            )
+            for counts in counts_list:
+                request = model(household=household, **counts)
+                arguments = calculation_arguments(endpoint, request)
+                best = float("inf")
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    calculate(**arguments)
+                    best = min(best, time.perf_counter() - start)
+                benchmarks.append(
+                    {
+                        "endpoint": endpoint,
+                        **cost_features(endpoint, request),
+                        "seconds": best,
+                    }
+                )
+                if progress:
+                    print(
+                        f"{endpoint} {counts} married={is_married} "
+                        f"children={num_children}: {best:.2f}s",
+                        file=sys.stderr,
+                    )
+    return benchmarks
+
+
+def main(argv: Optional[list[str]] = None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark axis calculations and fit their cost model."
+    )
+    parser.add_argument("output", type=Path, help="Cost model JSON to write")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    benchmarks = benchmark(args.repeat, progress=True)
+    cost_model = fit_cost_model(benchmarks)
+    args.output.write_text(json.dumps(cost_model, indent=1) + "\n")
+    print(json.dumps(cost_model, indent=1))
+    for entry in benchmarks:
+        predicted = _predict(cost_model, entry)
+        print(
+            f"  {entry['endpoint']:<12} {entry['households']:>7} households "
+            f"x {entry['persons']} persons: {entry['seconds']:7.2f}s measured, "
+            f"{predicted:7.2f}s estimated"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+"""Precomputed household atlas.
+
+Most axis requests are for stock archetypes: a top state, single or
+married, zero to three children, the default household amounts and the
+default axis ranges. ``build_atlas`` runs the axis calculations offline for
+every archetype under every scenario of a spec and stores each endpoint's
+results as one ``.npy`` array of shape (entries, outputs, points), plus an
+``index.json`` mapping request keys to rows. ``Atlas`` opens the arrays
+memory-mapped and answers matching requests by lookup.
+
+Results are stored as float32, so atlas hits carry float32 rounding: within
+a cent below $262,144 and within about three cents up to $1 million. The
+index records the PolicyEngine-US version that built it, and an atlas built
+by another version is not loaded, as its results may no longer match.
+
+Entries are keyed like ``ResultCache`` entries: by endpoint, the arguments
+the calculation reads and the scenario's canonical key, so requests under
+either baseline scenario with the same policy config share an entry.
+
+Usage:
+    python -m salt_amt_api.atlas atlas/ --spec atlas.json --workers 8
+"""
+
+import argparse
+import hashlib
+import importlib.metadata
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+from .models import (
+    HouseholdInput,
+    IncomeAxisRequest,
+    SaltAxisRequest,
+    TwoAxesRequest,
+)
+from .simulation.calculation import (
+    calculate_income_axis,
+    calculate_salt_axis,
+    calculate_two_axes,
+)
+from .simulation.dedup import request_key
+from .simulation.reforms import (
+    canonical_scenario,
+    enumerate_policy_configs,
+    get_reform_params_from_config,
+    scenario_key,
+)
+
+# Household fields every axis calculation reads
+_HOUSEHOLD_ARGUMENTS = [
+    "is_married",
+    "state_code",
+    "num_children",
+    "child_ages",
+    "qualified_dividend_income",
+    "long_term_capital_gains",
+    "short_term_capital_gains",
+    "deductible_mortgage_interest",
+    "charitable_cash_donations",
+]
+
+
+def _axis_fields(minimum: str, maximum: str) -> list[str]:
+    return [minimum, maximum, "count", "marginal_rates", "marginal_delta", "years"]
+
+
+# Endpoint -> (calculation, request model, extra household fields read,
+# request fields read); pruning is left out as it does not change results
+ENDPOINTS = {
+    "salt_axis": (
+        calculate_salt_axis,
+        SaltAxisRequest,
+        ["employment_income"],
+        _axis_fields("min_salt", "max_salt"),
+    ),
+    "income_axis": (
+        calculate_income_axis,
+        IncomeAxisRequest,
+        [],
+        _axis_fields("min_income", "max_income"),
+    ),
+    "two_axes": (
+        calculate_two_axes,
+        TwoAxesRequest,
+        [],
+        [
+            "min_salt",
+            "max_salt",
+            "salt_count",
+            "min_income",
+            "max_income",
+            "income_count",
+            "amt_screening",
+            "years",
+        ],
+    ),
+}
+
+# Archetypes and scenarios precomputed by default. Household amounts and
+# child ages follow the frontend's default household.
+DEFAULT_SPEC = {
+    "state_codes": ["CA", "NY", "NJ", "IL", "MA", "TX", "FL", "PA"],
+    "is_married": [False, True],
+    "num_children": [0, 1, 2, 3],
+    "child_ages": [10, 8, 5],
+    "household": {
+        "employment_income": 200000,
+        "real_estate_taxes": 15000,
+        "deductible_mortgage_interest": 10000,
+        "charitable_cash_donations": 5000,
+    },
+    "endpoints": ["salt_axis", "income_axis"],
+    "baseline_scenarios": ["Current Law", "Current Policy"],
+    # "all" means no policy config plus every enumerable one
+    "policy_configs": "all",
+}
+
+INDEX_FILE = "index.json"
+
+
+def policyengine_us_version() -> str:
+    """Return the installed PolicyEngine-US version."""
+    return importlib.metadata.version("policyengine-us")
+
+
+def calculation_arguments(endpoint: str, request: BaseModel) -> dict:
+    """Return the arguments a request passes to its endpoint's calculation.
+
+    The baseline scenario and reform are not included.
+    """
+    _, _, household_fields, request_fields = ENDPOINTS[endpoint]
+    household = request.household
+    arguments = {
+        name: getattr(household, name)
+        for name in _HOUSEHOLD_ARGUMENTS + household_fields
+    }
+    arguments.update({name: getattr(request, name) for name in request_fields})
+    return arguments
+
+
+def atlas_key(
+    endpoint: str,
+    arguments: dict,
+    baseline_scenario: str,
+    reform_params: Optional[dict] = None,
+) -> str:
+    """Return the index key of an atlas entry."""
+    key = request_key(endpoint, arguments, baseline_scenario, reform_params)
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def archetypes(spec: dict) -> list[HouseholdInput]:
+    """Return the households of a spec, in a fixed order."""
+    households = []
+    for state_code in spec["state_codes"]:
+        for is_married in spec["is_married"]:
+            for num_children in spec["num_children"]:
+                if num_children > len(spec["child_ages"]):
+                    raise ValueError(f"No child ages for {num_children} children")
+                households.append(
+                    HouseholdInput(
+                        **spec["household"],
+                        state_code=state_code,
+                        is_married=is_married,
+                        num_children=num_children,
+                        child_ages=spec["child_ages"][:num_children],
+                    )
+                )
+    return households
+
+
+def scenarios(spec: dict) -> list[tuple[str, Optional[dict]]]:
+    """Return the distinct canonical scenarios of a spec, in first-seen order."""
+    configs = spec["policy_configs"]
+    if configs == "all":
+        configs = [None] + enumerate_policy_configs()
+    distinct = {}
+    for baseline_scenario in spec["baseline_scenarios"]:
+        for config in configs:
+            reform_params = None
+            if config is not None:
+                reform_params = get_reform_params_from_config(config)
+            key = scenario_key(baseline_scenario, reform_params)
+            distinct.setdefault(
+                key, canonical_scenario(baseline_scenario, reform_params)
+            )
+    return list(distinct.values())
+
+
+def _run_scenario(
+    scenario: tuple[str, Optional[dict]], households: list[dict], endpoints: list
+) -> list:
+    """Calculate every endpoint for every household under one scenario.
+
+    Returns ``(endpoint, household index, arguments, result or error)``
+    tuples; failures are returned so one unsupported reform does not abort
+    the build.
+    """
+    baseline_scenario, reform_params = scenario
+    rows = []
+    for endpoint in endpoints:
+        calculate, request_model, _, _ = ENDPOINTS[endpoint]
+        for i, household in enumerate(households):
+            request = request_model(household=household)
+            arguments = calculation_arguments(endpoint, request)
+            try:
+                result = calculate(
+                    **arguments,
+                    baseline_scenario=baseline_scenario,
+                    reform_params=reform_params,
+                    prune=True,
+                )
+            except Exception as e:
+                result = f"{type(e).__name__}: {e}"
+            rows.append((endpoint, i, arguments, result))
+    return rows
+
+
+class _EndpointWriter:
+    """Write one endpoint's results into a memory-mapped array by row."""
+
+    def __init__(self, path: str, entries: int):
+        self.path = path
+        self.entries = entries
+        self.array = None
+        self.outputs: list[str] = []
+        self.dtypes: dict[str, str] = {}
+        self.keys: dict[str, int] = {}
+
+    def write(self, row: int, key: str, result: dict):
+        if self.array is None:
+            # Per-point outputs; archetypes are built for the default year,
+            # so there are no per-year series
+            self.outputs = [
+                name
+                for name, values in result.items()
+                if isinstance(values, list) and name != "years"
+            ]
+            self.dtypes = {
+                name: "bool" if isinstance(result[name][0], bool) else "float"
+                for name in self.outputs
+            }
+            points = len(result[self.outputs[0]])
+            self.array = np.lib.format.open_memmap(
+                self.path,
+                mode="w+",
+                dtype=np.float32,
+                shape=(self.entries, len(self.outputs), points),
+            )
+        self.array[row] = [result[name] for name in self.outputs]
+        self.keys[key] = row
+
+    def index(self) -> dict:
+        if self.array is not None:
+            self.array.flush()
+        return {"outputs": self.outputs, "dtypes": self.dtypes, "keys": self.keys}
+
+
+def build_atlas(
+    directory: Path,
+    spec: Optional[dict] = None,
+    workers: int = 1,
+    progress: bool = False,
+) -> dict:
+    """Precompute the atlas of ``spec`` (default ``DEFAULT_SPEC``).
+
+    Scenarios are spread over ``workers`` processes (in this process when
+    1); each builds its reformed system once and runs every archetype.
+    Entries that fail are left out of the index and counted.
+
+    Returns the entry and failure counts and elapsed seconds.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    spec = {**DEFAULT_SPEC, **(spec or {})}
+    for endpoint in spec["endpoints"]:
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint: {endpoint}")
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    households = [household.model_dump() for household in archetypes(spec)]
+    scenario_list = scenarios(spec)
+    writers = {
+        endpoint: _EndpointWriter(
+            str(directory / f"{endpoint}.npy"), len(scenario_list) * len(households)
+        )
+        for endpoint in spec["endpoints"]
+    }
+
+    start = time.perf_counter()
+    failures = 0
+
+    def store(s: int, rows: list):
+        nonlocal failures
+        baseline_scenario, reform_params = scenario_list[s]
+        for endpoint, i, arguments, result in rows:
+            if isinstance(result, str):
+                failures += 1
+                continue
+            key = atlas_key(endpoint, arguments, baseline_scenario, reform_params)
+            writers[endpoint].write(s * len(households) + i, key, result)
+        if progress:
+            print(
+                f"{s + 1}/{len(scenario_list)} scenarios in "
+                f"{time.perf_counter() - start:.1f}s",
+                file=sys.stderr,
+            )
+
+    args = (households, spec["endpoints"])
+    if workers == 1:
+        for s, scenario in enumerate(scenario_list):
+            store(s, _run_scenario(scenario, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_run_scenario, scenario, *args)
+                for scenario in scenario_list
+            ]
+            for s, future in enumerate(futures):
+                store(s, future.result())
+
+    index = {name: writer.index() for name, writer in writers.items()}
+    with open(directory / INDEX_FILE, "w") as f:
+        json.dump(
+            {"policyengine_us_version": policyengine_us_version(), "endpoints": index},
+            f,
+        )
+    return {
+        "entries": sum(len(entry["keys"]) for entry in index.values()),
+        "failures": failures,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+class Atlas:
+    """Answer requests from a built atlas by memory-mapped lookup.
+
+    Looked-up values are the stored float32 values, not the float64 results
+    the calculation returned.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        with open(self.directory / INDEX_FILE) as f:
+            index = json.load(f)
+        self.version = index.get("policyengine_us_version")
+        self.index = index["endpoints"]
+        self._arrays: dict[str, np.ndarray] = {}
+
+    def _array(self, endpoint: str) -> np.ndarray:
+        if endpoint not in self._arrays:
+            self._arrays[endpoint] = np.load(
+                self.directory / f"{endpoint}.npy", mmap_mode="r"
+            )
+        return self._arrays[endpoint]
+
+    def lookup(
+        self,
+        endpoint: str,
+        arguments: dict,
+        baseline_scenario: str,
+        reform_params: Optional[dict] = None,
+    ) -> Optional[dict]:
+        """Return the stored result for a calculation, or None if absent."""
+        entry = self.index.get(endpoint)
+        if entry is None:
+            return None
+        row = entry["keys"].get(
+            atlas_key(endpoint, arguments, baseline_scenario, reform_params)
+        )
+        if row is None:
+            return None
+        values = self._array(endpoint)[row]
+        return {
+            name: (
+                values[i].astype(bool) if entry["dtypes"][name] == "bool" else values[i]
+            ).tolist()
+            for i, name in enumerate(entry["outputs"])
+        }
+
+    def lookup_request(
+        self, endpoint: str, request: BaseModel, reform_params: Optional[dict] = None
+    ) -> Optional[dict]:
+        """Return the stored result for an endpoint request, or None."""
+        if endpoint not in self.index:
+            return None
+        return self.lookup(
+            endpoint,
+            calculation_arguments(endpoint, request),
+            request.baseline_scenario,
+            reform_params,
+        )
+
+
+def load_atlas(directory: str) -> Optional[Atlas]:
+    """Open the atlas in ``directory``.
+
+    Returns None if none is built, or if it was built by another
+    PolicyEngine-US version than the one installed.
+    """
+    if not os.path.exists(os.path.join(directory, INDEX_FILE)):
+        return None
+    atlas = Atlas(Path(directory))
+    if atlas.version != policyengine_us_version():
+        return None
+    return atlas
+
+
+def main(argv: Optional[list[str]] = None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Precompute axis results for stock household archetypes."
+    )
+    parser.add_argument("directory", type=Path, help="Output directory")
+    parser.add_argument(
+        "--spec", type=Path, help="JSON file overriding DEFAULT_SPEC entries"
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    spec = json.loads(args.spec.read_text()) if args.spec else None
+    summary = build_atlas(args.directory, spec, workers=args.workers, progress=True)
+    print(
+        f"Wrote {summary['entries']} entries to {args.directory} in "
+        f"{summary['seconds']:.1f}s ({summary['failures']} failed)"
+    )
+
+
+if __name__ == "__main__":
+    main()
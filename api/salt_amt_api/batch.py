@@ -0,0 +1,257 @@
+"""Bulk household batch runner.
+
+Reads a CSV or Parquet file of ``HouseholdInput`` rows, evaluates it in
+chunks (one multi-household simulation per chunk) across a process pool and
+streams the inputs plus single-point outputs to CSV or Parquet.
+
+Usage:
+    python -m salt_amt_api.batch households.csv results.parquet \\
+        --policy-config policy.json --chunk-size 500 --workers 4
+
+Parquet input or output needs the optional ``pyarrow`` dependency
+(``pip install salt-amt-api[batch]``).
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+
+import pandas as pd
+
+from .models import HouseholdInput, PolicyConfig
+from .simulation.calculation import _create_tax_benefit_system, calculate_households
+from .simulation.reforms import get_reform_params_from_config
+
+# Tax-benefit system built once per worker process by _init_worker
+_tax_benefit_system = None
+
+
+def _import_pyarrow():
+    """Import pyarrow.parquet, which is only needed for Parquet files."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Parquet files require pyarrow: pip install salt-amt-api[batch]"
+        ) from e
+    return pa, pq
+
+
+def _is_parquet(path: Path) -> bool:
+    return path.suffix.lower() in (".parquet", ".pq")
+
+
+def parse_child_ages(value) -> list[int]:
+    """Parse a child_ages cell: a list, a JSON list or a comma/semicolon list."""
+    if isinstance(value, str):
+        value = value.strip().strip("[]")
+        return [int(age) for age in value.replace(";", ",").split(",") if age.strip()]
+    if hasattr(value, "__len__"):
+        return [int(age) for age in value]
+    if value is None or pd.isna(value):
+        return []
+    return [int(value)]
+
+
+def households_from_frame(frame: pd.DataFrame) -> list[dict]:
+    """Validate rows as ``HouseholdInput`` and return them as builder kwargs.
+
+    Columns missing from the frame, and empty cells, take the model defaults.
+    Columns that are not ``HouseholdInput`` fields are ignored.
+    """
+    fields = HouseholdInput.model_fields
+    households = []
+    for row in frame.to_dict(orient="records"):
+        values = {}
+        for name in fields:
+            if name not in row:
+                continue
+            if name == "child_ages":
+                values[name] = parse_child_ages(row[name])
+            elif not pd.isna(row[name]):
+                values[name] = row[name]
+        households.append(HouseholdInput(**values).model_dump())
+    return households
+
+
+def read_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Yield the rows of a CSV or Parquet file in chunks of ``chunk_size``."""
+    path = Path(path)
+    if _is_parquet(path):
+        _, pq = _import_pyarrow()
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+class _ResultWriter:
+    """Append result chunks to a CSV or Parquet file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.parquet = _is_parquet(self.path)
+        self._writer = None
+        self._started = False
+
+    def write(self, frame: pd.DataFrame):
+        if self.parquet:
+            pa, pq = _import_pyarrow()
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table.cast(self._writer.schema))
+        else:
+            frame.to_csv(
+                self.path,
+                mode="a" if self._started else "w",
+                header=not self._started,
+                index=False,
+            )
+        self._started = True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _init_worker(baseline_scenario: str, reform_params: Optional[dict]):
+    """Build the tax-benefit system once for every chunk this worker runs."""
+    global _tax_benefit_system
+    _tax_benefit_system = _create_tax_benefit_system(baseline_scenario, reform_params)
+
+
+def _run_chunk(frame: pd.DataFrame) -> pd.DataFrame:
+    """Calculate a chunk of households and append the outputs to its rows."""
+    result = calculate_households(
+        households_from_frame(frame), tax_benefit_system=_tax_benefit_system
+    )
+    return pd.concat([frame.reset_index(drop=True), pd.DataFrame(result)], axis=1)
+
+
+def run_batch(
+    input_path: Path,
+    output_path: Path,
+    policy_config: Optional[PolicyConfig] = None,
+    baseline_scenario: str = "Current Law",
+    chunk_size: int = 500,
+    workers: int = 1,
+    max_pending: Optional[int] = None,
+    progress: bool = False,
+) -> dict:
+    """Calculate every household in ``input_path`` and write ``output_path``.
+
+    Chunks are read lazily and at most ``max_pending`` (default twice the
+    worker count) are in flight, so memory stays bounded by the chunk size
+    rather than the file size. Results are written in input order. With
+    ``workers`` of 1 chunks run in this process.
+
+    Returns the row count, elapsed seconds and rows per second.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    reform_params = None
+    if policy_config is not None:
+        reform_params = get_reform_params_from_config(policy_config.model_dump())
+
+    start = time.perf_counter()
+    rows = 0
+    writer = _ResultWriter(output_path)
+
+    def report():
+        if progress:
+            elapsed = time.perf_counter() - start
+            print(
+                f"{rows} rows in {elapsed:.1f}s ({rows / elapsed:.1f} rows/s)",
+                file=sys.stderr,
+            )
+
+    try:
+        if workers == 1:
+            _init_worker(baseline_scenario, reform_params)
+            for frame in read_chunks(input_path, chunk_size):
+                writer.write(_run_chunk(frame))
+                rows += len(frame)
+                report()
+        else:
+            max_pending = max_pending or 2 * workers
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(baseline_scenario, reform_params),
+            ) as executor:
+                pending: deque[Future] = deque()
+                for frame in read_chunks(input_path, chunk_size):
+                    pending.append(executor.submit(_run_chunk, frame))
+                    if len(pending) >= max_pending:
+                        result = pending.popleft().result()
+                        writer.write(result)
+                        rows += len(result)
+                        report()
+                while pending:
+                    result = pending.popleft().result()
+                    writer.write(result)
+                    rows += len(result)
+                    report()
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_second": rows / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv: Optional[list[str]] = None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Calculate single-point results for a file of households."
+    )
+    parser.add_argument("input", type=Path, help="CSV or Parquet household file")
+    parser.add_argument("output", type=Path, help="CSV or Parquet result file")
+    parser.add_argument(
+        "--policy-config", type=Path, help="JSON file of PolicyConfig fields"
+    )
+    parser.add_argument(
+        "--baseline-scenario",
+        choices=["Current Law", "Current Policy"],
+        default="Current Law",
+    )
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--max-pending", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    policy_config = None
+    if args.policy_config:
+        policy_config = PolicyConfig(**json.loads(args.policy_config.read_text()))
+
+    summary = run_batch(
+        args.input,
+        args.output,
+        policy_config=policy_config,
+        baseline_scenario=args.baseline_scenario,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        max_pending=args.max_pending,
+        progress=True,
+    )
+    print(
+        f"Wrote {summary['rows']} rows to {args.output} in "
+        f"{summary['seconds']:.1f}s ({summary['rows_per_second']:.1f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
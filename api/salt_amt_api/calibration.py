@@ -0,0 +1,470 @@
+"""Calibration of axis point counts against interpolation error.
+
+The axis endpoints sample each output at evenly spaced points, which the
+web app joins with straight lines, so a count is fine enough when linear
+interpolation between its points (bilinear across the two-axes grid) stays
+close to the outputs at every point in between. ``calibrate`` measures that
+error over a corpus of households and policies. Each axis is simulated once
+at a reference spacing finer than the request models' defaults; households
+along an axis are independent, so every coarser count whose points are a
+subset of the reference's is read from the reference rather than simulated
+again. The reference itself is not a candidate, as its error cannot be
+measured.
+
+Some outputs jump where the household switches between the standard
+deduction and itemizing, and no spacing interpolates a jump. Their errors
+are tabulated per output but left out of the error that tolerances bound.
+
+Errors are recorded by spacing, the dollars between neighbouring points,
+rather than by count, so one table serves requests for any range.
+``auto_counts`` picks the cheapest counts whose calibrated error is within
+a tolerance, for requests made with ``resolution="auto"``, and rejects
+tolerances finer than any measured spacing meets. Endpoints missing from
+the table reject auto resolution.
+
+Usage:
+    python -m salt_amt_api.calibration calibration.json --households 20
+"""
+
+import argparse
+import functools
+import itertools
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+from .atlas import calculation_arguments
+from .households import sample_household
+from .models import IncomeAxisRequest, SaltAxisRequest, TwoAxesRequest
+from .simulation.calculation import (
+    calculate_income_axis,
+    calculate_salt_axis,
+    calculate_two_axes,
+)
+from .simulation.reforms import (
+    enumerate_policy_configs,
+    get_reform_params_from_config,
+)
+
+_OUTPUTS = [
+    "salt_deduction",
+    "regular_tax",
+    "amt",
+    "income_tax",
+    "taxable_income",
+    "amt_income",
+]
+
+# Endpoint -> (calculation, request model, outputs compared, axes as (count,
+# min, max) request fields in the order of the outputs' dimensions)
+ENDPOINTS = {
+    "salt_axis": (
+        calculate_salt_axis,
+        SaltAxisRequest,
+        _OUTPUTS,
+        [("count", "min_salt", "max_salt")],
+    ),
+    "income_axis": (
+        calculate_income_axis,
+        IncomeAxisRequest,
+        _OUTPUTS + ["gap"],
+        [("count", "min_income", "max_income")],
+    ),
+    "two_axes": (
+        calculate_two_axes,
+        TwoAxesRequest,
+        _OUTPUTS,
+        # Cells are income major, SALT minor
+        [
+            ("income_count", "min_income", "max_income"),
+            ("salt_count", "min_salt", "max_salt"),
+        ],
+    ),
+}
+
+# AMT income adds back SALT when itemizing and the standard deduction
+# otherwise, so it jumps by the other itemized deductions where the
+# household starts itemizing, and the AMT and the regular tax's gap over it
+# jump with it. A household on the AMT can switch where itemizing does not
+# pay federally, so its taxable income and regular tax jump there too while
+# its income tax does not
+DISCONTINUOUS_OUTPUTS = {"taxable_income", "regular_tax", "amt_income", "amt", "gap"}
+
+# Reference (count, spacing in dollars) on each axis. The default requests
+# space points about $500 of SALT and $1,000 of income apart on the axes and
+# $430 of SALT and $715 of income on the grid. One-axis references span the
+# default range; the grid reference covers a $60,000 x $30,000 window of it,
+# placed at random for each household, as the whole range at this spacing
+# would be millions of households.
+REFERENCES = {
+    "salt_axis": {"count": (2401, 125.0)},
+    "income_axis": {"count": (4001, 250.0)},
+    "two_axes": {"income_count": (241, 250.0), "salt_count": (241, 125.0)},
+}
+
+# Coarsest count considered on each axis
+MIN_COUNT = 5
+
+# Share of corpus households given a reform rather than none
+REFORM_SHARE = 0.5
+
+# Shipped table; endpoints missing from it reject auto resolution until
+# they are calibrated into it
+DEFAULT_CALIBRATION_PATH = Path(__file__).with_name("calibration.json")
+
+
+def subset_counts(reference_count: int, min_count: int = MIN_COUNT) -> list[int]:
+    """Return the counts whose points are a subset of ``reference_count``'s.
+
+    These are the counts ``c`` for which ``c - 1`` divides
+    ``reference_count - 1``, largest first, including the reference.
+    """
+    if reference_count < 2:
+        raise ValueError("reference_count must be at least 2")
+    intervals = reference_count - 1
+    return [
+        steps + 1
+        for steps in range(intervals, 0, -1)
+        if intervals % steps == 0 and steps + 1 >= min_count
+    ]
+
+
+def upsample(values: np.ndarray, count: int, axis: int = -1) -> np.ndarray:
+    """Linearly interpolate ``count`` evenly spaced points of ``values``.
+
+    Takes every ``(n - 1) / (count - 1)``-th point of ``values`` along
+    ``axis`` (of length ``n``) and returns the straight lines between them
+    evaluated at all ``n`` points.
+    """
+    n = values.shape[axis]
+    if (n - 1) % (count - 1):
+        raise ValueError(f"{count} points are not a subset of {n}")
+    step = (n - 1) // (count - 1)
+    position = np.arange(n)
+    # Interpolate between point k and k + 1; the last point ends the last line
+    k = np.minimum(position // step, count - 2)
+    t = (position - k * step) / step
+    shape = [1] * values.ndim
+    shape[axis] = n
+    t = t.reshape(shape)
+    lower = np.take(values, k * step, axis=axis)
+    upper = np.take(values, (k + 1) * step, axis=axis)
+    return lower + t * (upper - lower)
+
+
+def interpolation_errors(reference: np.ndarray, counts: list[int]) -> np.ndarray:
+    """Return each output's largest error interpolating ``reference``.
+
+    ``reference`` holds each output's values, of shape (outputs, *axes), and
+    ``counts`` the coarser count on each axis.
+    """
+    interpolated = reference
+    for axis, count in enumerate(counts, start=1):
+        interpolated = upsample(interpolated, count, axis)
+    errors = np.abs(interpolated - reference)
+    return errors.reshape(len(reference), -1).max(axis=1)
+
+
+def default_ranges(endpoint: str) -> list[tuple[float, float]]:
+    """Return the (min, max) of each of an endpoint's axes by default."""
+    _, model, _, axes = ENDPOINTS[endpoint]
+    fields = model.model_fields
+    return [
+        (fields[minimum].default, fields[maximum].default)
+        for _, minimum, maximum in axes
+    ]
+
+
+def _window(endpoint: str, reference: dict, rng: np.random.Generator) -> dict:
+    """Return request fields placing a reference within the default ranges.
+
+    Windows narrower than an axis's default range start at a random
+    multiple of the reference spacing from its minimum.
+    """
+    fields = {}
+    axes = ENDPOINTS[endpoint][3]
+    for (count, minimum, maximum), (low, high) in zip(axes, default_ranges(endpoint)):
+        points, spacing = reference[count]
+        span = spacing * (points - 1)
+        slack = int(max(high - low - span, 0) // spacing)
+        offset = spacing * float(rng.integers(0, slack + 1))
+        fields.update(
+            {count: points, minimum: low + offset, maximum: low + offset + span}
+        )
+    return fields
+
+
+def corpus(households: int, seed: int = 0) -> list[tuple[dict, str, Optional[dict]]]:
+    """Draw ``(household, baseline scenario, policy config)`` triples.
+
+    Households are drawn by ``sample_household``; a ``REFORM_SHARE`` of them
+    get a policy config drawn from every combination of the options.
+    """
+    rng = np.random.default_rng(seed)
+    configs = enumerate_policy_configs()
+    drawn = []
+    for _ in range(households):
+        household = sample_household(rng)
+        baseline_scenario = ["Current Law", "Current Policy"][rng.integers(2)]
+        config = None
+        if rng.random() < REFORM_SHARE:
+            config = configs[rng.integers(len(configs))]
+        drawn.append((household, baseline_scenario, config))
+    return drawn
+
+
+def _reference(
+    endpoint: str,
+    household: dict,
+    baseline_scenario: str,
+    config: Optional[dict],
+    fields: dict,
+) -> np.ndarray:
+    """Simulate an endpoint's outputs for a request with reference ``fields``."""
+    calculate, model, outputs, axes = ENDPOINTS[endpoint]
+    request = model(household=household, **fields)
+    arguments = calculation_arguments(endpoint, request)
+    if endpoint == "two_axes":
+        # Simulate reference grids in chunks to bound their memory
+        arguments["low_memory"] = True
+    result = calculate(
+        **arguments,
+        baseline_scenario=baseline_scenario,
+        reform_params=(
+            get_reform_params_from_config(config) if config is not None else None
+        ),
+        prune=True,
+    )
+    shape = [fields[count] for count, _, _ in axes]
+    return np.array([result[name] for name in outputs], dtype=float).reshape(
+        [len(outputs), *shape]
+    )
+
+
+def calibrate(
+    endpoints: Optional[list[str]] = None,
+    households: int = 10,
+    seed: int = 0,
+    references: Optional[dict] = None,
+    progress: bool = False,
+) -> dict:
+    """Measure interpolation error by spacing over a corpus of ``households``.
+
+    ``references`` overrides entries of ``REFERENCES``. Returns, for each
+    endpoint, its axes, reference, the outputs left out of the bounded error
+    and the number of households calculated and failed, with one entry per
+    candidate combination of counts coarser than the reference: the spacing
+    on each axis, the largest, 95th-percentile and mean error over the
+    corpus of the continuous outputs, and each output's largest error, in
+    dollars.
+    """
+    endpoints = list(ENDPOINTS) if endpoints is None else endpoints
+    for endpoint in endpoints:
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint: {endpoint}")
+    references = {**REFERENCES, **(references or {})}
+    drawn = corpus(households, seed)
+
+    start = time.perf_counter()
+    calibration = {}
+    for endpoint in endpoints:
+        outputs = ENDPOINTS[endpoint][2]
+        axes = [count for count, _, _ in ENDPOINTS[endpoint][3]]
+        reference = references[endpoint]
+        candidates = [
+            list(candidate)
+            for candidate in itertools.product(
+                *[subset_counts(reference[axis][0]) for axis in axes]
+            )
+        ][1:]
+        continuous = [
+            i for i, output in enumerate(outputs) if output not in DISCONTINUOUS_OUTPUTS
+        ]
+        # Errors by household, candidate and output
+        errors = []
+        failures = 0
+        for i, (household, baseline_scenario, config) in enumerate(drawn):
+            fields = _window(endpoint, reference, np.random.default_rng([seed, i]))
+            try:
+                values = _reference(
+                    endpoint, household, baseline_scenario, config, fields
+                )
+            except Exception:
+                # Leave out policies this version of PolicyEngine-US rejects
+                failures += 1
+                continue
+            errors.append(
+                [interpolation_errors(values, candidate) for candidate in candidates]
+            )
+            if progress:
+                print(
+                    f"{endpoint}: {i + 1}/{len(drawn)} households in "
+                    f"{time.perf_counter() - start:.1f}s",
+                    file=sys.stderr,
+                )
+        if not errors:
+            raise ValueError(f"Every {endpoint} reference calculation failed")
+        errors = np.array(errors)
+        bounded = errors[:, :, continuous].max(axis=2)
+        calibration[endpoint] = {
+            "axes": axes,
+            "reference": {axis: list(reference[axis]) for axis in axes},
+            "discontinuous_outputs": sorted(DISCONTINUOUS_OUTPUTS & set(outputs)),
+            "households": len(errors),
+            "failures": failures,
+            "entries": [
+                {
+                    "spacing": [
+                        reference[axis][1] * (reference[axis][0] - 1) / (count - 1)
+                        for axis, count in zip(axes, candidate)
+                    ],
+                    "max_error": float(bounded[:, j].max()),
+                    "p95_error": float(np.percentile(bounded[:, j], 95)),
+                    "mean_error": float(bounded[:, j].mean()),
+                    "output_errors": {
+                        output: float(errors[:, j, k].max())
+                        for k, output in enumerate(outputs)
+                    },
+                }
+                for j, candidate in enumerate(candidates)
+            ],
+        }
+    return calibration
+
+
+@functools.cache
+def load_calibration(path: Path = DEFAULT_CALIBRATION_PATH) -> dict:
+    """Load a calibration table written by ``calibrate``, or none if missing."""
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def auto_counts(
+    endpoint: str,
+    ranges: list[tuple[float, float]],
+    tolerance: float,
+    calibration: Optional[dict] = None,
+) -> dict:
+    """Return the cheapest counts keeping interpolation within ``tolerance``.
+
+    ``ranges`` gives the (min, max) of each of the endpoint's axes. Each
+    calibrated spacing is bounded by the largest error of it and every finer
+    spacing, as a coarse spacing whose points happen to fall on the corpus's
+    kinks can measure smaller errors than finer ones. Of the spacings whose
+    bound is within ``tolerance`` dollars, the one needing the fewest points
+    over ``ranges`` is chosen. Returns each axis's count field and its count.
+
+    Raises ValueError if the endpoint is not calibrated or no measured
+    spacing is within ``tolerance``.
+    """
+    if tolerance < 0:
+        raise ValueError("tolerance must not be negative")
+    calibration = load_calibration() if calibration is None else calibration
+    if endpoint not in calibration:
+        raise ValueError(f"Auto resolution is not calibrated for {endpoint}")
+    table = calibration[endpoint]
+    if len(ranges) != len(table["axes"]):
+        raise ValueError(f"{endpoint} has {len(table['axes'])} axes")
+
+    def counts(entry: dict) -> list[int]:
+        return [
+            max(2, math.ceil(abs(maximum - minimum) / spacing - 1e-9) + 1)
+            for (minimum, maximum), spacing in zip(ranges, entry["spacing"])
+        ]
+
+    def bound(entry: dict) -> float:
+        return max(
+            finer["max_error"]
+            for finer in table["entries"]
+            if all(f <= s for f, s in zip(finer["spacing"], entry["spacing"]))
+        )
+
+    bounds = [(bound(entry), entry) for entry in table["entries"]]
+    feasible = [entry for error, entry in bounds if error <= tolerance]
+    if not feasible:
+        finest = min(error for error, _ in bounds)
+        raise ValueError(
+            f"No calibrated {endpoint} spacing is within ${tolerance:g}; "
+            f"the finest measured is within ${finest:g}"
+        )
+    best = min(feasible, key=lambda entry: math.prod(counts(entry)))
+    return dict(zip(table["axes"], counts(best)))
+
+
+def resolve_counts(
+    endpoint: str, request: BaseModel, calibration: Optional[dict] = None
+) -> BaseModel:
+    """Return ``request`` with its counts chosen if it asks for auto resolution.
+
+    Requests with ``resolution="auto"`` get the cheapest calibrated counts
+    keeping interpolation within their ``max_error``; others are returned
+    as they are.
+    """
+    if request.resolution != "auto":
+        return request
+    ranges = [
+        (getattr(request, minimum), getattr(request, maximum))
+        for _, minimum, maximum in ENDPOINTS[endpoint][3]
+    ]
+    return request.model_copy(
+        update=auto_counts(endpoint, ranges, request.max_error, calibration)
+    )
+
+
+def main(argv: Optional[list[str]] = None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Measure axis interpolation error against point spacing."
+    )
+    parser.add_argument(
+        "output",
+        type=Path,
+        help="Calibration JSON to write; endpoints not calibrated are kept",
+    )
+    parser.add_argument(
+        "--endpoints", nargs="+", choices=list(ENDPOINTS), default=list(ENDPOINTS)
+    )
+    parser.add_argument("--households", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--references",
+        type=json.loads,
+        help='JSON overriding REFERENCES entries, e.g. {"salt_axis": '
+        '{"count": [1201, 250]}}',
+    )
+    args = parser.parse_args(argv)
+
+    calibration = calibrate(
+        args.endpoints,
+        args.households,
+        args.seed,
+        args.references,
+        progress=True,
+    )
+    if args.output.exists():
+        calibration = {**json.loads(args.output.read_text()), **calibration}
+    args.output.write_text(json.dumps(calibration, indent=1) + "\n")
+    for endpoint, table in calibration.items():
+        model = ENDPOINTS[endpoint][1]
+        defaults = {axis: model.model_fields[axis].default for axis in table["axes"]}
+        print(f"{endpoint} (default {defaults}):")
+        for tolerance in (1, 10, 100):
+            try:
+                counts = auto_counts(
+                    endpoint, default_ranges(endpoint), tolerance, calibration
+                )
+            except ValueError as e:
+                counts = str(e)
+            print(f"  within ${tolerance}: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Random households resembling the calculator's users.
+
+Both the load tester and axis calibration draw their households here, so
+latency and interpolation error are measured over the same population.
+"""
+
+import numpy as np
+
+from .simulation.situation import STATE_CODES
+
+# Approximate population shares of the ten most populous states (2020
+# census); the other states share the rest equally
+STATE_WEIGHTS = {
+    "CA": 0.119,
+    "TX": 0.088,
+    "FL": 0.065,
+    "NY": 0.061,
+    "PA": 0.039,
+    "IL": 0.039,
+    "OH": 0.036,
+    "GA": 0.032,
+    "NC": 0.032,
+    "MI": 0.030,
+}
+
+
+def _state_probabilities() -> np.ndarray:
+    rest = [code for code in STATE_CODES if code not in STATE_WEIGHTS]
+    other = (1 - sum(STATE_WEIGHTS.values())) / len(rest)
+    return np.array([STATE_WEIGHTS.get(code, other) for code in STATE_CODES])
+
+
+def _amount(rng: np.random.Generator, share: float, median: float) -> float:
+    """With probability ``share``, a lognormal amount around ``median``."""
+    if rng.random() >= share:
+        return 0.0
+    return float(round(median * rng.lognormal(0, 0.7), -1))
+
+
+def sample_household(rng: np.random.Generator) -> dict:
+    """Draw a household with lognormal income and income-linked deductions."""
+    num_children = int(rng.choice(4, p=[0.55, 0.2, 0.17, 0.08]))
+    income = float(min(round(rng.lognormal(np.log(100000), 0.8), -2), 5000000))
+    return {
+        "state_code": str(rng.choice(STATE_CODES, p=_state_probabilities())),
+        "is_married": bool(rng.random() < 0.45),
+        "num_children": num_children,
+        "child_ages": sorted(int(age) for age in rng.integers(0, 18, num_children)),
+        "employment_income": income,
+        "real_estate_taxes": _amount(rng, 0.65, 0.025 * income),
+        "qualified_dividend_income": _amount(rng, 0.2, 0.03 * income),
+        "long_term_capital_gains": _amount(rng, 0.15, 0.05 * income),
+        "short_term_capital_gains": _amount(rng, 0.05, 0.02 * income),
+        "deductible_mortgage_interest": _amount(rng, 0.3, 0.05 * income),
+        "charitable_cash_donations": _amount(rng, 0.4, 0.02 * income),
+    }
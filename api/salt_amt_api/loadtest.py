@@ -0,0 +1,351 @@
+"""Load testing of the API with a realistic request mix.
+
+Generates single-point, SALT-axis, income-axis and two-axes request bodies
+for a spread of households, scenarios and policies, replays them against a
+backend at a fixed concurrency (closed loop) or a fixed arrival rate (open
+loop, Poisson arrivals) and reports latency percentiles, throughput and
+error rates, overall and per endpoint::
+
+    python -m salt_amt_api.loadtest --requests 40 --concurrency 4
+    python -m salt_amt_api.loadtest --backend http --url http://127.0.0.1:8000 \\
+        --rate 0.5 --requests 100 --count-scale 0.1
+
+The in-process backend calls the Modal handlers locally, so the result
+cache, atlas and single-point batcher are exercised as deployed; run it from
+the directory holding ``modal_app.py``. The HTTP backend posts to
+``<url>/<handler name>``, as served by the local stand-in for Modal::
+
+    uvicorn modal_app:local_app --factory --port 8000
+"""
+
+import argparse
+import importlib
+import json
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+
+from .households import sample_household
+from .models import (
+    IncomeAxisRequest,
+    SaltAxisRequest,
+    SinglePointRequest,
+    TwoAxesRequest,
+)
+from .simulation.reforms import enumerate_policy_configs
+
+# Request model and Modal handler of each endpoint in the mix
+ENDPOINTS = {
+    "single": (SinglePointRequest, "calculate_single"),
+    "salt_axis": (SaltAxisRequest, "calculate_salt_axis"),
+    "income_axis": (IncomeAxisRequest, "calculate_income_axis"),
+    "two_axes": (TwoAxesRequest, "calculate_two_axes"),
+}
+
+# The web app requests a single point and both axes for each calculation;
+# two-axes grids are rarer
+DEFAULT_MIX = {"single": 1.0, "salt_axis": 1.0, "income_axis": 1.0, "two_axes": 0.05}
+
+# Share of requests under each baseline, and with a reform (a policy config
+# drawn from every combination of the options) rather than none
+CURRENT_POLICY_SHARE = 0.5
+REFORM_SHARE = 0.5
+
+PERCENTILES = (50, 95, 99)
+
+
+def _scaled(model, field: str, count_scale: float) -> int:
+    return max(2, round(model.model_fields[field].default * count_scale))
+
+
+def generate_requests(
+    count: int,
+    mix: Optional[dict] = None,
+    seed: int = 0,
+    count_scale: float = 1.0,
+) -> list[tuple[str, dict]]:
+    """Return ``count`` (endpoint, request body) pairs drawn from ``mix``.
+
+    ``mix`` weights the endpoints of ``ENDPOINTS``. Axis requests ask for
+    breakpoint encoding, as the web app does, with the request models'
+    default point counts scaled by ``count_scale``.
+    """
+    mix = DEFAULT_MIX if mix is None else mix
+    unknown = set(mix) - set(ENDPOINTS)
+    if unknown:
+        raise ValueError(f"Unknown endpoints in mix: {sorted(unknown)}")
+    if count_scale <= 0:
+        raise ValueError("count_scale must be positive")
+    endpoints = list(mix)
+    weights = np.array([mix[endpoint] for endpoint in endpoints], dtype=float)
+    if weights.sum() <= 0 or (weights < 0).any():
+        raise ValueError("Mix weights must be non-negative and not all zero")
+
+    rng = np.random.default_rng(seed)
+    configs = enumerate_policy_configs()
+    requests = []
+    for _ in range(count):
+        endpoint = endpoints[rng.choice(len(endpoints), p=weights / weights.sum())]
+        body = {
+            "household": sample_household(rng),
+            "baseline_scenario": (
+                "Current Policy"
+                if rng.random() < CURRENT_POLICY_SHARE
+                else "Current Law"
+            ),
+        }
+        if rng.random() < REFORM_SHARE:
+            body["policy_config"] = configs[rng.integers(len(configs))]
+        if endpoint == "salt_axis":
+            body["count"] = _scaled(SaltAxisRequest, "count", count_scale)
+            body["encoding"] = "breakpoints"
+        elif endpoint == "income_axis":
+            body["count"] = _scaled(IncomeAxisRequest, "count", count_scale)
+            body["encoding"] = "breakpoints"
+        elif endpoint == "two_axes":
+            body["salt_count"] = _scaled(TwoAxesRequest, "salt_count", count_scale)
+            body["income_count"] = _scaled(TwoAxesRequest, "income_count", count_scale)
+        requests.append((endpoint, body))
+    return requests
+
+
+class InProcessBackend:
+    """Call the Modal handlers locally, in this process."""
+
+    def __init__(self, app_module: str = "modal_app"):
+        self.app = importlib.import_module(app_module)
+
+    def __call__(self, endpoint: str, body: dict) -> None:
+        handler = getattr(self.app, ENDPOINTS[endpoint][1])
+        handler.local(body)
+
+
+class HttpBackend:
+    """Post requests to a server, such as the local stand-in for Modal."""
+
+    def __init__(self, url: str, timeout: float = 900):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def __call__(self, endpoint: str, body: dict) -> None:
+        request = urllib.request.Request(
+            f"{self.url}/{ENDPOINTS[endpoint][1]}",
+            data=json.dumps(body).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        # Raises HTTPError for error statuses
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+def _timed(backend: Callable, endpoint: str, body: dict, start: float) -> dict:
+    """Send one request, timing it from ``start``."""
+    error = None
+    try:
+        backend(endpoint, body)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {
+        "endpoint": endpoint,
+        "latency": time.perf_counter() - start,
+        "error": error,
+    }
+
+
+def run_closed_loop(
+    backend: Callable, requests: list[tuple[str, dict]], concurrency: int
+) -> list[dict]:
+    """Send ``requests`` from ``concurrency`` clients, each waiting for replies.
+
+    Returns one sample per request, in completion order.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    remaining = iter(requests)
+    samples = []
+    lock = threading.Lock()
+
+    def client():
+        while True:
+            with lock:
+                request = next(remaining, None)
+            if request is None:
+                return
+            sample = _timed(backend, *request, time.perf_counter())
+            with lock:
+                samples.append(sample)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def run_open_loop(
+    backend: Callable,
+    requests: list[tuple[str, dict]],
+    rate: float,
+    seed: int = 0,
+    max_in_flight: int = 256,
+) -> list[dict]:
+    """Send ``requests`` as Poisson arrivals at ``rate`` per second.
+
+    Arrivals do not wait for earlier replies. Latency is measured from each
+    request's scheduled arrival, so requests waiting for one of the
+    ``max_in_flight`` senders count their wait.
+    """
+    if rate <= 0:
+        raise ValueError("rate must be positive")
+    rng = np.random.default_rng(seed)
+    arrivals = np.cumsum(rng.exponential(1 / rate, len(requests)))
+    begin = time.perf_counter()
+    futures = []
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        for (endpoint, body), arrival in zip(requests, arrivals):
+            delay = begin + arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(
+                executor.submit(_timed, backend, endpoint, body, begin + arrival)
+            )
+    return [future.result() for future in futures]
+
+
+def _summary(samples: list[dict], seconds: float) -> dict:
+    latencies = np.array([s["latency"] for s in samples if s["error"] is None])
+    errors = sum(s["error"] is not None for s in samples)
+    summary = {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": errors / len(samples) if samples else 0.0,
+        "throughput": len(latencies) / seconds if seconds > 0 else 0.0,
+    }
+    for q in PERCENTILES:
+        summary[f"p{q}"] = (
+            float(np.percentile(latencies, q)) if len(latencies) else None
+        )
+    summary["mean"] = float(latencies.mean()) if len(latencies) else None
+    return summary
+
+
+def summarize(samples: list[dict], seconds: float) -> dict:
+    """Summarize a run of ``seconds``, overall and per endpoint.
+
+    Throughput counts successful replies per second. Percentiles and the
+    mean are of successful replies' latencies, in seconds.
+    """
+    endpoints = sorted({s["endpoint"] for s in samples})
+    return {
+        "seconds": seconds,
+        "overall": _summary(samples, seconds),
+        "endpoints": {
+            endpoint: _summary(
+                [s for s in samples if s["endpoint"] == endpoint], seconds
+            )
+            for endpoint in endpoints
+        },
+        "errors": sorted({s["error"] for s in samples if s["error"] is not None}),
+    }
+
+
+def run(
+    backend: Callable,
+    requests: list[tuple[str, dict]],
+    concurrency: Optional[int] = None,
+    rate: Optional[float] = None,
+    seed: int = 0,
+) -> dict:
+    """Replay ``requests`` at a fixed concurrency or arrival rate and summarize."""
+    if (concurrency is None) == (rate is None):
+        raise ValueError("Set exactly one of concurrency and rate")
+    start = time.perf_counter()
+    if rate is None:
+        samples = run_closed_loop(backend, requests, concurrency)
+    else:
+        samples = run_open_loop(backend, requests, rate, seed)
+    return summarize(samples, time.perf_counter() - start)
+
+
+def _format_seconds(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.3f}s"
+
+
+def format_report(report: dict) -> str:
+    """Return a run's summary as a text table."""
+    lines = [
+        f"{'endpoint':<12} {'requests':>8} {'errors':>7} {'ok/s':>7} "
+        f"{'p50':>9} {'p95':>9} {'p99':>9}"
+    ]
+    rows = list(report["endpoints"].items()) + [("overall", report["overall"])]
+    for name, summary in rows:
+        lines.append(
+            f"{name:<12} {summary['requests']:>8} "
+            f"{summary['error_rate']:>7.1%} {summary['throughput']:>7.2f} "
+            + " ".join(f"{_format_seconds(summary[f'p{q}']):>9}" for q in PERCENTILES)
+        )
+    lines.append(f"Ran for {report['seconds']:.1f}s")
+    lines.extend(f"Error: {error}" for error in report["errors"])
+    return "\n".join(lines)
+
+
+def _parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(","):
+        endpoint, _, weight = part.partition("=")
+        mix[endpoint.strip()] = float(weight)
+    return mix
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Replay a realistic request mix and report latency."
+    )
+    parser.add_argument(
+        "--backend", choices=["in-process", "http"], default="in-process"
+    )
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument(
+        "--mix",
+        type=_parse_mix,
+        default=DEFAULT_MIX,
+        help="Endpoint weights, e.g. single=1,salt_axis=1,two_axes=0.1",
+    )
+    parser.add_argument(
+        "--count-scale",
+        type=float,
+        default=1.0,
+        help="Scale the default axis and grid point counts",
+    )
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, help="Clients waiting on replies")
+    load.add_argument("--rate", type=float, help="Arrivals per second")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    if args.backend == "http":
+        backend = HttpBackend(args.url)
+    else:
+        sys.path.insert(0, ".")
+        backend = InProcessBackend()
+    requests = generate_requests(args.requests, args.mix, args.seed, args.count_scale)
+    concurrency = None if args.rate is not None else args.concurrency or 1
+    report = run(backend, requests, concurrency, args.rate, args.seed)
+
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,22 @@
 """Pydantic models for API requests and responses."""
 
 from typing import Literal, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+# Years requests may calculate: reforms and household inputs start in 2026,
+# and PolicyEngine-US extends its parameters through 2100
+MIN_YEAR = 2026
+MAX_YEAR = 2100
+
+
+def _check_requested_years(years: Optional[list[int]]) -> Optional[list[int]]:
+    """Reject repeated years and years outside ``MIN_YEAR`` to ``MAX_YEAR``."""
+    if years is not None:
+        if len(set(years)) != len(years):
+            raise ValueError("Years must not repeat")
+        if not all(MIN_YEAR <= year <= MAX_YEAR for year in years):
+            raise ValueError(f"Years must be from {MIN_YEAR} to {MAX_YEAR}")
+    return years
 
 
 class HouseholdInput(BaseModel):
@@ -55,6 +70,35 @@ class SinglePointRequest(BaseModel):
     household: HouseholdInput
     policy_config: Optional[PolicyConfig] = None
     baseline_scenario: Literal["Current Law", "Current Policy"] = "Current Law"
+    profile: bool = Field(
+        default=False, description="Write a per-variable profile of the request"
+    )
+    memory: bool = Field(
+        default=False, description="Report the request's memory use by stage"
+    )
+    years: Optional[list[int]] = Field(
+        default=None, min_length=1, description="Years to calculate (default 2026)"
+    )
+
+    @field_validator("years")
+    @classmethod
+    def _check_years(cls, years):
+        return _check_requested_years(years)
+
+
+class SensitivityRequest(BaseModel):
+    """Request for per-input sensitivities of a single household."""
+
+    household: HouseholdInput
+    policy_config: Optional[PolicyConfig] = None
+    baseline_scenario: Literal["Current Law", "Current Policy"] = "Current Law"
+    delta: float = Field(default=100, gt=0, description="Step applied to each input")
+    profile: bool = Field(
+        default=False, description="Write a per-variable profile of the request"
+    )
+    memory: bool = Field(
+        default=False, description="Report the request's memory use by stage"
+    )
 
 
 class SaltAxisRequest(BaseModel):
@@ -66,6 +110,52 @@ class SaltAxisRequest(BaseModel):
     min_salt: float = Field(default=0, description="Minimum SALT value")
     max_salt: float = Field(default=300000, description="Maximum SALT value")
     count: int = Field(default=600, description="Number of points")
+    resolution: Literal["fixed", "auto"] = Field(
+        default="fixed",
+        description="Use the requested counts, or the cheapest calibrated ones",
+    )
+    max_error: float = Field(
+        default=100,
+        gt=0,
+        description="Dollars interpolating between auto-resolution points may be off",
+    )
+    oversize: Optional[Literal["accept", "reject", "downscale", "queue"]] = Field(
+        default=None,
+        description="Handling of requests estimated to take longer than allowed "
+        "(default: reject; until the cost model is fitted, only the largest)",
+    )
+    marginal_rates: bool = Field(
+        default=False, description="Also return finite-difference marginal rates"
+    )
+    marginal_delta: float = Field(
+        default=100, gt=0, description="SALT step used for marginal rates"
+    )
+    prune: bool = Field(
+        default=False, description="Pin programs that cannot affect the outputs"
+    )
+    profile: bool = Field(
+        default=False, description="Write a per-variable profile of the request"
+    )
+    memory: bool = Field(
+        default=False, description="Report the request's memory use by stage"
+    )
+    years: Optional[list[int]] = Field(
+        default=None, min_length=1, description="Years to calculate (default 2026)"
+    )
+    encoding: Literal["dense", "breakpoints"] = Field(
+        default="dense",
+        description="Return every point, or each series' breakpoints only",
+    )
+    tolerance: float = Field(
+        default=0.1,
+        ge=0,
+        description="Dollars a decoded breakpoint series may differ by",
+    )
+
+    @field_validator("years")
+    @classmethod
+    def _check_years(cls, years):
+        return _check_requested_years(years)
 
 
 class IncomeAxisRequest(BaseModel):
@@ -77,6 +167,52 @@ class IncomeAxisRequest(BaseModel):
     min_income: float = Field(default=0, description="Minimum income value")
     max_income: float = Field(default=1000000, description="Maximum income value")
     count: int = Field(default=1000, description="Number of points")
+    resolution: Literal["fixed", "auto"] = Field(
+        default="fixed",
+        description="Use the requested counts, or the cheapest calibrated ones",
+    )
+    max_error: float = Field(
+        default=100,
+        gt=0,
+        description="Dollars interpolating between auto-resolution points may be off",
+    )
+    oversize: Optional[Literal["accept", "reject", "downscale", "queue"]] = Field(
+        default=None,
+        description="Handling of requests estimated to take longer than allowed "
+        "(default: reject; until the cost model is fitted, only the largest)",
+    )
+    marginal_rates: bool = Field(
+        default=False, description="Also return finite-difference marginal rates"
+    )
+    marginal_delta: float = Field(
+        default=100, gt=0, description="Income step used for marginal rates"
+    )
+    prune: bool = Field(
+        default=False, description="Pin programs that cannot affect the outputs"
+    )
+    profile: bool = Field(
+        default=False, description="Write a per-variable profile of the request"
+    )
+    memory: bool = Field(
+        default=False, description="Report the request's memory use by stage"
+    )
+    years: Optional[list[int]] = Field(
+        default=None, min_length=1, description="Years to calculate (default 2026)"
+    )
+    encoding: Literal["dense", "breakpoints"] = Field(
+        default="dense",
+        description="Return every point, or each series' breakpoints only",
+    )
+    tolerance: float = Field(
+        default=0.1,
+        ge=0,
+        description="Dollars a decoded breakpoint series may differ by",
+    )
+
+    @field_validator("years")
+    @classmethod
+    def _check_years(cls, years):
+        return _check_requested_years(years)
 
 
 class TwoAxesRequest(BaseModel):
@@ -91,6 +227,250 @@ class TwoAxesRequest(BaseModel):
     min_income: float = Field(default=0)
     max_income: float = Field(default=1000000)
     income_count: int = Field(default=1400)
+    resolution: Literal["fixed", "auto"] = Field(
+        default="fixed",
+        description="Use the requested counts, or the cheapest calibrated ones",
+    )
+    max_error: float = Field(
+        default=100,
+        gt=0,
+        description="Dollars interpolating between auto-resolution points may be off",
+    )
+    oversize: Optional[Literal["accept", "reject", "downscale", "queue"]] = Field(
+        default=None,
+        description="Handling of requests estimated to take longer than allowed "
+        "(default: reject; until the cost model is fitted, only the largest)",
+    )
+    amt_screening: bool = Field(
+        default=False, description="Skip AMT where it provably cannot bind"
+    )
+    verify_amt_screening: bool = Field(
+        default=False,
+        description="Calculate AMT in screened cells too and report those the "
+        "screen misclassified",
+    )
+    prune: bool = Field(
+        default=False, description="Pin programs that cannot affect the outputs"
+    )
+    low_memory: bool = Field(
+        default=False,
+        description="Simulate the grid in chunks and keep outputs as float32",
+    )
+    profile: bool = Field(
+        default=False, description="Write a per-variable profile of the request"
+    )
+    memory: bool = Field(
+        default=False, description="Report the request's memory use by stage"
+    )
+    years: Optional[list[int]] = Field(
+        default=None, min_length=1, description="Years to calculate (default 2026)"
+    )
+
+    @field_validator("years")
+    @classmethod
+    def _check_years(cls, years):
+        return _check_requested_years(years)
+
+    @model_validator(mode="after")
+    def _check_amt_screening(self):
+        """Reject AMT screening of multi-year grids."""
+        if self.amt_screening and self.years:
+            raise ValueError("AMT screening supports only the 2026 grid")
+        return self
+
+
+class TilesRequest(BaseModel):
+    """Request for the two-axes grid tiles covering a viewport."""
+
+    household: HouseholdInput
+    policy_config: Optional[PolicyConfig] = None
+    baseline_scenario: Literal["Current Law", "Current Policy"] = "Current Law"
+    min_salt: float = Field(default=-50000)
+    max_salt: float = Field(default=250000)
+    min_income: float = Field(default=0)
+    max_income: float = Field(default=1000000)
+    resolution: int = Field(
+        default=128, ge=1, le=2048, description="Points wanted across the viewport"
+    )
+    memory: bool = Field(
+        default=False, description="Report the request's memory use by stage"
+    )
+
+    @model_validator(mode="after")
+    def _check_viewport(self):
+        """Reject empty, out-of-grid and oversized viewports."""
+        from .simulation.tiles import viewport_tiles
+
+        viewport_tiles(
+            self.min_salt,
+            self.max_salt,
+            self.min_income,
+            self.max_income,
+            self.resolution,
+        )
+        return self
+
+
+class FrontierRequest(BaseModel):
+    """Request for the SALT level at which AMT starts to bind, per income."""
+
+    household: HouseholdInput
+    policy_config: Optional[PolicyConfig] = None
+    baseline_scenario: Literal["Current Law", "Current Policy"] = "Current Law"
+    min_salt: float = Field(default=-50000)
+    max_salt: float = Field(default=250000)
+    min_income: float = Field(default=0)
+    max_income: float = Field(default=1000000)
+    income_count: int = Field(default=1400, gt=0)
+    tolerance: float = Field(default=100, gt=0, description="SALT accuracy")
+    scan_count: int = Field(
+        default=16, ge=2, description="SALT levels scanned before bisecting"
+    )
+    memory: bool = Field(
+        default=False, description="Report the request's memory use by stage"
+    )
+
+
+class EffectiveSaltCapRequest(BaseModel):
+    """Request for the effective SALT cap and income tax kinks along SALT."""
+
+    household: HouseholdInput
+    policy_config: Optional[PolicyConfig] = None
+    baseline_scenario: Literal["Current Law", "Current Policy"] = "Current Law"
+    employment_incomes: Optional[list[float]] = Field(
+        default=None,
+        description="Incomes to solve for; defaults to the household's income",
+    )
+    min_salt: float = Field(default=0)
+    max_salt: float = Field(default=300000)
+    tolerance: float = Field(default=500, gt=0)
+    delta: float = Field(default=100, gt=0, description="SALT step for slopes")
+    scan_count: int = Field(default=16, ge=2)
+    memory: bool = Field(
+        default=False, description="Report the request's memory use by stage"
+    )
+
+
+class AllStatesRequest(BaseModel):
+    """Request for one household profile evaluated in every state.
+
+    The household's own ``state_code`` is ignored in favour of ``state_codes``.
+    """
+
+    household: HouseholdInput
+    policy_config: Optional[PolicyConfig] = None
+    baseline_scenario: Literal["Current Law", "Current Policy"] = "Current Law"
+    state_codes: Optional[list[str]] = Field(
+        default=None, description="States to evaluate; defaults to all 50 and DC"
+    )
+    axis: Optional[Literal["salt", "income"]] = Field(
+        default=None, description="Axis to vary in every state, if any"
+    )
+    min_salt: float = Field(default=0)
+    max_salt: float = Field(default=300000)
+    min_income: float = Field(default=0)
+    max_income: float = Field(default=1000000)
+    count: Optional[int] = Field(
+        default=None, gt=0, description="Axis points; defaults to the axis default"
+    )
+    memory: bool = Field(
+        default=False, description="Report the request's memory use by stage"
+    )
+
+    @field_validator("state_codes")
+    @classmethod
+    def _check_state_codes(cls, state_codes):
+        """Reject unknown state codes and drop repeats, keeping their order."""
+        if state_codes is None:
+            return None
+        from .simulation.situation import STATE_CODES
+
+        unknown = sorted(set(state_codes) - set(STATE_CODES))
+        if unknown:
+            raise ValueError(f"Unknown state codes: {', '.join(unknown)}")
+        return list(dict.fromkeys(state_codes))
+
+
+class PolicySweepRequest(BaseModel):
+    """Request for one household evaluated under many policy configurations."""
+
+    household: HouseholdInput
+    policy_configs: Optional[list[PolicyConfig]] = Field(
+        default=None, description="Configurations to sweep; defaults to all"
+    )
+    baseline_scenario: Literal["Current Law", "Current Policy"] = "Current Law"
+    memory: bool = Field(
+        default=False, description="Report the request's memory use by stage"
+    )
+
+
+class MemoryStage(BaseModel):
+    """Memory traced in one stage of a request, summed over its calls."""
+
+    calls: int
+    allocated_bytes: int
+    peak_bytes: int
+
+
+class AllocationSite(BaseModel):
+    """A source line and the traced memory it held when the request ended."""
+
+    site: str
+    size_bytes: int
+    count: int
+
+
+class MemoryReport(BaseModel):
+    """Memory use of a request with ``memory`` set, in bytes.
+
+    ``peak_rss_bytes`` covers only the request when ``peak_rss_reset``, and
+    is the process's peak otherwise.
+    """
+
+    peak_rss_bytes: int
+    peak_rss_reset: bool
+    rss_start_bytes: Optional[int] = None
+    rss_end_bytes: Optional[int] = None
+    traced_peak_bytes: int
+    stages: dict[str, MemoryStage]
+    top_allocations: list[AllocationSite]
+
+
+class CostEstimate(BaseModel):
+    """Sizes a request's cost is estimated from, and the estimate."""
+
+    households: int
+    persons: int
+    periods: int
+    variables: int
+    seconds: float
+
+
+class AdmissionReport(BaseModel):
+    """How a request estimated over its time budget was handled.
+
+    ``counts`` are the counts requested; a downscaled response reports the
+    counts it was calculated at as usual.
+    """
+
+    action: Literal["downscale", "queue", "reject"]
+    estimate: CostEstimate
+    budget_seconds: float
+    counts: dict[str, int]
+
+
+class QueuedResponse(BaseModel):
+    """Response for a request queued to run asynchronously.
+
+    The result is fetched from the job result endpoint with ``job_id``,
+    which reports jobs still running as pending and jobs that raised, or
+    whose result has expired, as failed with the ``error``.
+    """
+
+    job_id: str
+    status: Literal["queued", "pending", "failed"]
+    admission: Optional[AdmissionReport] = None
+    error: Optional[str] = None
 
 
 class SinglePointResponse(BaseModel):
@@ -108,6 +488,19 @@ class SinglePointResponse(BaseModel):
     amt_income: float
     larger_of_state_sales_or_income_tax: float
     state_income_tax_over_sales_tax: bool
+    years: Optional[list[int]] = None
+    yearly: Optional[dict[str, list]] = None
+
+
+class SensitivityResponse(BaseModel):
+    """Response for sensitivity calculation, keyed by output then input."""
+
+    inputs: list[str]
+    outputs: list[str]
+    values: dict[str, float]
+    jacobian: dict[str, dict[str, float]]
+    forward: dict[str, dict[str, float]]
+    backward: dict[str, dict[str, Optional[float]]]
 
 
 class AxisResponse(BaseModel):
@@ -123,6 +516,33 @@ class AxisResponse(BaseModel):
     reported_salt: Optional[list[float]] = None
     employment_income: Optional[list[float]] = None
     gap: Optional[list[float]] = None
+    marginal_income_tax: Optional[list[float]] = None
+    marginal_regular_tax: Optional[list[float]] = None
+    marginal_amt: Optional[list[float]] = None
+    years: Optional[list[int]] = None
+    yearly: Optional[dict[str, list[list[float]]]] = None
+
+
+class BreakpointSeries(BaseModel):
+    """A series encoded as the indices and values of its breakpoints."""
+
+    index: list[int]
+    value: list[float]
+
+
+class EncodedAxisResponse(BaseModel):
+    """Response for axis calculations with ``encoding="breakpoints"``.
+
+    Interpolate each series linearly over point indices ``0`` to
+    ``count - 1`` to recover the dense ``AxisResponse`` fields.
+    """
+
+    encoding: Literal["breakpoints"]
+    count: int
+    tolerance: float
+    series: dict[str, BreakpointSeries]
+    years: Optional[list[int]] = None
+    yearly: Optional[dict[str, list[BreakpointSeries]]] = None
 
 
 class TwoAxesResponse(BaseModel):
@@ -137,3 +557,83 @@ class TwoAxesResponse(BaseModel):
     taxable_income: list[float]
     amt_income: list[float]
     amt_binds: list[bool]
+    amt_screened_cells: Optional[int] = None
+    amt_misclassified_cells: Optional[list[int]] = None
+    years: Optional[list[int]] = None
+    yearly: Optional[dict[str, list[list]]] = None
+
+
+class Tile(BaseModel):
+    """One tile of the two-axes grid; outputs are flat, income major."""
+
+    x: int
+    y: int
+    salt_values: list[float]
+    income_values: list[float]
+    cached: bool
+    regular_tax: list[float]
+    amt: list[float]
+    salt_deduction: list[float]
+    income_tax: list[float]
+    taxable_income: list[float]
+    amt_income: list[float]
+    amt_binds: list[bool]
+
+
+class TilesResponse(BaseModel):
+    """Response for the tiles covering a viewport."""
+
+    zoom: int
+    tile_size: int
+    salt_step: float
+    income_step: float
+    computed_tiles: int
+    tiles: list[Tile]
+
+
+class FrontierResponse(BaseModel):
+    """Response for AMT frontier calculation."""
+
+    employment_income: list[float]
+    frontier_salt: list[Optional[float]]
+    binds_at_min_salt: list[bool]
+    iterations: int
+    households_simulated: int
+
+
+class EffectiveSaltCapResponse(BaseModel):
+    """Response for effective SALT cap calculation, one entry per income."""
+
+    employment_income: list[float]
+    effective_cap: list[Optional[float]]
+    breakpoints: list[list[float]]
+    income_tax_at_breakpoints: list[list[float]]
+    segment_slopes: list[list[float]]
+    iterations: int
+    households_simulated: int
+
+
+class AllStatesResponse(BaseModel):
+    """Response for all-states calculation.
+
+    Each entry of ``values`` is indexed by state, and additionally by axis
+    point when an axis was requested.
+    """
+
+    state_codes: list[str]
+    axis_values: Optional[list[float]] = None
+    values: dict[str, list]
+
+
+class PolicySweepResponse(BaseModel):
+    """Response for policy sweep, with one entry per configuration.
+
+    ``values`` holds the single-point outputs; entries are None where the
+    configuration's reform failed, with the reason in ``errors``.
+    """
+
+    policy_configs: list[PolicyConfig]
+    reform_index: list[int]
+    unique_reforms: int
+    values: dict[str, list]
+    errors: list[Optional[str]]
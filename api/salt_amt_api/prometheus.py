@@ -0,0 +1,331 @@
+"""Prometheus exposition of the API's metrics.
+
+Each container records its own requests, simulations, result-cache use and
+readiness, and ``collect`` snapshots them with the simulation and memory
+metrics. The service runs in many containers, so snapshots are published to
+a shared store and the metrics endpoint renders them combined with
+``render_metrics``: counters and histograms are summed across every
+container that has published, gauges only across those that published
+within ``STALE_SECONDS``. Containers that have not published for
+``RETIRE_SECONDS`` are gone, so ``retire_snapshots`` folds their counters
+and histograms into one retired snapshot to keep the store from growing
+with every container ever started.
+
+A snapshot maps each metric name to its family::
+
+    {"type": "counter", "help": "...", "samples": [[{"endpoint": "single"}, 3.0]]}
+
+where histogram samples hold a ``Histogram.snapshot()`` and gauge families
+may set ``"merge": "max"`` to combine by maximum rather than sum.
+"""
+
+import math
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from .metrics import Counter, Gauge, Histogram
+from .simulation.calculation import simulation_stats
+from .simulation.memory import memory_stats
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Gauges from containers that have not published for this long are dropped
+STALE_SECONDS = 60
+
+# Snapshots not published for this long are folded into the snapshot stored
+# under RETIRED_KEY. Running containers publish every few seconds, so only
+# stopped containers' snapshots get this old.
+RETIRE_SECONDS = 600
+RETIRED_KEY = "retired"
+
+# Request latency buckets, in seconds, up to the longest handler timeout
+REQUEST_SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 60, 150, 300, 900)
+
+READY_HELP = "1 once a container has loaded the tax-benefit system."
+
+_requests: dict[tuple[str, str], Counter] = {}
+_request_seconds: dict[str, Histogram] = {}
+_in_flight: dict[str, Gauge] = {}
+_lock = threading.Lock()
+
+
+@contextmanager
+def observe_request(endpoint: str) -> Iterator[None]:
+    """Count and time a request to ``endpoint`` while tracking it in flight.
+
+    Requests that raise are counted with status ``error``.
+    """
+    with _lock:
+        in_flight = _in_flight.setdefault(endpoint, Gauge())
+        seconds = _request_seconds.setdefault(
+            endpoint, Histogram(REQUEST_SECONDS_BUCKETS)
+        )
+    in_flight.inc()
+    start = time.perf_counter()
+    status = "error"
+    try:
+        yield
+        status = "ok"
+    finally:
+        seconds.observe(time.perf_counter() - start)
+        in_flight.dec()
+        with _lock:
+            requests = _requests.setdefault((endpoint, status), Counter())
+        requests.inc()
+
+
+def tax_system_loaded() -> bool:
+    """Return whether this process has loaded the PolicyEngine-US tax system.
+
+    The system is built when ``policyengine_us`` is imported, which the
+    handlers do on their first request.
+    """
+    module = sys.modules.get("policyengine_us")
+    simulation = getattr(module, "Simulation", None)
+    return getattr(simulation, "default_tax_benefit_system_instance", None) is not None
+
+
+def _family(kind: str, help: str, samples: list, **extra) -> dict:
+    return {"type": kind, "help": help, "samples": samples, **extra}
+
+
+def collect(cache=None) -> dict:
+    """Snapshot this process's metrics, with ``cache``'s if given.
+
+    Returns the time of the snapshot and its metric families.
+    """
+    with _lock:
+        requests = dict(_requests)
+        request_seconds = dict(_request_seconds)
+        in_flight = dict(_in_flight)
+
+    families = {
+        "salt_amt_requests_total": _family(
+            "counter",
+            "Requests handled, by endpoint and status.",
+            [
+                [{"endpoint": endpoint, "status": status}, counter.value]
+                for (endpoint, status), counter in sorted(requests.items())
+            ],
+        ),
+        "salt_amt_request_duration_seconds": _family(
+            "histogram",
+            "Request latency, by endpoint.",
+            [
+                [{"endpoint": endpoint}, histogram.snapshot()]
+                for endpoint, histogram in sorted(request_seconds.items())
+            ],
+        ),
+        "salt_amt_requests_in_flight": _family(
+            "gauge",
+            "Requests being handled, by endpoint.",
+            [
+                [{"endpoint": endpoint}, gauge.value]
+                for endpoint, gauge in sorted(in_flight.items())
+            ],
+        ),
+        "salt_amt_ready": _family(
+            "gauge",
+            READY_HELP,
+            [[{}, float(tax_system_loaded())]],
+            merge="max",
+        ),
+    }
+
+    simulations = simulation_stats()
+    families["salt_amt_simulations_total"] = _family(
+        "counter",
+        "Simulations run, by kind of calculation.",
+        [
+            [{"kind": kind}, stats["simulations"]]
+            for kind, stats in sorted(simulations.items())
+        ],
+    )
+    families["salt_amt_households_simulated_total"] = _family(
+        "counter",
+        "Households simulated, by kind of calculation.",
+        [
+            [{"kind": kind}, stats["households"]]
+            for kind, stats in sorted(simulations.items())
+        ],
+    )
+    memory = memory_stats()
+    for name, description in [
+        ("peak_rss_bytes", "Peak RSS of memory-monitored requests"),
+        ("traced_peak_bytes", "Traced allocation peak of monitored requests"),
+    ]:
+        families[f"salt_amt_request_{name}"] = _family(
+            "histogram",
+            f"{description}, by endpoint.",
+            [
+                [{"endpoint": endpoint}, histograms[name]]
+                for endpoint, histograms in sorted(memory.items())
+            ],
+        )
+
+    if cache is not None:
+        stats = cache.stats()
+        families["salt_amt_result_cache_requests_total"] = _family(
+            "counter",
+            "Result-cache lookups: stored hits, in-flight shares and misses.",
+            [
+                [{"result": "hit"}, stats["hits"]],
+                [{"result": "shared"}, stats["shared"]],
+                [{"result": "miss"}, stats["misses"]],
+            ],
+        )
+        families["salt_amt_result_cache_entries"] = _family(
+            "gauge", "Results held in the result cache.", [[{}, stats["size"]]]
+        )
+        families["salt_amt_result_cache_bytes"] = _family(
+            "gauge",
+            "Estimated bytes held by the result cache.",
+            [[{}, stats["bytes"]]],
+        )
+
+    return {"time": time.time(), "families": families}
+
+
+def _labels_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+def merge_snapshots(snapshots: list[dict], now: Optional[float] = None) -> dict:
+    """Combine snapshots from many containers into one set of families."""
+    now = time.time() if now is None else now
+    merged: dict[str, dict] = {}
+    for snapshot in snapshots:
+        fresh = now - snapshot["time"] <= STALE_SECONDS
+        for name, family in snapshot["families"].items():
+            if family["type"] == "gauge" and not fresh:
+                continue
+            target = merged.setdefault(name, {**family, "samples": {}})
+            for labels, value in family["samples"]:
+                key = _labels_key(labels)
+                if key not in target["samples"]:
+                    target["samples"][key] = value
+                elif family["type"] == "histogram":
+                    current = target["samples"][key]
+                    target["samples"][key] = {
+                        "buckets": current["buckets"],
+                        "counts": [
+                            a + b for a, b in zip(current["counts"], value["counts"])
+                        ],
+                        "count": current["count"] + value["count"],
+                        "sum": current["sum"] + value["sum"],
+                    }
+                elif family.get("merge") == "max":
+                    target["samples"][key] = max(target["samples"][key], value)
+                else:
+                    target["samples"][key] += value
+    return {
+        name: {
+            **family,
+            "samples": [[dict(key), value] for key, value in family["samples"].items()],
+        }
+        for name, family in merged.items()
+    }
+
+
+def retire_snapshots(
+    snapshots: dict[str, dict], now: Optional[float] = None
+) -> tuple[Optional[dict], list[str]]:
+    """Fold the snapshots of stopped containers into one retired snapshot.
+
+    ``snapshots`` maps store keys to snapshots, including any retired
+    snapshot under ``RETIRED_KEY``. Returns the new retired snapshot, with
+    the summed counters and histograms of it and every snapshot not
+    published within ``RETIRE_SECONDS``, and the keys of those snapshots to
+    remove; the snapshot is None when there are none.
+    """
+    now = time.time() if now is None else now
+    stale = [
+        key
+        for key, snapshot in snapshots.items()
+        if key != RETIRED_KEY and now - snapshot["time"] > RETIRE_SECONDS
+    ]
+    if not stale:
+        return None, []
+    folded = [snapshots[key] for key in stale]
+    if RETIRED_KEY in snapshots:
+        folded.append(snapshots[RETIRED_KEY])
+    families = {
+        name: family
+        for name, family in merge_snapshots(folded, now).items()
+        if family["type"] != "gauge"
+    }
+    return {"time": now, "families": families}, stale
+
+
+def _cache_hit_ratio(families: dict) -> Optional[float]:
+    """Return the share of result-cache lookups that did not compute."""
+    family = families.get("salt_amt_result_cache_requests_total")
+    if family is None:
+        return None
+    counts = {labels["result"]: value for labels, value in family["samples"]}
+    total = sum(counts.values())
+    if not total:
+        return None
+    return (counts.get("hit", 0) + counts.get("shared", 0)) / total
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = (f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
+
+
+def render(families: dict) -> str:
+    """Render metric families in the Prometheus text exposition format."""
+    lines = []
+    for name, family in sorted(families.items()):
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for labels, value in family["samples"]:
+            if family["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(value["buckets"], value["counts"]):
+                cumulative += count
+                bucket_labels = {**labels, "le": _format_value(bound)}
+                lines.append(
+                    f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}"
+                )
+            lines.append(
+                f"{name}_sum{_format_labels(labels)} {_format_value(value['sum'])}"
+            )
+            lines.append(f"{name}_count{_format_labels(labels)} {value['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def render_metrics(snapshots: list[dict], now: Optional[float] = None) -> str:
+    """Render published snapshots combined, with the result-cache hit ratio."""
+    families = merge_snapshots(snapshots, now)
+    if "salt_amt_ready" not in families:
+        # No container has published within STALE_SECONDS
+        families["salt_amt_ready"] = _family("gauge", READY_HELP, [[{}, 0.0]])
+    ratio = _cache_hit_ratio(families)
+    if ratio is not None:
+        families["salt_amt_result_cache_hit_ratio"] = _family(
+            "gauge",
+            "Share of result-cache lookups answered without computing.",
+            [[{}, ratio]],
+        )
+    return render(families)
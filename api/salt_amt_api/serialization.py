@@ -0,0 +1,172 @@
+"""Trusted-output JSON serialization of calculation results.
+
+Calculation results are built by this package, so responses are encoded
+straight to JSON bytes rather than validated and copied through their
+response models element by element. ``response_payload`` only orders the
+model's fields and fills in defaults; the shape of each result is checked
+against its response model by the contract tests instead.
+
+NumPy arrays are encoded directly by ``orjson`` where it is installed
+(``pip install salt-amt-api[fast]``); otherwise the standard library encoder
+is used, converting arrays to lists.
+
+Compare the two paths on a two-axes grid with::
+
+    python -m salt_amt_api.serialization --salt-count 100 --income-count 100
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable
+
+import numpy as np
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def _default(value: Any) -> Any:
+    """Encode the NumPy values the JSON encoder cannot."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot serialize {type(value).__name__} to JSON")
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a result, which may hold NumPy arrays, as JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(
+            value,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(value, default=_default, separators=(",", ":")).encode()
+
+
+def response_payload(model: type[BaseModel], result: dict) -> dict:
+    """Return ``result`` with the fields of ``model``, without validating it.
+
+    Missing fields take their defaults, and fields ``model`` does not have
+    are dropped, as validating and dumping the model would.
+    """
+    payload = {}
+    for name, field in model.model_fields.items():
+        if name in result:
+            payload[name] = result[name]
+        elif field.is_required():
+            raise ValueError(f"{model.__name__} result is missing {name}")
+        else:
+            payload[name] = field.get_default(call_default_factory=True)
+    return payload
+
+
+def encode_response(model: type[BaseModel], result: dict) -> bytes:
+    """Encode ``result`` as the JSON body of a ``model`` response."""
+    return dumps(response_payload(model, result))
+
+
+def add_fields(body: bytes, fields: dict) -> bytes:
+    """Add ``fields`` (such as a memory report) to an encoded JSON object."""
+    if not fields:
+        return body
+    if body == b"{}":
+        return dumps(fields)
+    return body[:-1] + b"," + dumps(fields)[1:]
+
+
+def _validated_body(model: type[BaseModel], result: dict) -> bytes:
+    """Encode ``result`` the way returning its validated model dump would."""
+    from fastapi.encoders import jsonable_encoder
+
+    content = jsonable_encoder(model(**result).model_dump())
+    return json.dumps(content, separators=(",", ":")).encode()
+
+
+def _best_seconds(function: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(
+    model: type[BaseModel], result: dict, calculation_seconds: float, repeat: int = 5
+) -> dict:
+    """Time the validated and trusted encodings of one result.
+
+    Returns each path's best time in seconds and its share of a request
+    that also spends ``calculation_seconds`` calculating.
+    """
+    if json.loads(_validated_body(model, result)) != json.loads(
+        encode_response(model, result)
+    ):
+        raise ValueError("Validated and trusted encodings differ")
+    timings = {}
+    for name, encode in [
+        ("validated", lambda: _validated_body(model, result)),
+        ("trusted", lambda: encode_response(model, result)),
+    ]:
+        seconds = _best_seconds(encode, repeat)
+        timings[name] = {
+            "seconds": seconds,
+            "share": seconds / (seconds + calculation_seconds),
+        }
+    return {
+        "encoder": "orjson" if orjson is not None else "json",
+        "calculation_seconds": calculation_seconds,
+        **timings,
+    }
+
+
+def main(argv=None) -> None:
+    from .models import TwoAxesResponse
+    from .simulation.calculation import calculate_two_axes
+
+    parser = argparse.ArgumentParser(
+        description="Time response serialization of a two-axes grid."
+    )
+    parser.add_argument("--salt-count", type=int, default=100)
+    parser.add_argument("--income-count", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    result = calculate_two_axes(
+        is_married=True,
+        state_code="NY",
+        num_children=0,
+        child_ages=[],
+        qualified_dividend_income=0,
+        long_term_capital_gains=0,
+        short_term_capital_gains=0,
+        deductible_mortgage_interest=0,
+        charitable_cash_donations=0,
+        salt_count=args.salt_count,
+        income_count=args.income_count,
+    )
+    calculation_seconds = time.perf_counter() - start
+    timings = benchmark(TwoAxesResponse, result, calculation_seconds, args.repeat)
+
+    print(
+        f"{args.salt_count * args.income_count} cells, "
+        f"calculated in {calculation_seconds:.2f}s, encoded with {timings['encoder']}"
+    )
+    for name in ("validated", "trusted"):
+        print(
+            f"  {name:<9} {timings[name]['seconds'] * 1000:8.1f}ms "
+            f"({timings[name]['share']:.1%} of the request)"
+        )
+
+
+if __name__ == "__main__":
+    main()
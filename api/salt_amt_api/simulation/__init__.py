@@ -1,28 +1,90 @@
 """Simulation package for PolicyEngine-US calculations."""
 
-from .reforms import PolicyReforms, get_reform_params_from_config
+from .reforms import (
+    PolicyReforms,
+    get_reform_params_from_config,
+    enumerate_policy_configs,
+    reform_params_key,
+    minimal_reform_dict,
+    canonical_scenario,
+    scenario_key,
+)
 from .situation import (
     create_situation_without_axes,
     create_situation_with_one_property_tax_axes,
     create_situation_with_one_income_axes,
     create_situation_with_two_axes,
+    combine_situations,
+    add_perturbed_copy,
+    expand_years,
+    STATE_CODES,
 )
+from .dataset import create_household_arrays, create_household_dataset
+from .screening import screen_grid_points
+from .pruning import dependency_closure, pruned_variables
 from .calculation import (
     calculate_single_point,
+    calculate_households,
+    calculate_sensitivity,
     calculate_salt_axis,
     calculate_income_axis,
     calculate_two_axes,
+    calculate_all_states,
+    reform_application_stats,
+    simulation_stats,
 )
+from .solvers import calculate_amt_frontier, calculate_effective_salt_cap
+from .sweep import calculate_policy_sweep
+from .tiles import calculate_tiles, TileStore
+from .batching import MicroBatcher
+from .dedup import ResultCache, request_key
+from .encoding import encode_axis_result, decode_axis_result
+from .profiling import VariableProfiler, profile_request
+from .memory import MemoryMonitor, memory_stats, record_memory
 
 __all__ = [
     "PolicyReforms",
     "get_reform_params_from_config",
+    "enumerate_policy_configs",
+    "reform_params_key",
+    "minimal_reform_dict",
+    "canonical_scenario",
+    "scenario_key",
     "create_situation_without_axes",
     "create_situation_with_one_property_tax_axes",
     "create_situation_with_one_income_axes",
     "create_situation_with_two_axes",
+    "combine_situations",
+    "add_perturbed_copy",
+    "expand_years",
+    "STATE_CODES",
+    "create_household_arrays",
+    "create_household_dataset",
+    "screen_grid_points",
+    "dependency_closure",
+    "pruned_variables",
     "calculate_single_point",
+    "calculate_households",
+    "calculate_sensitivity",
     "calculate_salt_axis",
     "calculate_income_axis",
     "calculate_two_axes",
+    "calculate_all_states",
+    "reform_application_stats",
+    "simulation_stats",
+    "calculate_amt_frontier",
+    "calculate_effective_salt_cap",
+    "calculate_policy_sweep",
+    "calculate_tiles",
+    "TileStore",
+    "MicroBatcher",
+    "ResultCache",
+    "request_key",
+    "encode_axis_result",
+    "decode_axis_result",
+    "VariableProfiler",
+    "profile_request",
+    "MemoryMonitor",
+    "memory_stats",
+    "record_memory",
 ]
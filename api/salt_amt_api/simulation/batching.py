@@ -0,0 +1,136 @@
+"""Micro-batching of concurrent single-point calculations."""
+
+import json
+import threading
+import time
+from concurrent.futures import Future
+from typing import Optional
+
+from ..metrics import Histogram
+from .calculation import calculate_households, _cached_tax_benefit_system
+from .reforms import scenario_key
+
+
+class MicroBatcher:
+    """Collect concurrent single-point requests and run them together.
+
+    Callers block in ``calculate`` while a background thread gathers
+    requests for up to ``max_wait`` seconds (or until ``max_batch_size``
+    share a scenario and reform), runs each group as one multi-household
+    simulation and hands every caller its own household's results.
+    Scenarios are grouped by ``scenario_key``, so a policy config under
+    either baseline scenario joins the same group, and identical households
+    in a batch are simulated once.
+    """
+
+    def __init__(self, max_batch_size: int = 64, max_wait: float = 0.005):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait < 0:
+            raise ValueError("max_wait must not be negative")
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batch_sizes = Histogram((1, 2, 4, 8, 16, 32, 64, 128, 256))
+        self.queue_seconds = Histogram((0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1))
+        # scenario_key -> [(household, future, enqueued)]
+        self._pending: dict[tuple[str, str], list] = {}
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def calculate(
+        self,
+        household: dict,
+        baseline_scenario: str = "Current Law",
+        reform_params: Optional[dict] = None,
+    ) -> dict:
+        """Calculate one household; arguments as for ``calculate_households``.
+
+        Returns the same fields as ``calculate_single_point``.
+        """
+        return self.submit(household, baseline_scenario, reform_params).result()
+
+    def submit(
+        self,
+        household: dict,
+        baseline_scenario: str = "Current Law",
+        reform_params: Optional[dict] = None,
+    ) -> Future:
+        """Queue one household and return a future for its results."""
+        future = Future()
+        key = scenario_key(baseline_scenario, reform_params)
+        with self._condition:
+            self._pending.setdefault(key, []).append(
+                (household, future, time.perf_counter())
+            )
+            self._condition.notify()
+        return future
+
+    def stats(self) -> dict:
+        """Return batch-size and queue-wait distributions."""
+        return {
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_seconds": self.queue_seconds.snapshot(),
+        }
+
+    def _next_batch(self) -> tuple[tuple[str, str], list]:
+        """Wait for a group that is full or whose oldest request is due."""
+        with self._condition:
+            while True:
+                now = time.perf_counter()
+                due = None
+                for key, requests in self._pending.items():
+                    deadline = requests[0][2] + self.max_wait
+                    if len(requests) >= self.max_batch_size or deadline <= now:
+                        batch = requests[: self.max_batch_size]
+                        del requests[: self.max_batch_size]
+                        if not requests:
+                            del self._pending[key]
+                        return key, batch
+                    due = deadline if due is None else min(due, deadline)
+                self._condition.wait(None if due is None else due - now)
+
+    def _run(self):
+        while True:
+            (baseline_scenario, key), batch = self._next_batch()
+            start = time.perf_counter()
+            self.batch_sizes.observe(len(batch))
+            for _, _, enqueued in batch:
+                self.queue_seconds.observe(start - enqueued)
+
+            try:
+                system = _cached_tax_benefit_system(baseline_scenario, key)
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            try:
+                _scatter(batch, system)
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(e)
+                    continue
+                # Rerun one by one so a bad household only fails its caller
+                for request in batch:
+                    try:
+                        _scatter([request], system)
+                    except Exception as e:
+                        request[1].set_exception(e)
+
+
+def _scatter(batch: list, tax_benefit_system) -> None:
+    """Run a batch as one simulation and resolve each caller's future.
+
+    Identical households share one row of the simulation.
+    """
+    rows, households = [], {}
+    for household, _, _ in batch:
+        key = json.dumps(household, sort_keys=True)
+        rows.append(households.setdefault(key, (len(households), household))[0])
+    results = calculate_households(
+        [household for _, household in households.values()],
+        tax_benefit_system=tax_benefit_system,
+    )
+    for row, (_, future, _) in zip(rows, batch):
+        future.set_result({name: values[row] for name, values in results.items()})
@@ -1,39 +1,378 @@
 """Calculation functions for PolicyEngine-US simulations."""
 
-from typing import Optional
+import gc
+import json
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Literal, Optional
 import numpy as np
 
-from policyengine_us import Simulation
+from policyengine_us import CountryTaxBenefitSystem, Simulation
+from policyengine_core.data import Dataset
 from policyengine_core.reforms import Reform
 
-from .reforms import PolicyReforms, CURRENT_POLICY_PARAMS, get_reform_params_from_config
+from .reforms import (
+    PolicyReforms,
+    CURRENT_POLICY_PARAMS,
+    get_reform_params_from_config,
+    minimal_reform_dict,
+    scenario_key,
+)
 from .situation import (
     create_situation_without_axes,
     create_situation_with_one_property_tax_axes,
     create_situation_with_one_income_axes,
     create_situation_with_two_axes,
+    add_perturbed_copy,
+    combine_situations,
+    expand_years,
+    STATE_CODES,
 )
+from .dataset import create_household_dataset
+from .screening import screen_grid_points
+from .pruning import prune_simulation
+from .profiling import profiling, track
+from ..metrics import Counter, Histogram
 
+# Seconds spent building reformed tax-benefit systems, and reforms that
+# matched the baseline and so reused the unreformed system
+reform_application_seconds = Histogram((1, 2, 5, 10, 20, 30, 60))
+noop_reforms = Counter()
 
-def _create_simulation(
-    situation: dict,
+# Simulations run and households simulated, by kind of calculation
+simulation_counts: dict[str, Counter] = {}
+household_counts: dict[str, Counter] = {}
+_simulation_counts_lock = threading.Lock()
+
+# Single-point outputs and the household variable each one reports
+SINGLE_POINT_VARIABLES = {
+    "household_net_income": "household_net_income",
+    "federal_income_tax": "income_tax",
+    "state_income_tax": "state_withheld_income_tax",
+    "state_sales_tax": "state_sales_tax",
+    "salt_deduction": "salt_deduction",
+    "reported_salt": "reported_salt",
+    "regular_tax": "regular_tax_before_credits",
+    "amt": "amt_base_tax",
+    "taxable_income": "taxable_income",
+    "amt_income": "amt_income",
+}
+
+# Axis outputs shared by the SALT and income axes
+AXIS_VARIABLES = {
+    "salt_deduction": "salt_deduction",
+    "regular_tax": "regular_tax_before_credits",
+    "amt": "amt_base_tax",
+    "income_tax": "income_tax",
+    "taxable_income": "taxable_income",
+    "amt_income": "amt_income",
+}
+
+# Two-axes outputs and the household variable each one reports
+TWO_AXES_VARIABLES = {
+    "employment_income": "employment_income",
+    "reported_salt": "reported_salt",
+    "regular_tax": "regular_tax_before_credits",
+    "amt": "amt_base_tax",
+    "salt_deduction": "salt_deduction",
+    "income_tax": "income_tax",
+    "taxable_income": "taxable_income",
+    "amt_income": "amt_income",
+}
+
+# Grid cells simulated at once by calculate_two_axes with ``low_memory``.
+# Each cell holds about 30kB of intermediate values while simulated, and
+# each chunk adds a few seconds of fixed simulation overhead.
+LOW_MEMORY_CHUNK_CELLS = 50000
+
+# Marginal rate outputs and the household variable each is the slope of
+MARGINAL_RATE_VARIABLES = {
+    "marginal_income_tax": "income_tax",
+    "marginal_regular_tax": "regular_tax_before_credits",
+    "marginal_amt": "amt_base_tax",
+}
+
+# HouseholdInput amounts perturbed by the sensitivity calculation
+SENSITIVITY_INPUTS = [
+    "employment_income",
+    "real_estate_taxes",
+    "long_term_capital_gains",
+    "short_term_capital_gains",
+    "qualified_dividend_income",
+    "deductible_mortgage_interest",
+    "charitable_cash_donations",
+]
+
+# Household outputs whose response to each input is reported
+SENSITIVITY_OUTPUTS = ["income_tax", "amt_base_tax", "household_net_income"]
+
+
+def _get_reform(
     baseline_scenario: str,
     reform_params: Optional[dict] = None,
-) -> Simulation:
-    """Create a simulation based on scenario and reform params."""
+) -> Optional[Reform]:
+    """Return the reform for a scenario, or None for unreformed Current Law."""
     if baseline_scenario == "Current Law" and reform_params is None:
-        return Simulation(situation=situation)
+        return None
     elif baseline_scenario == "Current Policy" and reform_params is None:
-        current_policy_reform = PolicyReforms.policy_reforms(CURRENT_POLICY_PARAMS)
-        reform = Reform.from_dict(current_policy_reform, country_id="us")
-        return Simulation(situation=situation, reform=reform)
+        reform_dict = PolicyReforms.policy_reforms(CURRENT_POLICY_PARAMS)
     elif reform_params is not None:
         reform_dict = PolicyReforms.policy_reforms(reform_params)
-        reform = Reform.from_dict(reform_dict, country_id="us")
-        return Simulation(situation=situation, reform=reform)
     else:
         raise ValueError(f"Invalid scenario configuration")
 
+    # Only parameters that differ from the baseline need applying
+    reform_dict = minimal_reform_dict(
+        reform_dict, Simulation.default_tax_benefit_system_instance.parameters
+    )
+    if not reform_dict:
+        noop_reforms.inc()
+        return None
+    return Reform.from_dict(reform_dict, country_id="us")
+
+
+def _build_tax_benefit_system(
+    baseline_scenario: str,
+    reform_params: Optional[dict] = None,
+    private: bool = False,
+) -> CountryTaxBenefitSystem:
+    """Build the tax-benefit system for a scenario.
+
+    Reforms that change no baseline parameter reuse the unreformed system,
+    unless ``private`` asks for a system no other simulation uses.
+    """
+    reform = _get_reform(baseline_scenario, reform_params)
+    if reform is None:
+        if private:
+            return CountryTaxBenefitSystem()
+        return Simulation.default_tax_benefit_system_instance
+    start = time.perf_counter()
+    system = CountryTaxBenefitSystem(reform=reform)
+    reform_application_seconds.observe(time.perf_counter() - start)
+    return system
+
+
+def reform_application_stats() -> dict:
+    """Return reform build times and the time saved by skipping no-op reforms.
+
+    The saving is estimated as the mean build time of applied reforms for
+    each no-op reform that reused the unreformed system instead.
+    """
+    applied = reform_application_seconds.snapshot()
+    mean = applied["sum"] / applied["count"] if applied["count"] else 0.0
+    return {
+        "applied": applied,
+        "noop_reused": int(noop_reforms.value),
+        "estimated_seconds_saved": noop_reforms.value * mean,
+    }
+
+
+@lru_cache(maxsize=4)
+def _cached_tax_benefit_system(
+    baseline_scenario: str, key: str
+) -> CountryTaxBenefitSystem:
+    """Build (once per process) the tax-benefit system for a scenario key."""
+    return _build_tax_benefit_system(baseline_scenario, json.loads(key))
+
+
+def _create_tax_benefit_system(
+    baseline_scenario: str,
+    reform_params: Optional[dict] = None,
+) -> CountryTaxBenefitSystem:
+    """Return the tax-benefit system for a scenario, to share across simulations.
+
+    Applying a reform rebuilds the whole system, so systems are cached per
+    process under their ``scenario_key``: scenarios that simulate the same
+    reform, such as either baseline with the same policy config, share one.
+
+    Simulations traced by a profiler turn on parameter tracing for their
+    system, so while one is active a private system is built instead, and
+    concurrent requests' parameter reads stay out of its traces.
+    """
+    if profiling():
+        return _build_tax_benefit_system(baseline_scenario, reform_params, private=True)
+    return _cached_tax_benefit_system(*scenario_key(baseline_scenario, reform_params))
+
+
+def _count_simulation(kind: str, simulation: Simulation) -> Simulation:
+    """Count a new simulation and its households under ``kind``."""
+    with _simulation_counts_lock:
+        simulations = simulation_counts.setdefault(kind, Counter())
+        households = household_counts.setdefault(kind, Counter())
+    simulations.inc()
+    households.inc(simulation.populations["household"].count)
+    return simulation
+
+
+def simulation_stats() -> dict:
+    """Return the simulations run and households simulated, by kind."""
+    with _simulation_counts_lock:
+        kinds = list(simulation_counts)
+    return {
+        kind: {
+            "simulations": int(simulation_counts[kind].value),
+            "households": int(household_counts[kind].value),
+        }
+        for kind in kinds
+    }
+
+
+def _create_simulation(
+    kind: str,
+    situation: dict,
+    baseline_scenario: str,
+    reform_params: Optional[dict] = None,
+) -> Simulation:
+    """Create a simulation based on scenario and reform params.
+
+    The simulation is counted under ``kind`` in ``simulation_stats``.
+    """
+    return _count_simulation(
+        kind,
+        track(
+            Simulation(
+                situation=situation,
+                tax_benefit_system=_create_tax_benefit_system(
+                    baseline_scenario, reform_params
+                ),
+            )
+        ),
+    )
+
+
+def _single_point_outputs(simulation: Simulation, year: int = 2026) -> dict:
+    """Calculate single-point outputs for every household in a simulation."""
+    values = {
+        name: simulation.calculate(variable, map_to="household", period=year)
+        for name, variable in SINGLE_POINT_VARIABLES.items()
+    }
+    values["larger_of_state_sales_or_income_tax"] = np.maximum(
+        values["state_sales_tax"], values["state_income_tax"]
+    )
+    values["state_income_tax_over_sales_tax"] = (
+        values["state_income_tax"] > values["state_sales_tax"]
+    )
+    return values
+
+
+def _yearly_outputs(
+    simulation: Simulation,
+    variables: dict,
+    years: list[int],
+    index: slice = slice(None),
+) -> dict:
+    """Calculate outputs for each year: ``{name: [values per year]}``.
+
+    ``variables`` maps output names to household variables, as in
+    ``AXIS_VARIABLES``; ``index`` selects the households reported.
+    """
+    return {
+        name: [
+            simulation.calculate(variable, map_to="household", period=year)[
+                index
+            ].tolist()
+            for year in years
+        ]
+        for name, variable in variables.items()
+    }
+
+
+def _release_simulation(simulation: Simulation) -> None:
+    """Drop every value held by a simulation and its branches.
+
+    Outputs must be copied out first; the simulation cannot be used after.
+    Simulations reference themselves, so a collection is run to free the
+    rest of it now rather than whenever the collector next runs.
+    """
+    simulations = [simulation]
+    for branch in simulations:
+        simulations.extend(branch.branches.values())
+    # Branches start as copies of their parent, so each may hold values
+    # under any branch's name
+    branch_names = {branch.branch_name for branch in simulations}
+    for branch in simulations:
+        for population in branch.populations.values():
+            for holder in population._holders.values():
+                for name in branch_names:
+                    holder.delete_arrays(branch_name=name)
+        branch._fast_cache = {}
+        branch.branches.clear()
+    gc.collect()
+
+
+def _compact_outputs(values: dict) -> dict:
+    """Return two-axes outputs as float32 arrays, plus boolean ``amt_binds``.
+
+    Arrays are copied, so they hold no references into a simulation.
+    """
+    result = {name: np.array(array, dtype=np.float32) for name, array in values.items()}
+    result["amt_binds"] = result["amt"] > result["regular_tax"]
+    return result
+
+
+def _calculate_with_amt_screen(
+    create_dataset: Callable[[np.ndarray], Dataset],
+    screened: np.ndarray,
+    tax_benefit_system: CountryTaxBenefitSystem,
+    outputs: Callable[[Simulation], dict],
+    verify: bool = False,
+    prepare: Optional[Callable[[Simulation], None]] = None,
+    release: bool = False,
+) -> dict:
+    """Calculate outputs with AMT pinned to zero where it cannot bind.
+
+    Households are split by the ``screened`` mask into two simulations built
+    by ``create_dataset(mask)``; the screened one has ``amt_base_tax`` set to
+    zero instead of calculated. With ``verify``, AMT is calculated for the
+    screened households as well, so callers can check the screen against
+    the outputs. ``prepare`` is called on each
+    simulation before anything is calculated. With ``release``, each
+    simulation's values are dropped once its outputs are copied out.
+    """
+    results = {}
+    for mask, pinned in ((~screened, False), (screened, True)):
+        if not mask.any():
+            continue
+        simulation = _count_simulation(
+            "two_axes",
+            track(
+                Simulation(
+                    dataset=create_dataset(mask), tax_benefit_system=tax_benefit_system
+                )
+            ),
+        )
+        if prepare is not None:
+            prepare(simulation)
+        if pinned and not verify:
+            simulation.set_input("amt_base_tax", 2026, np.zeros(mask.sum()))
+        for name, values in outputs(simulation).items():
+            if name not in results:
+                results[name] = np.zeros(len(mask), dtype=values.dtype)
+            results[name][mask] = values
+        if release:
+            _release_simulation(simulation)
+    return results
+
+
+def _marginal_rates(
+    simulation: Simulation, axis_variable: str, year: int = 2026
+) -> dict:
+    """Finite-difference rates between each axis point and its perturbed copy.
+
+    Expects the household layout produced by ``add_perturbed_copy``. Rates are
+    divided by the realised step in ``axis_variable`` so float32 rounding of
+    the axis values does not leak into the result.
+    """
+    axis = simulation.calculate(axis_variable, map_to="household", period=year)
+    step = np.diff(axis.reshape(-1, 2), axis=1)[:, 0]
+
+    rates = {}
+    for name, variable in MARGINAL_RATE_VARIABLES.items():
+        values = simulation.calculate(variable, map_to="household", period=year)
+        rates[name] = (np.diff(values.reshape(-1, 2), axis=1)[:, 0] / step).tolist()
+    return rates
+
 
 def calculate_single_point(
     state_code: str,
@@ -49,8 +388,14 @@ def calculate_single_point(
     employment_income: float,
     baseline_scenario: str = "Current Law",
     reform_params: Optional[dict] = None,
+    years: Optional[list[int]] = None,
 ) -> dict:
-    """Calculate tax values for a single household configuration."""
+    """Calculate tax values for a single household configuration.
+
+    With ``years``, the household is simulated in every year at once (see
+    ``expand_years``); the usual fields report the first year and
+    ``yearly`` holds each output's value per year.
+    """
     situation = create_situation_without_axes(
         state_code=state_code,
         real_estate_taxes=real_estate_taxes,
@@ -65,55 +410,148 @@ def calculate_single_point(
         employment_income=employment_income,
     )
 
-    simulation = _create_simulation(situation, baseline_scenario, reform_params)
+    if years:
+        situation = expand_years(situation, years)
 
-    # Use .item() to convert numpy 0-d arrays to Python scalars
-    household_net_income = float(
-        simulation.calculate("household_net_income", map_to="household", period=2026).item()
-    )
-    federal_income_tax = float(
-        simulation.calculate("income_tax", map_to="household", period=2026).item()
-    )
-    state_income_tax = float(
-        simulation.calculate(
-            "state_withheld_income_tax", map_to="household", period=2026
-        ).item()
-    )
-    state_sales_tax = float(
-        simulation.calculate("state_sales_tax", map_to="household", period=2026).item()
-    )
-    salt_deduction = float(
-        simulation.calculate("salt_deduction", map_to="household", period=2026).item()
-    )
-    reported_salt = float(
-        simulation.calculate("reported_salt", map_to="household", period=2026).item()
-    )
-    regular_tax = float(
-        simulation.calculate(
-            "regular_tax_before_credits", map_to="household", period=2026
-        ).item()
+    simulation = _create_simulation(
+        "single", situation, baseline_scenario, reform_params
     )
-    amt = float(simulation.calculate("amt_base_tax", map_to="household", period=2026).item())
-    taxable_income = float(
-        simulation.calculate("taxable_income", map_to="household", period=2026).item()
+
+    # Use .item() to convert numpy 0-d arrays to Python scalars
+    by_year = [
+        {name: values[0].item() for name, values in outputs.items()}
+        for outputs in (
+            _single_point_outputs(simulation, year) for year in years or [2026]
+        )
+    ]
+    result = dict(by_year[0])
+    if years:
+        result["years"] = years
+        result["yearly"] = {name: [row[name] for row in by_year] for name in by_year[0]}
+    return result
+
+
+def calculate_households(
+    households: list[dict],
+    baseline_scenario: str = "Current Law",
+    reform_params: Optional[dict] = None,
+    tax_benefit_system: Optional[CountryTaxBenefitSystem] = None,
+) -> dict:
+    """Calculate single-point outputs for many households in one simulation.
+
+    Each household is a dict of ``create_situation_without_axes`` arguments;
+    they are passed to the simulation as arrays via
+    ``create_household_dataset`` rather than as a merged situation. Returns
+    one list per output, indexed like ``households``. Pass a prebuilt
+    ``tax_benefit_system`` to skip rebuilding the reformed system per call.
+    """
+    if not households:
+        raise ValueError("At least one household is required")
+    if tax_benefit_system is None:
+        tax_benefit_system = _create_tax_benefit_system(
+            baseline_scenario, reform_params
+        )
+    columns = {
+        name: [household[name] for household in households] for name in households[0]
+    }
+    simulation = _count_simulation(
+        "single",
+        track(
+            Simulation(
+                dataset=create_household_dataset(**columns),
+                tax_benefit_system=tax_benefit_system,
+            )
+        ),
     )
-    amt_income = float(
-        simulation.calculate("amt_income", map_to="household", period=2026).item()
+    return {
+        name: values.tolist()
+        for name, values in _single_point_outputs(simulation).items()
+    }
+
+
+def calculate_sensitivity(
+    state_code: str,
+    real_estate_taxes: float,
+    is_married: bool,
+    num_children: int,
+    child_ages: list[int],
+    qualified_dividend_income: float,
+    long_term_capital_gains: float,
+    short_term_capital_gains: float,
+    deductible_mortgage_interest: float,
+    charitable_cash_donations: float,
+    employment_income: float,
+    baseline_scenario: str = "Current Law",
+    reform_params: Optional[dict] = None,
+    delta: float = 100,
+) -> dict:
+    """Calculate how each output responds to each household input.
+
+    The base household and one copy per input and direction (+/- ``delta``)
+    are evaluated together in a single simulation. Downward steps are clipped
+    at zero; inputs already at zero have no backward rate. Central rates use
+    whichever steps were available.
+    """
+    base_inputs = {
+        "state_code": state_code,
+        "real_estate_taxes": real_estate_taxes,
+        "is_married": is_married,
+        "num_children": num_children,
+        "child_ages": child_ages,
+        "qualified_dividend_income": qualified_dividend_income,
+        "long_term_capital_gains": long_term_capital_gains,
+        "short_term_capital_gains": short_term_capital_gains,
+        "deductible_mortgage_interest": deductible_mortgage_interest,
+        "charitable_cash_donations": charitable_cash_donations,
+        "employment_income": employment_income,
+    }
+
+    # Household order: base, then (up, down) for each input
+    columns = {name: [value] for name, value in base_inputs.items()}
+    for name in SENSITIVITY_INPUTS:
+        for step in (delta, -min(delta, base_inputs[name])):
+            for column, value in base_inputs.items():
+                columns[column].append(value + step if column == name else value)
+
+    simulation = _count_simulation(
+        "sensitivity",
+        track(
+            Simulation(
+                dataset=create_household_dataset(**columns),
+                tax_benefit_system=_create_tax_benefit_system(
+                    baseline_scenario, reform_params
+                ),
+            )
+        ),
     )
 
+    values = {
+        output: simulation.calculate(output, map_to="household", period=2026)
+        for output in SENSITIVITY_OUTPUTS
+    }
+
+    forward = {output: {} for output in SENSITIVITY_OUTPUTS}
+    backward = {output: {} for output in SENSITIVITY_OUTPUTS}
+    jacobian = {output: {} for output in SENSITIVITY_OUTPUTS}
+    for i, name in enumerate(SENSITIVITY_INPUTS):
+        up, down = 1 + 2 * i, 2 + 2 * i
+        # Divide by the realised steps so float32 rounding cancels out
+        x = simulation.calculate(name, map_to="household", period=2026)
+        up_step, down_step = x[up] - x[0], x[0] - x[down]
+        for output, y in values.items():
+            forward[output][name] = float((y[up] - y[0]) / up_step)
+            backward[output][name] = (
+                float((y[0] - y[down]) / down_step) if down_step > 0 else None
+            )
+            jacobian[output][name] = float((y[up] - y[down]) / (up_step + down_step))
+
     return {
-        "household_net_income": household_net_income,
-        "federal_income_tax": federal_income_tax,
-        "state_income_tax": state_income_tax,
-        "state_sales_tax": state_sales_tax,
-        "salt_deduction": salt_deduction,
-        "reported_salt": reported_salt,
-        "regular_tax": regular_tax,
-        "amt": amt,
-        "taxable_income": taxable_income,
-        "amt_income": amt_income,
-        "larger_of_state_sales_or_income_tax": max(state_sales_tax, state_income_tax),
-        "state_income_tax_over_sales_tax": bool(state_income_tax > state_sales_tax),
+        "inputs": SENSITIVITY_INPUTS,
+        "outputs": SENSITIVITY_OUTPUTS,
+        "values": {output: float(y[0]) for output, y in values.items()},
+        "jacobian": jacobian,
+        "forward": forward,
+        "backward": backward,
     }
 
 
@@ -133,8 +571,23 @@ def calculate_salt_axis(
     min_salt: float = 0,
     max_salt: float = 300000,
     count: int = 600,
+    marginal_rates: bool = False,
+    marginal_delta: float = 100,
+    prune: bool = False,
+    years: Optional[list[int]] = None,
 ) -> dict:
-    """Calculate tax values along the SALT axis (fixed income)."""
+    """Calculate tax values along the SALT axis (fixed income).
+
+    With ``marginal_rates``, each axis point is paired with a household whose
+    SALT is ``marginal_delta`` higher, in the same simulation, and the
+    finite-difference rates are returned alongside the levels. With
+    ``prune``, programs that cannot affect the outputs are pinned rather than
+    calculated (see ``pruning``).
+
+    With ``years``, the grid is simulated in every year at once (see
+    ``expand_years``); the usual fields report the first year and ``yearly``
+    holds each output's values per year.
+    """
     situation = create_situation_with_one_property_tax_axes(
         is_married=is_married,
         state_code=state_code,
@@ -150,26 +603,47 @@ def calculate_salt_axis(
         max_salt=max_salt,
         count=count,
     )
+    if marginal_rates:
+        situation = add_perturbed_copy(situation, marginal_delta)
+    if years:
+        situation = expand_years(situation, years)
+    year = years[0] if years else 2026
+
+    simulation = _create_simulation(
+        "salt_axis", situation, baseline_scenario, reform_params
+    )
+    if prune:
+        prune_simulation(
+            simulation,
+            ["reported_salt", *AXIS_VARIABLES.values()],
+            state_code,
+            years,
+        )
 
-    simulation = _create_simulation(situation, baseline_scenario, reform_params)
+    # Perturbed copies sit next to each axis point; keep the base households
+    base = slice(None, None, 2 if marginal_rates else 1)
 
     reported_salt = simulation.calculate(
-        "reported_salt", map_to="household", period=2026
-    )
+        "reported_salt", map_to="household", period=year
+    )[base]
     regular_tax = simulation.calculate(
-        "regular_tax_before_credits", map_to="household", period=2026
-    )
-    amt = simulation.calculate("amt_base_tax", map_to="household", period=2026)
+        "regular_tax_before_credits", map_to="household", period=year
+    )[base]
+    amt = simulation.calculate("amt_base_tax", map_to="household", period=year)[base]
     salt_deduction = simulation.calculate(
-        "salt_deduction", map_to="household", period=2026
-    )
-    income_tax = simulation.calculate("income_tax", map_to="household", period=2026)
+        "salt_deduction", map_to="household", period=year
+    )[base]
+    income_tax = simulation.calculate("income_tax", map_to="household", period=year)[
+        base
+    ]
     taxable_income = simulation.calculate(
-        "taxable_income", map_to="household", period=2026
-    )
-    amt_income = simulation.calculate("amt_income", map_to="household", period=2026)
+        "taxable_income", map_to="household", period=year
+    )[base]
+    amt_income = simulation.calculate("amt_income", map_to="household", period=year)[
+        base
+    ]
 
-    return {
+    result = {
         "axis_values": reported_salt.tolist(),
         "reported_salt": reported_salt.tolist(),
         "salt_deduction": salt_deduction.tolist(),
@@ -179,6 +653,17 @@ def calculate_salt_axis(
         "taxable_income": taxable_income.tolist(),
         "amt_income": amt_income.tolist(),
     }
+    if marginal_rates:
+        result.update(_marginal_rates(simulation, "reported_salt", year))
+    if years:
+        result["years"] = years
+        result["yearly"] = _yearly_outputs(
+            simulation,
+            {"reported_salt": "reported_salt", **AXIS_VARIABLES},
+            years,
+            base,
+        )
+    return result
 
 
 def calculate_income_axis(
@@ -196,8 +681,23 @@ def calculate_income_axis(
     min_income: float = 0,
     max_income: float = 1000000,
     count: int = 1000,
+    marginal_rates: bool = False,
+    marginal_delta: float = 100,
+    prune: bool = False,
+    years: Optional[list[int]] = None,
 ) -> dict:
-    """Calculate tax values along the income axis."""
+    """Calculate tax values along the income axis.
+
+    With ``marginal_rates``, each axis point is paired with a household whose
+    employment income is ``marginal_delta`` higher, in the same simulation,
+    and the finite-difference rates are returned alongside the levels. With
+    ``prune``, programs that cannot affect the outputs are pinned rather than
+    calculated (see ``pruning``).
+
+    With ``years``, the grid is simulated in every year at once (see
+    ``expand_years``); the usual fields report the first year and ``yearly``
+    holds each output's values per year.
+    """
     situation = create_situation_with_one_income_axes(
         is_married=is_married,
         state_code=state_code,
@@ -212,28 +712,49 @@ def calculate_income_axis(
         max_income=max_income,
         count=count,
     )
+    if marginal_rates:
+        situation = add_perturbed_copy(situation, marginal_delta)
+    if years:
+        situation = expand_years(situation, years)
+    year = years[0] if years else 2026
+
+    simulation = _create_simulation(
+        "income_axis", situation, baseline_scenario, reform_params
+    )
+    if prune:
+        prune_simulation(
+            simulation,
+            ["employment_income", *AXIS_VARIABLES.values()],
+            state_code,
+            years,
+        )
 
-    simulation = _create_simulation(situation, baseline_scenario, reform_params)
+    # Perturbed copies sit next to each axis point; keep the base households
+    base = slice(None, None, 2 if marginal_rates else 1)
 
     employment_income = simulation.calculate(
-        "employment_income", map_to="household", period=2026
-    )
+        "employment_income", map_to="household", period=year
+    )[base]
     regular_tax = simulation.calculate(
-        "regular_tax_before_credits", map_to="household", period=2026
-    )
-    amt = simulation.calculate("amt_base_tax", map_to="household", period=2026)
-    income_tax = simulation.calculate("income_tax", map_to="household", period=2026)
+        "regular_tax_before_credits", map_to="household", period=year
+    )[base]
+    amt = simulation.calculate("amt_base_tax", map_to="household", period=year)[base]
+    income_tax = simulation.calculate("income_tax", map_to="household", period=year)[
+        base
+    ]
     taxable_income = simulation.calculate(
-        "taxable_income", map_to="household", period=2026
-    )
-    amt_income = simulation.calculate("amt_income", map_to="household", period=2026)
+        "taxable_income", map_to="household", period=year
+    )[base]
+    amt_income = simulation.calculate("amt_income", map_to="household", period=year)[
+        base
+    ]
     salt_deduction = simulation.calculate(
-        "salt_deduction", map_to="household", period=2026
-    )
+        "salt_deduction", map_to="household", period=year
+    )[base]
 
     gap = np.maximum(regular_tax - amt, 0)
 
-    return {
+    result = {
         "axis_values": employment_income.tolist(),
         "employment_income": employment_income.tolist(),
         "salt_deduction": salt_deduction.tolist(),
@@ -244,6 +765,22 @@ def calculate_income_axis(
         "amt_income": amt_income.tolist(),
         "gap": gap.tolist(),
     }
+    if marginal_rates:
+        result.update(_marginal_rates(simulation, "employment_income", year))
+    if years:
+        yearly = _yearly_outputs(
+            simulation,
+            {"employment_income": "employment_income", **AXIS_VARIABLES},
+            years,
+            base,
+        )
+        yearly["gap"] = [
+            np.maximum(np.array(regular) - np.array(amt), 0).tolist()
+            for regular, amt in zip(yearly["regular_tax"], yearly["amt"])
+        ]
+        result["years"] = years
+        result["yearly"] = yearly
+    return result
 
 
 def calculate_two_axes(
@@ -264,8 +801,69 @@ def calculate_two_axes(
     min_income: float = 0,
     max_income: float = 1000000,
     income_count: int = 1400,
+    amt_screening: bool = False,
+    verify_amt_screening: bool = False,
+    prune: bool = False,
+    years: Optional[list[int]] = None,
+    low_memory: bool = False,
 ) -> dict:
-    """Calculate tax values on a 2D grid (SALT x income)."""
+    """Calculate tax values on a 2D grid (SALT x income).
+
+    With ``amt_screening``, the grid is built as arrays and the cells where
+    AMT cannot bind are simulated with AMT pinned to zero (see
+    ``_calculate_with_amt_screen``); ``amt_screened_cells`` then reports
+    how many cells were screened out. ``verify_amt_screening`` calculates
+    AMT in the screened cells too, and ``amt_misclassified_cells`` lists the
+    cells (in axes order) the screen wrongly ruled out. With ``prune``,
+    programs that cannot affect the outputs are pinned rather than
+    calculated (see ``pruning``).
+
+    With ``years``, the grid is simulated in every year at once (see
+    ``expand_years``); the usual fields report the first year and ``yearly``
+    holds each output's values per year. AMT screening reads 2026
+    parameters, so it cannot be combined with ``years``.
+
+    With ``low_memory``, outputs are returned as float32 NumPy arrays
+    (``amt_binds`` as a boolean array, per-year values as 2D arrays) rather
+    than lists, which loses no precision as the simulation's outputs are
+    float32. The grid is simulated ``LOW_MEMORY_CHUNK_CELLS`` cells at a
+    time, dropping each chunk's intermediate values once its outputs are
+    copied out, so peak memory follows the chunk size rather than the grid
+    at the cost of some speed. Multi-year grids are simulated whole, with
+    the simulation's values dropped once the outputs are copied out.
+    """
+    if amt_screening and years:
+        raise ValueError("AMT screening supports only the 2026 grid")
+    if amt_screening or (low_memory and not years):
+        arguments = dict(
+            household={
+                "is_married": is_married,
+                "state_code": state_code,
+                "num_children": num_children,
+                "child_ages": child_ages,
+                "qualified_dividend_income": qualified_dividend_income,
+                "long_term_capital_gains": long_term_capital_gains,
+                "short_term_capital_gains": short_term_capital_gains,
+                "deductible_mortgage_interest": deductible_mortgage_interest,
+                "charitable_cash_donations": charitable_cash_donations,
+            },
+            tax_benefit_system=_create_tax_benefit_system(
+                baseline_scenario, reform_params
+            ),
+            # Cells in axes order: income major, SALT minor
+            employment_income=np.repeat(
+                np.linspace(min_income, max_income, income_count), salt_count
+            ),
+            reported_salt=np.tile(
+                np.linspace(min_salt, max_salt, salt_count), income_count
+            ),
+            verify=verify_amt_screening,
+            prune=prune,
+        )
+        if low_memory:
+            return _calculate_two_axes_chunked(**arguments, screen=amt_screening)
+        return _calculate_two_axes_screened(**arguments)
+
     situation = create_situation_with_two_axes(
         is_married=is_married,
         state_code=state_code,
@@ -283,29 +881,65 @@ def calculate_two_axes(
         max_income=max_income,
         income_count=income_count,
     )
+    if years:
+        situation = expand_years(situation, years)
+    year = years[0] if years else 2026
+
+    simulation = _create_simulation(
+        "two_axes", situation, baseline_scenario, reform_params
+    )
+    if prune:
+        prune_simulation(
+            simulation,
+            list(TWO_AXES_VARIABLES.values()),
+            state_code,
+            years,
+        )
 
-    simulation = _create_simulation(situation, baseline_scenario, reform_params)
+    if low_memory:
+        result = _compact_outputs(
+            {
+                name: simulation.calculate(variable, map_to="household", period=year)
+                for name, variable in TWO_AXES_VARIABLES.items()
+            }
+        )
+        if years:
+            yearly = {
+                name: np.array(
+                    [
+                        simulation.calculate(variable, map_to="household", period=y)
+                        for y in years
+                    ],
+                    dtype=np.float32,
+                )
+                for name, variable in TWO_AXES_VARIABLES.items()
+            }
+            yearly["amt_binds"] = yearly["amt"] > yearly["regular_tax"]
+            result["years"] = years
+            result["yearly"] = yearly
+        _release_simulation(simulation)
+        return result
 
     employment_income = simulation.calculate(
-        "employment_income", map_to="household", period=2026
+        "employment_income", map_to="household", period=year
     )
     reported_salt = simulation.calculate(
-        "reported_salt", map_to="household", period=2026
+        "reported_salt", map_to="household", period=year
     )
     regular_tax = simulation.calculate(
-        "regular_tax_before_credits", map_to="household", period=2026
+        "regular_tax_before_credits", map_to="household", period=year
     )
-    amt = simulation.calculate("amt_base_tax", map_to="household", period=2026)
+    amt = simulation.calculate("amt_base_tax", map_to="household", period=year)
     salt_deduction = simulation.calculate(
-        "salt_deduction", map_to="household", period=2026
+        "salt_deduction", map_to="household", period=year
     )
-    income_tax = simulation.calculate("income_tax", map_to="household", period=2026)
+    income_tax = simulation.calculate("income_tax", map_to="household", period=year)
     taxable_income = simulation.calculate(
-        "taxable_income", map_to="household", period=2026
+        "taxable_income", map_to="household", period=year
     )
-    amt_income = simulation.calculate("amt_income", map_to="household", period=2026)
+    amt_income = simulation.calculate("amt_income", map_to="household", period=year)
 
-    return {
+    result = {
         "employment_income": employment_income.tolist(),
         "reported_salt": reported_salt.tolist(),
         "regular_tax": regular_tax.tolist(),
@@ -316,3 +950,245 @@ def calculate_two_axes(
         "amt_income": amt_income.tolist(),
         "amt_binds": (amt > regular_tax).tolist(),
     }
+    if years:
+        yearly = _yearly_outputs(simulation, TWO_AXES_VARIABLES, years)
+        yearly["amt_binds"] = [
+            (np.array(amt) > np.array(regular)).tolist()
+            for amt, regular in zip(yearly["amt"], yearly["regular_tax"])
+        ]
+        result["years"] = years
+        result["yearly"] = yearly
+    return result
+
+
+def _calculate_two_axes_chunked(
+    household: dict,
+    tax_benefit_system: CountryTaxBenefitSystem,
+    employment_income: np.ndarray,
+    reported_salt: np.ndarray,
+    screen: bool = False,
+    verify: bool = False,
+    prune: bool = False,
+) -> dict:
+    """Calculate two-axes outputs ``LOW_MEMORY_CHUNK_CELLS`` cells at a time.
+
+    Returns float32 arrays as ``calculate_two_axes`` with ``low_memory``.
+    ``screen`` enables AMT screening.
+    """
+    cells = len(employment_income)
+    result = {name: np.empty(cells, dtype=np.float32) for name in TWO_AXES_VARIABLES}
+    screened_cells = 0
+    misclassified = []
+    for start in range(0, cells, LOW_MEMORY_CHUNK_CELLS):
+        chunk = slice(start, start + LOW_MEMORY_CHUNK_CELLS)
+        values = _calculate_two_axes_screened(
+            household,
+            tax_benefit_system,
+            employment_income[chunk],
+            reported_salt[chunk],
+            verify=verify,
+            prune=prune,
+            screen=screen,
+            low_memory=True,
+        )
+        for name in TWO_AXES_VARIABLES:
+            result[name][chunk] = values[name]
+        screened_cells += values["amt_screened_cells"]
+        misclassified += [
+            start + cell for cell in values.get("amt_misclassified_cells", [])
+        ]
+    result["amt_binds"] = result["amt"] > result["regular_tax"]
+    if screen:
+        result["amt_screened_cells"] = screened_cells
+        if verify:
+            result["amt_misclassified_cells"] = misclassified
+    return result
+
+
+def _calculate_two_axes_screened(
+    household: dict,
+    tax_benefit_system: CountryTaxBenefitSystem,
+    employment_income: np.ndarray,
+    reported_salt: np.ndarray,
+    verify: bool = False,
+    prune: bool = False,
+    screen: bool = True,
+    low_memory: bool = False,
+) -> dict:
+    """Calculate two-axes outputs for grid cells with AMT screening.
+
+    Without ``screen``, no cells are screened out. With ``verify``, AMT is
+    calculated in screened cells too and ``amt_misclassified_cells`` lists
+    those where it is nonzero. With ``low_memory``, outputs are float32
+    arrays and each simulation's values are dropped once its outputs are
+    copied out.
+    """
+    if screen:
+        screened = screen_grid_points(
+            tax_benefit_system,
+            is_married=household["is_married"],
+            num_children=household["num_children"],
+            qualified_dividend_income=household["qualified_dividend_income"],
+            long_term_capital_gains=household["long_term_capital_gains"],
+            short_term_capital_gains=household["short_term_capital_gains"],
+            employment_income=employment_income,
+            reported_salt=reported_salt,
+        )
+    else:
+        screened = np.zeros(len(employment_income), dtype=bool)
+
+    def outputs(simulation: Simulation) -> dict:
+        return {
+            name: simulation.calculate(variable, map_to="household", period=2026)
+            for name, variable in TWO_AXES_VARIABLES.items()
+        }
+
+    prepare = None
+    if prune:
+
+        def prepare(simulation: Simulation):
+            prune_simulation(
+                simulation, list(TWO_AXES_VARIABLES.values()), household["state_code"]
+            )
+
+    values = _calculate_with_amt_screen(
+        lambda mask: create_household_dataset(
+            **household,
+            employment_income=employment_income[mask],
+            reported_salt=reported_salt[mask],
+            state_and_local_sales_or_income_tax=0,
+        ),
+        screened,
+        tax_benefit_system,
+        outputs,
+        verify=verify,
+        prepare=prepare,
+        release=low_memory,
+    )
+    if low_memory:
+        result = _compact_outputs(values)
+    else:
+        result = {name: array.tolist() for name, array in values.items()}
+        result["amt_binds"] = (values["amt"] > values["regular_tax"]).tolist()
+    result["amt_screened_cells"] = int(screened.sum())
+    if screen and verify:
+        result["amt_misclassified_cells"] = np.flatnonzero(
+            screened & (values["amt"] != 0)
+        ).tolist()
+    return result
+
+
+def calculate_all_states(
+    is_married: bool,
+    num_children: int,
+    child_ages: list[int],
+    qualified_dividend_income: float,
+    long_term_capital_gains: float,
+    short_term_capital_gains: float,
+    deductible_mortgage_interest: float,
+    charitable_cash_donations: float,
+    employment_income: float,
+    real_estate_taxes: float,
+    baseline_scenario: str = "Current Law",
+    reform_params: Optional[dict] = None,
+    state_codes: Optional[list[str]] = None,
+    axis: Optional[Literal["salt", "income"]] = None,
+    min_salt: float = 0,
+    max_salt: float = 300000,
+    min_income: float = 0,
+    max_income: float = 1000000,
+    count: Optional[int] = None,
+) -> dict:
+    """Calculate one household profile in every state with a single simulation.
+
+    One household per state is merged into a single situation. Without an
+    ``axis`` each state gets the single-point outputs, as one list per output
+    indexed like ``state_codes``. With ``axis`` set to ``"salt"`` or
+    ``"income"``, every state's household varies along the same axis (as in
+    ``calculate_salt_axis`` / ``calculate_income_axis``) and each output is a
+    list of per-state lists over ``axis_values``.
+    """
+    state_codes = list(state_codes or STATE_CODES)
+    unknown = sorted(set(state_codes) - set(STATE_CODES))
+    if unknown:
+        raise ValueError(f"Unknown state codes: {', '.join(unknown)}")
+
+    household = {
+        "is_married": is_married,
+        "num_children": num_children,
+        "child_ages": child_ages,
+        "qualified_dividend_income": qualified_dividend_income,
+        "long_term_capital_gains": long_term_capital_gains,
+        "short_term_capital_gains": short_term_capital_gains,
+        "deductible_mortgage_interest": deductible_mortgage_interest,
+        "charitable_cash_donations": charitable_cash_donations,
+    }
+    if axis is None:
+        simulation = _count_simulation(
+            "all_states",
+            track(
+                Simulation(
+                    dataset=create_household_dataset(
+                        **household,
+                        state_code=state_codes,
+                        employment_income=employment_income,
+                        real_estate_taxes=real_estate_taxes,
+                    ),
+                    tax_benefit_system=_create_tax_benefit_system(
+                        baseline_scenario, reform_params
+                    ),
+                )
+            ),
+        )
+        return {
+            "state_codes": state_codes,
+            "values": {
+                name: values.tolist()
+                for name, values in _single_point_outputs(simulation).items()
+            },
+        }
+
+    if axis == "salt":
+        situations = [
+            create_situation_with_one_property_tax_axes(
+                **household,
+                state_code=state_code,
+                employment_income=employment_income,
+                min_salt=min_salt,
+                max_salt=max_salt,
+                count=count or 600,
+            )
+            for state_code in state_codes
+        ]
+    elif axis == "income":
+        situations = [
+            create_situation_with_one_income_axes(
+                **household,
+                state_code=state_code,
+                min_income=min_income,
+                max_income=max_income,
+                count=count or 1000,
+            )
+            for state_code in state_codes
+        ]
+    else:
+        raise ValueError(f"Invalid axis: {axis}")
+
+    simulation = _create_simulation(
+        "all_states", combine_situations(situations), baseline_scenario, reform_params
+    )
+
+    # Axes repeat the whole situation per point, so results are point-major
+    def by_state(variable: str) -> np.ndarray:
+        values = simulation.calculate(variable, map_to="household", period=2026)
+        return values.reshape(-1, len(state_codes)).T
+
+    axis_variable = "reported_salt" if axis == "salt" else "employment_income"
+    return {
+        "state_codes": state_codes,
+        "axis_values": by_state(axis_variable)[0].tolist(),
+        "values": {
+            name: by_state(variable).tolist()
+            for name, variable in AXIS_VARIABLES.items()
+        },
+    }
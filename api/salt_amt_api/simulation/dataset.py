@@ -0,0 +1,173 @@
+"""Array-native multi-household inputs for PolicyEngine-US simulations.
+
+The situation builders produce one nested dict per household, which
+PolicyEngine then parses entity by entity. For batches of households this
+module builds the entity membership and input arrays directly and hands them
+to the simulation as an in-memory dataset.
+"""
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+from policyengine_core.data import Dataset
+
+from .situation import GROUP_ENTITIES
+
+PERIOD = "2026"
+
+# Singular entity keys for the plural group entities used in situations
+ENTITY_KEYS = {
+    "families": "family",
+    "marital_units": "marital_unit",
+    "tax_units": "tax_unit",
+    "spm_units": "spm_unit",
+    "households": "household",
+}
+
+# Household inputs set on the head, as in the situation builders
+HEAD_INPUTS = [
+    "employment_income",
+    "real_estate_taxes",
+    "qualified_dividend_income",
+    "long_term_capital_gains",
+    "short_term_capital_gains",
+    "deductible_mortgage_interest",
+    "charitable_cash_donations",
+]
+
+# Household inputs set on the tax unit
+TAX_UNIT_INPUTS = ["reported_salt", "state_and_local_sales_or_income_tax"]
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+def _child_ages_matrix(
+    child_ages: Union[Sequence[int], Sequence[Sequence[int]]],
+    num_children: np.ndarray,
+) -> np.ndarray:
+    """Return an (households, max children) array of ages, 10 where missing."""
+    n = len(num_children)
+    width = int(num_children.max(initial=0))
+    ages = np.full((n, width), 10, dtype=float)
+    if len(child_ages) and np.ndim(child_ages[0]) > 0:
+        if len(child_ages) != n:
+            raise ValueError("child_ages must have one list per household")
+        rows = child_ages
+    else:
+        rows = [child_ages] * n
+    for i, row in enumerate(rows):
+        row = list(row)[:width]
+        ages[i, : len(row)] = row
+    return ages
+
+
+def create_household_arrays(
+    state_code: Union[str, Sequence[str]],
+    is_married: Union[bool, Sequence[bool]],
+    num_children: Union[int, Sequence[int]],
+    child_ages: Union[Sequence[int], Sequence[Sequence[int]]],
+    employment_income: ArrayLike = 0,
+    real_estate_taxes: Optional[ArrayLike] = None,
+    qualified_dividend_income: ArrayLike = 0,
+    long_term_capital_gains: ArrayLike = 0,
+    short_term_capital_gains: ArrayLike = 0,
+    deductible_mortgage_interest: ArrayLike = 0,
+    charitable_cash_donations: ArrayLike = 0,
+    reported_salt: Optional[ArrayLike] = None,
+    state_and_local_sales_or_income_tax: Optional[ArrayLike] = None,
+) -> dict:
+    """Build entity and input arrays for many households.
+
+    Every argument is either one value shared by all households or one value
+    per household; ``child_ages`` is one list shared by all households or one
+    list per household. Households match ``create_situation_without_axes``
+    (or, with ``reported_salt`` set, ``create_situation_with_two_axes`` with
+    both axis variables set directly): a head aged 40, an optional spouse
+    aged 40 and the children, each group entity holding the whole household. Optional inputs left as None are not
+    set. Returns ``{variable: {period: array}}``, in household order.
+    """
+    columns = {
+        "state_code": np.asarray(state_code),
+        "is_married": np.asarray(is_married, dtype=bool),
+        "num_children": np.asarray(num_children, dtype=int),
+        "employment_income": employment_income,
+        "real_estate_taxes": real_estate_taxes,
+        "qualified_dividend_income": qualified_dividend_income,
+        "long_term_capital_gains": long_term_capital_gains,
+        "short_term_capital_gains": short_term_capital_gains,
+        "deductible_mortgage_interest": deductible_mortgage_interest,
+        "charitable_cash_donations": charitable_cash_donations,
+        "reported_salt": reported_salt,
+        "state_and_local_sales_or_income_tax": state_and_local_sales_or_income_tax,
+    }
+    columns = {
+        name: np.asarray(values)
+        for name, values in columns.items()
+        if values is not None
+    }
+    try:
+        columns = dict(zip(columns, np.broadcast_arrays(*columns.values())))
+    except ValueError as e:
+        raise ValueError("Household inputs must be scalars or equal length") from e
+    columns = {name: np.atleast_1d(values) for name, values in columns.items()}
+    n = len(columns["state_code"])
+    if np.any(columns["num_children"] < 0):
+        raise ValueError("num_children must not be negative")
+
+    # People are laid out household by household: head, spouse, children
+    married = columns["is_married"].astype(int)
+    children = columns["num_children"]
+    sizes = 1 + married + children
+    household = np.repeat(np.arange(n), sizes)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    position = np.arange(sizes.sum()) - np.repeat(starts, sizes)
+    is_head = position == 0
+
+    child_index = position - 1 - married[household]
+    is_child = child_index >= 0
+    ages = np.full(len(household), 40, dtype=float)
+    ages[is_child] = _child_ages_matrix(child_ages, children)[
+        household[is_child], child_index[is_child]
+    ]
+
+    data = {
+        "person_id": {PERIOD: np.arange(len(household))},
+        "age": {PERIOD: ages},
+    }
+    for plural in GROUP_ENTITIES:
+        key = ENTITY_KEYS[plural]
+        data[f"{key}_id"] = {PERIOD: np.arange(n)}
+        data[f"person_{key}_id"] = {PERIOD: household}
+        data[f"person_{key}_role"] = {PERIOD: np.full(len(household), "member")}
+
+    data["state_code"] = {PERIOD: columns["state_code"].astype(str)}
+    for name in HEAD_INPUTS:
+        if name in columns:
+            values = np.zeros(len(household))
+            values[is_head] = columns[name]
+            data[name] = {PERIOD: values}
+    for name in TAX_UNIT_INPUTS:
+        if name in columns:
+            data[name] = {PERIOD: columns[name].astype(float)}
+    return data
+
+
+def create_household_dataset(**kwargs) -> Dataset:
+    """Wrap ``create_household_arrays`` output as an in-memory dataset.
+
+    Pass the result as ``Simulation(dataset=...)``; household-level results
+    come back in the order the households were given.
+    """
+    data = create_household_arrays(**kwargs)
+    return type(
+        "HouseholdDataset",
+        (Dataset,),
+        {
+            "name": "households",
+            "label": "Households",
+            "data_format": Dataset.TIME_PERIOD_ARRAYS,
+            "file_path": "households",
+            "time_period": PERIOD,
+            "load": lambda self: data,
+        },
+    )()
@@ -0,0 +1,162 @@
+"""Sharing of results between requests that reduce to the same work.
+
+Requests are keyed by their endpoint, their inputs and the ``scenario_key``
+of their scenario, so requests that differ only in ways that cannot change
+the result (such as the baseline scenario next to a policy config) share
+one calculation.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+import numpy as np
+
+from ..metrics import Counter
+from .reforms import scenario_key
+
+
+def request_key(
+    endpoint: str,
+    inputs: dict,
+    baseline_scenario: str,
+    reform_params: Optional[dict] = None,
+) -> str:
+    """Return a key equal for requests that calculate the same result.
+
+    ``inputs`` holds the request's fields other than its scenario. Numbers
+    are compared as floats, as an unvalidated default of ``0`` and a parsed
+    ``0.0`` give the same result.
+    """
+    return json.dumps(
+        [endpoint, _as_floats(inputs), scenario_key(baseline_scenario, reform_params)],
+        sort_keys=True,
+        default=float,
+    )
+
+
+def _as_floats(value):
+    """Return ``value`` with every int (but not bool) made a float."""
+    if isinstance(value, dict):
+        return {key: _as_floats(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_as_floats(item) for item in value]
+    if isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+# Bytes held per element of a list of numbers: the list's pointer and the
+# float object it points to
+_LIST_NUMBER_BYTES = 32
+
+
+def result_bytes(result) -> int:
+    """Estimate the memory a result holds, in bytes.
+
+    Lists of numbers are sized from their length and first element rather
+    than by visiting every element, as grid outputs hold millions.
+    """
+    if isinstance(result, np.ndarray):
+        return result.nbytes
+    if isinstance(result, dict):
+        return sum(result_bytes(value) for value in result.values())
+    if isinstance(result, (list, tuple)):
+        if result and isinstance(result[0], (list, tuple, dict, np.ndarray)):
+            return sum(result_bytes(item) for item in result)
+        return _LIST_NUMBER_BYTES * len(result)
+    return _LIST_NUMBER_BYTES
+
+
+class ResultCache:
+    """Bounded cache of results by request key, computing each key once.
+
+    A request whose key is being computed waits for that result instead of
+    starting its own calculation. Failures are passed to every waiting
+    request but not cached. Results are shared, so callers must not modify
+    them.
+
+    At most ``maxsize`` results are kept, holding at most ``max_bytes`` by
+    ``result_bytes``; the least recently used are dropped first. Results
+    over ``max_entry_bytes`` are passed to the requests waiting for them but
+    not kept.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        max_bytes: Optional[int] = None,
+        max_entry_bytes: Optional[int] = None,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.bytes = 0
+        self._sizes: dict[str, int] = {}
+        self.hits = Counter()
+        self.misses = Counter()
+        self.shared = Counter()
+        self._results: OrderedDict[str, object] = OrderedDict()
+        self._in_flight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: str, compute: Callable[[], object]) -> object:
+        """Return the result for ``key``, calling ``compute`` if none exists."""
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.hits.inc()
+                return self._results[key]
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+                self.misses.inc()
+            else:
+                self.shared.inc()
+        if not owner:
+            return future.result()
+
+        try:
+            result = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+        size = result_bytes(result)
+        with self._lock:
+            del self._in_flight[key]
+            if self._fits(size):
+                self._results[key] = result
+                self._sizes[key] = size
+                self.bytes += size
+                while len(self._results) > self.maxsize or (
+                    self.max_bytes is not None and self.bytes > self.max_bytes
+                ):
+                    evicted, _ = self._results.popitem(last=False)
+                    self.bytes -= self._sizes.pop(evicted)
+        future.set_result(result)
+        return result
+
+    def _fits(self, size: int) -> bool:
+        """Return whether a result of ``size`` bytes may be kept."""
+        if self.max_entry_bytes is not None and size > self.max_entry_bytes:
+            return False
+        return self.max_bytes is None or size <= self.max_bytes
+
+    def stats(self) -> dict:
+        """Return hit, miss and shared in-flight counts, entries and bytes held."""
+        with self._lock:
+            size, held = len(self._results), self.bytes
+        return {
+            "hits": int(self.hits.value),
+            "misses": int(self.misses.value),
+            "shared": int(self.shared.value),
+            "size": size,
+            "bytes": held,
+        }
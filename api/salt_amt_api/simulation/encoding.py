@@ -0,0 +1,102 @@
+"""Breakpoint encoding of axis results.
+
+Outputs along an axis are piecewise linear in the axis point's index: taxes
+change slope at bracket thresholds, caps and phase-outs and are linear in
+between. A series is encoded as the indices and values of the points where
+linear interpolation between the kept points would otherwise miss a value
+by more than a tolerance. Kept points are exact, so every kink survives,
+and the dense series is recovered by interpolating over the index.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+# Rate series are fractions, not dollars, so they are always encoded exactly
+RATE_SERIES_PREFIX = "marginal_"
+
+
+def breakpoints(values: list[float], tolerance: float = 0.0) -> list[int]:
+    """Return the indices of the points to keep to reconstruct ``values``.
+
+    Interpolating linearly between the kept points reproduces every value
+    within ``tolerance``. The first and last points are always kept.
+    """
+    if tolerance < 0:
+        raise ValueError("tolerance must not be negative")
+    y = np.asarray(values, dtype=float)
+    if len(y) <= 2:
+        return list(range(len(y)))
+
+    keep = [0]
+    anchor = 0
+    # Slopes from the anchor that pass within tolerance of every point since
+    lo, hi = -np.inf, np.inf
+    for j in range(1, len(y)):
+        slope = (y[j] - y[anchor]) / (j - anchor)
+        if j - anchor > 1 and not lo <= slope <= hi:
+            # A segment ending at j would miss a point; end it at j - 1
+            anchor = j - 1
+            keep.append(anchor)
+            lo, hi = -np.inf, np.inf
+        dx = j - anchor
+        lo = max(lo, (y[j] - tolerance - y[anchor]) / dx)
+        hi = min(hi, (y[j] + tolerance - y[anchor]) / dx)
+    keep.append(len(y) - 1)
+    return keep
+
+
+def encode_series(values: list[float], tolerance: float = 0.0) -> dict:
+    """Encode a series as ``{"index": [...], "value": [...]}`` breakpoints."""
+    index = breakpoints(values, tolerance)
+    return {"index": index, "value": [float(values[i]) for i in index]}
+
+
+def decode_series(series: dict, count: int) -> list[float]:
+    """Interpolate encoded breakpoints back to ``count`` values."""
+    return np.interp(np.arange(count), series["index"], series["value"]).tolist()
+
+
+def encode_axis_result(result: dict, tolerance: float = 0.0) -> dict:
+    """Encode every output series of an axis result as breakpoints.
+
+    ``result`` is as returned by ``calculate_salt_axis`` or
+    ``calculate_income_axis``; per-year series in ``yearly`` are encoded
+    too. ``tolerance`` is in dollars; marginal rate series are exact.
+    """
+    count = len(result["axis_values"])
+    encoded = {
+        "encoding": "breakpoints",
+        "count": count,
+        "tolerance": tolerance,
+        "series": {
+            name: encode_series(
+                values, 0.0 if name.startswith(RATE_SERIES_PREFIX) else tolerance
+            )
+            for name, values in result.items()
+            if name not in ("years", "yearly") and values is not None
+        },
+    }
+    if result.get("yearly") is not None:
+        encoded["years"] = result["years"]
+        encoded["yearly"] = {
+            name: [encode_series(values, tolerance) for values in by_year]
+            for name, by_year in result["yearly"].items()
+        }
+    return encoded
+
+
+def decode_axis_result(encoded: dict) -> dict:
+    """Rebuild the dense axis result from ``encode_axis_result`` output."""
+    count = encoded["count"]
+    result = {
+        name: decode_series(series, count) for name, series in encoded["series"].items()
+    }
+    yearly: Optional[dict] = encoded.get("yearly")
+    if yearly is not None:
+        result["years"] = encoded["years"]
+        result["yearly"] = {
+            name: [decode_series(series, count) for series in by_year]
+            for name, by_year in yearly.items()
+        }
+    return result
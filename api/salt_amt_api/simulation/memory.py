@@ -0,0 +1,261 @@
+"""Memory instrumentation of calculation requests.
+
+While a ``MemoryMonitor`` is active, allocations are traced with
+``tracemalloc`` and attributed to the stage of the request that made them:
+building a simulation's inputs, initialising it, each top-level
+``calculate`` call, serialization and anything in between. The report gives
+the process's peak RSS, the net allocation and traced peak of each stage and
+the source lines holding the most memory when the monitor exits.
+"""
+
+import functools
+import resource
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from policyengine_us import Simulation
+
+from ..metrics import Histogram
+
+_active_monitor: ContextVar[Optional["MemoryMonitor"]] = ContextVar(
+    "active_memory_monitor", default=None
+)
+
+# Peak sizes exported per endpoint, from 64MB to 16GB
+MEMORY_BUCKETS = tuple(2**i for i in range(26, 35))
+_metrics: dict[str, dict[str, Histogram]] = {}
+_metrics_lock = threading.Lock()
+
+_hooks_installed = False
+_hooks_lock = threading.Lock()
+
+# Held by the active monitor: tracing, traced peaks and the peak RSS are
+# process-wide, so monitors run one at a time rather than stopping or
+# resetting them under each other
+_monitor_lock = threading.RLock()
+
+
+def _status_bytes(field: str) -> Optional[int]:
+    """Return a memory field of ``/proc/self/status`` in bytes, or None."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the process's peak RSS where Linux allows; return whether it did."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_bytes() -> int:
+    """Return the process's peak resident set size."""
+    peak = _status_bytes("VmHWM")
+    if peak is None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Reported in kilobytes except on macOS
+        if sys.platform != "darwin":
+            peak *= 1024
+    return peak
+
+
+def _install_hooks() -> None:
+    """Wrap simulation creation and ``calculate`` to mark monitored stages.
+
+    The wrappers pass straight through unless a monitor is active in the
+    calling context, and nested calls (formulas calculating their inputs)
+    belong to the outermost call's stage.
+    """
+    global _hooks_installed
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+        init, calculate = Simulation.__init__, Simulation.calculate
+
+        @functools.wraps(init)
+        def monitored_init(self, *args, **kwargs):
+            monitor = _active_monitor.get()
+            if monitor is None or monitor._depth:
+                return init(self, *args, **kwargs)
+            # Allocations since the last stage built the simulation's inputs
+            with monitor.stage("simulation init", before="situation"):
+                init(self, *args, **kwargs)
+
+        @functools.wraps(calculate)
+        def monitored_calculate(self, variable_name, *args, **kwargs):
+            monitor = _active_monitor.get()
+            if monitor is None or monitor._depth:
+                return calculate(self, variable_name, *args, **kwargs)
+            with monitor.stage(f"calculate {variable_name}"):
+                return calculate(self, variable_name, *args, **kwargs)
+
+        Simulation.__init__ = monitored_init
+        Simulation.calculate = monitored_calculate
+        _hooks_installed = True
+
+
+class MemoryMonitor:
+    """Trace the memory used while active, by stage.
+
+    Use as a context manager around a request. Only work in the same thread
+    (or context) is attributed to stages, but ``tracemalloc`` and RSS are
+    process-wide, so monitors in a process wait for each other to exit, and
+    unmonitored requests running alongside inflate (but never reset) the
+    figures. The peak RSS covers only the monitored block where the process
+    may reset it (``peak_rss_reset``); otherwise it is the process's peak.
+    """
+
+    def __init__(self, top: int = 10):
+        self.top = top
+        self.stages: dict[str, dict] = {}
+        self.top_allocations: list[dict] = []
+        self.peak_rss_reset = False
+        self.rss_start_bytes: Optional[int] = None
+        self.rss_end_bytes: Optional[int] = None
+        self.peak_rss_bytes = 0
+        self.traced_peak_bytes = 0
+        self._depth = 0
+        self._started_tracing = False
+        self._start_snapshot = None
+        self._start_traced = 0
+        self._mark = 0
+        self._token = None
+
+    def __enter__(self) -> "MemoryMonitor":
+        _install_hooks()
+        _monitor_lock.acquire()
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        else:
+            self._start_snapshot = tracemalloc.take_snapshot()
+        self.peak_rss_reset = _reset_peak_rss()
+        self.rss_start_bytes = _status_bytes("VmRSS")
+        self._start_traced = self._mark = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        self._token = _active_monitor.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            self._finish()
+        finally:
+            _monitor_lock.release()
+
+    def _finish(self) -> None:
+        self.checkpoint("other")
+        _active_monitor.reset(self._token)
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        if self._start_snapshot is None:
+            statistics = [
+                (stat.traceback[0], stat.size, stat.count)
+                for stat in snapshot.statistics("lineno")
+            ]
+        else:
+            statistics = [
+                (stat.traceback[0], stat.size_diff, stat.count_diff)
+                for stat in snapshot.compare_to(self._start_snapshot, "lineno")
+            ]
+        statistics.sort(key=lambda stat: stat[1], reverse=True)
+        self.top_allocations = [
+            {
+                "site": f"{frame.filename}:{frame.lineno}",
+                "size_bytes": size,
+                "count": count,
+            }
+            for frame, size, count in statistics[: self.top]
+            if size > 0
+        ]
+        if self._started_tracing:
+            tracemalloc.stop()
+        self.rss_end_bytes = _status_bytes("VmRSS")
+        self.peak_rss_bytes = peak_rss_bytes()
+
+    def checkpoint(self, name: str) -> None:
+        """Attribute the allocations since the last checkpoint to ``name``."""
+        current, peak = tracemalloc.get_traced_memory()
+        entry = self.stages.setdefault(
+            name, {"calls": 0, "allocated_bytes": 0, "peak_bytes": 0}
+        )
+        entry["calls"] += 1
+        entry["allocated_bytes"] += current - self._mark
+        entry["peak_bytes"] = max(entry["peak_bytes"], peak - self._mark)
+        self.traced_peak_bytes = max(self.traced_peak_bytes, peak - self._start_traced)
+        self._mark = current
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name: str, before: str = "other") -> Iterator[None]:
+        """Attribute the block's allocations to ``name``.
+
+        Allocations since the last checkpoint are attributed to ``before``.
+        """
+        self.checkpoint(before)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.checkpoint(name)
+
+    def report(self) -> dict:
+        """Return peak and per-stage memory use, in bytes."""
+        return {
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "peak_rss_reset": self.peak_rss_reset,
+            "rss_start_bytes": self.rss_start_bytes,
+            "rss_end_bytes": self.rss_end_bytes,
+            "traced_peak_bytes": self.traced_peak_bytes,
+            "stages": self.stages,
+            "top_allocations": self.top_allocations,
+        }
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Attribute the block's allocations to ``name`` if a monitor is active."""
+    monitor = _active_monitor.get()
+    if monitor is None:
+        yield
+        return
+    with monitor.stage(name):
+        yield
+
+
+def record_memory(endpoint: str, report: dict) -> None:
+    """Export a request's peak RSS and traced peak to the endpoint's metrics."""
+    with _metrics_lock:
+        histograms = _metrics.setdefault(
+            endpoint,
+            {
+                "peak_rss_bytes": Histogram(MEMORY_BUCKETS),
+                "traced_peak_bytes": Histogram(MEMORY_BUCKETS),
+            },
+        )
+    for name, histogram in histograms.items():
+        histogram.observe(report[name])
+
+
+def memory_stats() -> dict:
+    """Return the exported memory distributions by endpoint."""
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    return {
+        endpoint: {name: histogram.snapshot() for name, histogram in histograms.items()}
+        for endpoint, histograms in metrics.items()
+    }
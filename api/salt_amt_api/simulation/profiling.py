@@ -0,0 +1,153 @@
+"""Variable-level profiling of PolicyEngine-US simulations.
+
+While a ``VariableProfiler`` is active, simulations created by the
+calculation functions run with PolicyEngine's full tracer. Each traced
+variable request becomes a node with start and end times, from which the
+profiler derives call counts and inclusive and self time per variable and
+period, a sorted text report and a folded-stack file for flamegraph tools.
+"""
+
+import os
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from policyengine_us import Simulation
+
+_active_profiler: ContextVar[Optional["VariableProfiler"]] = ContextVar(
+    "active_profiler", default=None
+)
+
+
+def track(simulation: Simulation) -> Simulation:
+    """Enable tracing on a new simulation if a profiler is active."""
+    profiler = _active_profiler.get()
+    if profiler is not None:
+        simulation.trace = True
+        profiler.simulations.append(simulation)
+    return simulation
+
+
+def profiling() -> bool:
+    """Return whether a profiler is active in the calling context."""
+    return _active_profiler.get() is not None
+
+
+def _frame(node) -> str:
+    return f"{node.name}[{node.period}]"
+
+
+class VariableProfiler:
+    """Collect per-variable timings from the simulations run while active.
+
+    Use as a context manager around calculation calls. Profiling only covers
+    simulations created in the same thread (or context) as the profiler,
+    which get a tax-benefit system of their own (see
+    ``_create_tax_benefit_system``).
+    """
+
+    def __init__(self):
+        self.simulations: list[Simulation] = []
+        self.seconds = 0.0
+        self.paths: Optional[tuple[str, str]] = None
+        self._token = None
+        self._start = None
+
+    def __enter__(self) -> "VariableProfiler":
+        self._token = _active_profiler.set(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.seconds = time.perf_counter() - self._start
+        _active_profiler.reset(self._token)
+
+    def _nodes(self) -> Iterator[tuple[list, object]]:
+        """Yield (ancestors, node) for every traced node, depth first."""
+        stack = [
+            ([], tree)
+            for simulation in self.simulations
+            for tree in reversed(simulation.tracer.trees)
+        ]
+        while stack:
+            ancestors, node = stack.pop()
+            yield ancestors, node
+            path = ancestors + [node]
+            stack.extend((path, child) for child in reversed(node.children))
+
+    def stats(self) -> dict[tuple[str, str], dict]:
+        """Return calls and inclusive and self seconds per (variable, period).
+
+        Inclusive time is not adjusted for recursion, so a variable that
+        requests itself for another period counts the nested time twice.
+        """
+        stats = defaultdict(lambda: {"calls": 0, "seconds": 0.0, "self_seconds": 0.0})
+        for _, node in self._nodes():
+            entry = stats[(node.name, str(node.period))]
+            inclusive = node.end - node.start
+            entry["calls"] += 1
+            entry["seconds"] += inclusive
+            entry["self_seconds"] += inclusive - sum(
+                child.end - child.start for child in node.children
+            )
+        return dict(stats)
+
+    def report(self, top: Optional[int] = None) -> str:
+        """Return a table of variables sorted by self time, slowest first."""
+        rows = sorted(
+            self.stats().items(), key=lambda item: item[1]["self_seconds"], reverse=True
+        )
+        lines = [
+            f"Profiled {len(self.simulations)} simulation(s) in {self.seconds:.3f}s",
+            f"{'self s':>9} {'total s':>9} {'calls':>7}  variable [period]",
+        ]
+        for (name, period), entry in rows[:top]:
+            lines.append(
+                f"{entry['self_seconds']:9.4f} {entry['seconds']:9.4f} "
+                f"{entry['calls']:7d}  {name} [{period}]"
+            )
+        return "\n".join(lines) + "\n"
+
+    def folded_stacks(self) -> str:
+        """Return self time per call stack in folded format, in microseconds.
+
+        Each line is ``root;...;leaf count``, as read by ``flamegraph.pl``
+        and speedscope.
+        """
+        folded = defaultdict(int)
+        for ancestors, node in self._nodes():
+            own = (node.end - node.start) - sum(
+                child.end - child.start for child in node.children
+            )
+            stack = ";".join(_frame(n) for n in ancestors + [node])
+            folded[stack] += max(round(own * 1e6), 0)
+        return "".join(f"{stack} {count}\n" for stack, count in folded.items())
+
+    def write(self, directory: str, name: str) -> tuple[str, str]:
+        """Write ``{name}.txt`` and ``{name}.folded``; return their paths."""
+        os.makedirs(directory, exist_ok=True)
+        report_path = os.path.join(directory, f"{name}.txt")
+        folded_path = os.path.join(directory, f"{name}.folded")
+        with open(report_path, "w") as f:
+            f.write(self.report())
+        with open(folded_path, "w") as f:
+            f.write(self.folded_stacks())
+        return report_path, folded_path
+
+
+@contextmanager
+def profile_request(
+    directory: str, name: Optional[str] = None
+) -> Iterator[VariableProfiler]:
+    """Profile the simulations run in the block and write the results.
+
+    Files are named ``name`` (a random id if None) in ``directory``; their
+    paths are set as ``paths`` on the profiler once the block exits.
+    """
+    profiler = VariableProfiler()
+    with profiler:
+        yield profiler
+    profiler.paths = profiler.write(directory, name or uuid.uuid4().hex)
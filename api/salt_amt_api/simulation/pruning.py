@@ -0,0 +1,137 @@
+"""Pruning of benefit programs that cannot affect the requested outputs.
+
+PolicyEngine-US evaluates lazily, but the SALT and AMT outputs still pull in
+whole benefit programs: the medical expense deduction reaches Medicare Part
+B premiums and the Medicare Savings Program, the child and dependent care
+credit reaches every state's child care subsidies, and income measures that
+add up benefits reach every state's TANF program. For the households this
+API builds those programs are zero, so they are pinned as inputs instead of
+calculated.
+
+Which programs to pin is read from a traced simulation of a small probe
+household: only programs in the dependency closure of the requested outputs
+are pinned. The closure is cached per output set and state.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+from policyengine_core.periods import period as make_period
+from policyengine_us import CountryTaxBenefitSystem, Simulation
+
+from .dataset import PERIOD, create_household_dataset
+
+# Programs that are zero for every household the API builds, with the reason
+ZERO_PROGRAMS = {
+    "medicare_part_b_premium": "adults are 40 and children are minors, so "
+    "nobody is enrolled in Medicare",
+    "childcare_expenses": "no childcare expenses are input, so expenses net "
+    "of subsidies are zero",
+}
+
+# Incomes of the probe households the dependency closure is traced on
+PROBE_INCOMES = [0, 100000, 1000000]
+
+
+def _state_of(module_name: str) -> Optional[str]:
+    """Return the state code of a variable under ``gov.states``, if any."""
+    parts = module_name.split(".")
+    if parts[:2] == ["gov", "states"] and len(parts) > 2 and len(parts[2]) == 2:
+        return parts[2].upper()
+    return None
+
+
+@lru_cache(maxsize=64)
+def _dependency_users(outputs: tuple[str, ...], state_code: str) -> dict:
+    """Trace the outputs for probe households and return each variable's users.
+
+    Keys are every variable in the dependency closure of ``outputs``; values
+    are the variables whose formulas requested it. Cached, so callers must
+    not modify the result. Tracing turns on parameter tracing for the
+    simulation's tax-benefit system, so the probe gets a system of its own
+    rather than tracing the parameter reads of concurrent requests.
+    """
+    simulation = Simulation(
+        dataset=create_household_dataset(
+            state_code=state_code,
+            is_married=True,
+            num_children=1,
+            child_ages=[5],
+            employment_income=PROBE_INCOMES,
+        ),
+        tax_benefit_system=CountryTaxBenefitSystem(),
+        trace=True,
+    )
+    for output in outputs:
+        simulation.calculate(output, period=int(PERIOD))
+
+    users = {}
+    for key, node in simulation.tracer.get_flat_trace().items():
+        name = key.split("<")[0]
+        users.setdefault(name, set())
+        for dependency in node["dependencies"]:
+            users.setdefault(dependency.split("<")[0], set()).add(name)
+    return users
+
+
+def dependency_closure(outputs: list[str], state_code: str) -> frozenset:
+    """Return the variables the outputs depend on for households in a state."""
+    return frozenset(_dependency_users(tuple(sorted(outputs)), state_code))
+
+
+@lru_cache(maxsize=64)
+def pruned_variables(outputs: tuple[str, ...], state_code: str) -> tuple:
+    """Return the variables to pin when calculating ``outputs`` in a state.
+
+    These are the ``ZERO_PROGRAMS`` in the dependency closure, plus other
+    states' programs used outside their own state's variables (such as the
+    state TANF programs summed into ``tanf``), which only pay out to
+    residents of that state.
+    """
+    users = _dependency_users(outputs, state_code)
+    variables = Simulation.default_tax_benefit_system_instance.variables
+    pinned = set(ZERO_PROGRAMS) & set(users)
+    for name, callers in users.items():
+        state = _state_of(variables[name].module_name)
+        if state is None or state == state_code:
+            continue
+        if any(_state_of(variables[c].module_name) != state for c in callers):
+            pinned.add(name)
+    return tuple(sorted(pinned))
+
+
+def pin_variables(
+    simulation: Simulation, names: tuple[str, ...], years: Optional[list[int]] = None
+) -> None:
+    """Set each variable to its default value for every entity and year.
+
+    ``years`` defaults to 2026.
+    """
+    for name in names:
+        variable = simulation.tax_benefit_system.get_variable(name)
+        count = simulation.populations[variable.entity.key].count
+        values = np.full(count, variable.default_value, dtype=variable.dtype)
+        for year in years or [int(PERIOD)]:
+            year = make_period(str(year))
+            if variable.definition_period == "month":
+                for month in year.get_subperiods("month"):
+                    simulation.set_input(name, month, values)
+            else:
+                simulation.set_input(name, year, values)
+
+
+def prune_simulation(
+    simulation: Simulation,
+    outputs: list[str],
+    state_code: str,
+    years: Optional[list[int]] = None,
+) -> tuple:
+    """Pin the programs that cannot affect ``outputs``; return their names.
+
+    The programs are pinned in each of ``years`` (2026 by default); the
+    closure itself is traced for 2026.
+    """
+    names = pruned_variables(tuple(sorted(outputs)), state_code)
+    pin_variables(simulation, names, years)
+    return names
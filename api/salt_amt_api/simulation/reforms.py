@@ -1,5 +1,7 @@
 """Reform parameter generation for PolicyEngine-US simulations."""
 
+import itertools
+import json
 import numpy as np
 from typing import Optional
 
@@ -263,6 +265,55 @@ class PolicyReforms:
         return reform_dict
 
 
+def _period_bounds(period: str) -> tuple[str, str]:
+    """Return the first and last day of a reform period key.
+
+    Keys are ranges such as ``2026-01-01.2100-12-31`` or single years.
+    """
+    if "." in period:
+        start, stop = period.split(".")
+        return start, stop
+    return f"{period}-01-01", f"{period}-12-31"
+
+
+def _leaves_baseline_unchanged(parameter, period: str, value) -> bool:
+    """Whether setting ``value`` over ``period`` would change nothing."""
+    start, stop = _period_bounds(period)
+    if parameter(start) != value:
+        return False
+    # Baseline values that take effect within the period must match too
+    return all(
+        entry.value == value
+        for entry in parameter.values_list
+        if start < entry.instant_str <= stop
+    )
+
+
+def minimal_reform_dict(reform_dict: dict, parameters) -> dict:
+    """Drop the entries of a reform dict that match the baseline parameters.
+
+    ``parameters`` is the baseline parameter tree, e.g.
+    ``CountryTaxBenefitSystem().parameters``. Entries whose parameter cannot
+    be found are kept, so applying the reform still reports them. An empty
+    result means the reform is a no-op.
+    """
+    minimal = {}
+    for path, period_values in reform_dict.items():
+        try:
+            parameter = parameters.get_child(path)
+        except ValueError:
+            minimal[path] = period_values
+            continue
+        changed = {
+            period: value
+            for period, value in period_values.items()
+            if not _leaves_baseline_unchanged(parameter, period, value)
+        }
+        if changed:
+            minimal[path] = changed
+    return minimal
+
+
 def get_reform_params_from_config(policy_config: dict) -> dict:
     """Convert policy configuration to reform parameters."""
     reform_params = {
@@ -421,3 +472,100 @@ def get_reform_params_from_config(policy_config: dict) -> dict:
                 }
 
     return reform_params
+
+
+# PolicyConfig options understood by get_reform_params_from_config
+POLICY_CONFIG_OPTIONS = {
+    "salt_cap": [
+        "Current Policy ($10k)",
+        "$15k",
+        "$100k",
+        "$0 Cap",
+        "Current Law (Uncapped)",
+    ],
+    "salt_marriage_bonus": [False, True],
+    "salt_phaseout": ["None", "10% for income over 200k (400k joint)"],
+    "salt_repealed": [False, True],
+    "amt_exemption": [
+        "Current Law ($70,500 Single, $109,500 Joint)",
+        "Current Policy ($89,925 Single, $139,850 Joint)",
+    ],
+    "amt_phaseout": [
+        "Current Law ($156,700 Single, $209,000 Joint)",
+        "Current Policy ($639,300 Single, $1,278,575 Joint)",
+    ],
+    "amt_repealed": [False, True],
+    "amt_eliminate_marriage_penalty": [False, True],
+    "other_tcja_provisions_extended": ["Current Law", "Current Policy"],
+}
+
+
+def enumerate_policy_configs() -> list[dict]:
+    """Return every combination of the PolicyConfig options.
+
+    Many combinations produce the same reform parameters; dedupe them with
+    ``reform_params_key``.
+    """
+    names = list(POLICY_CONFIG_OPTIONS)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*POLICY_CONFIG_OPTIONS.values())
+    ]
+
+
+def reform_params_key(reform_params: Optional[dict]) -> str:
+    """Return a canonical string for reform params, equal for equal reforms."""
+    return json.dumps(reform_params, sort_keys=True, default=float)
+
+
+# Reform params that only take effect when the SALT phase-out is enabled
+SALT_PHASE_OUT_PARAMS = [
+    "salt_phase_out_rate",
+    "salt_phase_out_threshold_joint",
+    "salt_phase_out_threshold_other",
+]
+
+
+def canonical_scenario(
+    baseline_scenario: str, reform_params: Optional[dict] = None
+) -> tuple[str, Optional[dict]]:
+    """Reduce a scenario to the reform it actually simulates.
+
+    Reform params replace the baseline scenario, so it is dropped when they
+    are given, and the Current Policy baseline is expressed as its params.
+    Params keep only the fields ``PolicyReforms.policy_reforms`` reads, with
+    the SALT phase-out settings zeroed while it is disabled and numbers as
+    floats, so params describing the same reform are equal.
+
+    Returns ``("Current Law", None)`` for unreformed current law and
+    ``("Current Law", params)`` otherwise.
+    """
+    if reform_params is None:
+        if baseline_scenario == "Current Law":
+            return "Current Law", None
+        if baseline_scenario != "Current Policy":
+            raise ValueError("Invalid scenario configuration")
+        reform_params = CURRENT_POLICY_PARAMS
+
+    enabled = bool(reform_params["salt_phase_out_enabled"])
+    canonical = {
+        name: {status: float(value) for status, value in reform_params[name].items()}
+        for name in ["salt_caps", "amt_exemptions", "amt_phase_outs"]
+    }
+    canonical["salt_phase_out_enabled"] = enabled
+    for name in SALT_PHASE_OUT_PARAMS:
+        canonical[name] = float(reform_params[name]) if enabled else 0.0
+    canonical["other_tcja_provisions"] = bool(
+        reform_params.get("other_tcja_provisions", False)
+    )
+    return "Current Law", canonical
+
+
+def scenario_key(
+    baseline_scenario: str, reform_params: Optional[dict] = None
+) -> tuple[str, str]:
+    """Return a key that is equal for scenarios simulating the same reform."""
+    baseline_scenario, reform_params = canonical_scenario(
+        baseline_scenario, reform_params
+    )
+    return baseline_scenario, reform_params_key(reform_params)
@@ -0,0 +1,106 @@
+"""Conservative screening of grid points where AMT provably cannot bind.
+
+AMTI in PolicyEngine-US is taxable income plus the excluded deductions (the
+SALT deduction for itemizers, the standard deduction otherwise) and personal
+exemptions. Taxable income is AGI less deductions and exemptions, floored at
+zero, so AMTI is at most the larger of AGI and the add-backs. Where that
+bound is covered by the AMT exemption the taxable excess, and so
+``amt_base_tax``, is zero.
+
+The bound needs the SALT amount as an input, so it applies to grid points
+with ``reported_salt`` set rather than to households whose state taxes are
+calculated.
+"""
+
+import numpy as np
+
+from policyengine_us import CountryTaxBenefitSystem
+
+
+def amt_screen_parameters(
+    tax_benefit_system: CountryTaxBenefitSystem, is_married: bool
+) -> dict:
+    """Return the 2026 parameters the screen needs for one filing status.
+
+    The values are read from the (possibly reformed) tax-benefit system, so
+    they are the ones ``get_reform_params_from_config`` set. Married
+    households file jointly. For others, the smaller exemption and phase-out
+    start and the larger standard deduction of single and head of household
+    are used, which keeps the screen conservative.
+    """
+    irs = tax_benefit_system.parameters.gov.irs
+    exemption = irs.income.amt.exemption
+    instant = "2026-01-01"
+    statuses = ["JOINT"] if is_married else ["SINGLE", "HEAD_OF_HOUSEHOLD"]
+
+    def values(node) -> list[float]:
+        return [float(getattr(node, status)(instant)) for status in statuses]
+
+    return {
+        "exemption": min(values(exemption.amount)),
+        "phase_out_start": min(values(exemption.phase_out.start)),
+        "phase_out_rate": float(exemption.phase_out.rate(instant)),
+        "standard_deduction": max(values(irs.deductions.standard.amount)),
+        "personal_exemption": float(irs.income.exemption.amount(instant)),
+    }
+
+
+def amti_upper_bound(
+    gross_income: np.ndarray,
+    reported_salt: np.ndarray,
+    standard_deduction: float,
+    exemptions: float,
+) -> np.ndarray:
+    """Bound AMTI by the larger of gross income and the AMT add-backs.
+
+    ``gross_income`` bounds AGI, ``reported_salt`` bounds the SALT deduction
+    and ``exemptions`` bounds the personal exemptions claimed.
+    """
+    add_backs = np.maximum(reported_salt, standard_deduction) + exemptions
+    return np.maximum(gross_income, add_backs)
+
+
+def amt_cannot_bind(
+    amti_bound: np.ndarray,
+    exemption: float,
+    phase_out_start: float,
+    phase_out_rate: float,
+) -> np.ndarray:
+    """Whether AMTI of at most ``amti_bound`` is fully covered by the exemption.
+
+    AMTI less the phased-out exemption rises with AMTI, so checking the bound
+    is enough.
+    """
+    bound = np.asarray(amti_bound, dtype=float)
+    reduction = phase_out_rate * np.maximum(bound - phase_out_start, 0)
+    return bound <= np.maximum(exemption - reduction, 0)
+
+
+def screen_grid_points(
+    tax_benefit_system: CountryTaxBenefitSystem,
+    is_married: bool,
+    num_children: int,
+    qualified_dividend_income: float,
+    long_term_capital_gains: float,
+    short_term_capital_gains: float,
+    employment_income: np.ndarray,
+    reported_salt: np.ndarray,
+) -> np.ndarray:
+    """Return a mask of (income, SALT) grid points where AMT cannot bind."""
+    p = amt_screen_parameters(tax_benefit_system, is_married)
+    gross_income = (
+        np.asarray(employment_income, dtype=float)
+        + qualified_dividend_income
+        + long_term_capital_gains
+        + short_term_capital_gains
+    )
+    people = 1 + int(is_married) + num_children
+    bound = amti_upper_bound(
+        gross_income,
+        np.asarray(reported_salt, dtype=float),
+        p["standard_deduction"],
+        people * p["personal_exemption"],
+    )
+    return amt_cannot_bind(
+        bound, p["exemption"], p["phase_out_start"], p["phase_out_rate"]
+    )
@@ -1,7 +1,28 @@
 """Situation builders for PolicyEngine-US simulations."""
 
+import copy
 from typing import Optional
 
+# Group entities every situation defines, in the order the builders add them
+GROUP_ENTITIES = ["families", "marital_units", "tax_units", "spm_units", "households"]
+
+# Jurisdictions with a state code in PolicyEngine-US: the 50 states and DC
+# fmt: off
+STATE_CODES = [
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "DC", "FL", "GA",
+    "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
+    "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ",
+    "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC",
+    "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY",
+]
+# fmt: on
+
+# Entity each axis variable is defined on, used to place axes in merged situations
+AXIS_ENTITIES = {
+    "employment_income": "people",
+    "reported_salt": "tax_units",
+}
+
 
 def create_situation_without_axes(
     state_code: str,
@@ -318,3 +339,98 @@ def create_situation_with_two_axes(
         }
     )
     return situation
+
+
+def _axes_shape(situation: dict) -> list[int]:
+    """Return the count of each axis dimension in a situation."""
+    return [dimension[0]["count"] for dimension in situation.get("axes", [])]
+
+
+def combine_situations(situations: list[dict]) -> dict:
+    """Merge several situations into one multi-household situation.
+
+    Entity ids are prefixed with the position of their source situation so
+    they stay unique. Axes are merged dimension by dimension: the axes of every
+    source become parallel axes whose ``index`` points at that source's own
+    entity, so each household varies along the same grid. All sources must
+    share the same axes shape.
+    """
+    if not situations:
+        raise ValueError("At least one situation is required")
+
+    shape = _axes_shape(situations[0])
+    if any(_axes_shape(situation) != shape for situation in situations):
+        raise ValueError("All situations must share the same axes shape")
+
+    combined = {"people": {}, **{unit: {} for unit in GROUP_ENTITIES}}
+    axes = [[] for _ in shape]
+
+    for i, situation in enumerate(situations):
+        prefix = f"household_{i}/"
+        for plural, entities in situation.items():
+            if plural == "axes":
+                continue
+            for entity_id, entity in entities.items():
+                entity = copy.deepcopy(entity)
+                if "members" in entity:
+                    entity["members"] = [prefix + m for m in entity["members"]]
+                combined.setdefault(plural, {})[prefix + entity_id] = entity
+
+        for dimension, source_axes in zip(axes, situation.get("axes", [])):
+            for axis in source_axes:
+                if axis["name"] not in AXIS_ENTITIES:
+                    raise ValueError(f"Unsupported axis variable: {axis['name']}")
+                entity_plural = AXIS_ENTITIES[axis["name"]]
+                offset = len(combined[entity_plural]) - len(situation[entity_plural])
+                dimension.append({**axis, "index": offset + axis.get("index", 0)})
+
+    if shape:
+        combined["axes"] = axes
+    return combined
+
+
+def add_perturbed_copy(situation: dict, delta: float) -> dict:
+    """Pair each point of a one-axis situation with a copy shifted by ``delta``.
+
+    The returned situation holds two households per axis point: the original
+    and one whose axis value is larger by ``delta``. Household-level results
+    therefore alternate base, perturbed, base, perturbed, ...
+    """
+    if len(_axes_shape(situation)) != 1:
+        raise ValueError("Perturbed copies require a situation with exactly one axis")
+
+    perturbed = copy.deepcopy(situation)
+    for axis in perturbed["axes"][0]:
+        axis["min"] += delta
+        axis["max"] += delta
+    return combine_situations([situation, perturbed])
+
+
+def expand_years(situation: dict, years: list[int]) -> dict:
+    """Repeat a 2026 situation's inputs and axes for each of ``years``.
+
+    Every 2026 input is copied to each year, so the household is the same in
+    every year, and every axis is repeated as a parallel axis for each year,
+    so household ``i`` has the same axis values in every year. Results for
+    all years can then be calculated from one simulation.
+    """
+    if not years:
+        raise ValueError("At least one year is required")
+    if len(set(years)) != len(years):
+        raise ValueError("Years must not repeat")
+
+    expanded = copy.deepcopy(situation)
+    for plural, entities in expanded.items():
+        if plural == "axes":
+            continue
+        for entity in entities.values():
+            for name, values in entity.items():
+                if isinstance(values, dict) and "2026" in values:
+                    entity[name] = {str(year): values["2026"] for year in years}
+
+    if "axes" in expanded:
+        expanded["axes"] = [
+            [{**axis, "period": year} for axis in dimension for year in years]
+            for dimension in expanded["axes"]
+        ]
+    return expanded
@@ -0,0 +1,321 @@
+"""Solvers that locate features of the SALT x income grid directly."""
+
+from typing import Optional
+import numpy as np
+
+from policyengine_us import CountryTaxBenefitSystem, Simulation
+
+from .calculation import _count_simulation, _create_tax_benefit_system
+from .dataset import create_household_dataset
+from .profiling import track
+from .screening import screen_grid_points
+
+
+def _evaluate_grid_points(
+    household: dict,
+    incomes: np.ndarray,
+    salts: np.ndarray,
+    tax_benefit_system: CountryTaxBenefitSystem,
+    variables: list[str],
+) -> dict:
+    """Evaluate arbitrary (income, SALT) points in a single simulation.
+
+    Each point is a ``create_situation_with_two_axes`` household with both
+    axis variables set directly, built as arrays.
+    """
+    dataset = create_household_dataset(
+        **household,
+        employment_income=incomes,
+        reported_salt=salts,
+        state_and_local_sales_or_income_tax=0,
+    )
+    simulation = _count_simulation(
+        "solver",
+        track(Simulation(dataset=dataset, tax_benefit_system=tax_benefit_system)),
+    )
+    return {
+        variable: simulation.calculate(variable, map_to="household", period=2026)
+        for variable in variables
+    }
+
+
+def _amt_binds(
+    household: dict,
+    incomes: np.ndarray,
+    salts: np.ndarray,
+    tax_benefit_system: CountryTaxBenefitSystem,
+) -> tuple[np.ndarray, int]:
+    """Whether AMT binds at each (income, SALT) point, as in calculate_two_axes.
+
+    Points the AMT screen rules out are not simulated. Also returns the
+    number of points that were.
+    """
+    screened = screen_grid_points(
+        tax_benefit_system,
+        is_married=household["is_married"],
+        num_children=household["num_children"],
+        qualified_dividend_income=household["qualified_dividend_income"],
+        long_term_capital_gains=household["long_term_capital_gains"],
+        short_term_capital_gains=household["short_term_capital_gains"],
+        employment_income=incomes,
+        reported_salt=salts,
+    )
+    binds = np.zeros(len(incomes), dtype=bool)
+    if not screened.all():
+        values = _evaluate_grid_points(
+            household,
+            incomes[~screened],
+            salts[~screened],
+            tax_benefit_system,
+            ["regular_tax_before_credits", "amt_base_tax"],
+        )
+        binds[~screened] = values["amt_base_tax"] > values["regular_tax_before_credits"]
+    return binds, int(np.count_nonzero(~screened))
+
+
+def calculate_amt_frontier(
+    is_married: bool,
+    state_code: str,
+    num_children: int,
+    child_ages: list[int],
+    qualified_dividend_income: float,
+    long_term_capital_gains: float,
+    short_term_capital_gains: float,
+    deductible_mortgage_interest: float,
+    charitable_cash_donations: float,
+    baseline_scenario: str = "Current Law",
+    reform_params: Optional[dict] = None,
+    min_salt: float = -50000,
+    max_salt: float = 250000,
+    min_income: float = 0,
+    max_income: float = 1000000,
+    income_count: int = 1400,
+    tolerance: float = 100,
+    scan_count: int = 16,
+) -> dict:
+    """Find, for each income, the SALT level at which AMT starts to bind.
+
+    A coarse scan of ``scan_count`` SALT levels per income brackets the first
+    point where ``amt_binds`` turns on; the scan is needed because AMT can stop
+    binding again once regular tax reaches zero at high SALT. Each bracket is
+    then bisected for every income at once, with the midpoints of all
+    unresolved brackets evaluated in a single simulation per iteration.
+    Binding regions narrower than the scan spacing can be missed. Points
+    where the AMT screen shows AMT cannot bind are not simulated.
+
+    ``frontier_salt`` is the lowest SALT found to bind, within ``tolerance`` of
+    the true boundary. It is ``min_salt`` where AMT already binds there and
+    None where no scanned level binds.
+    """
+    household = {
+        "is_married": is_married,
+        "state_code": state_code,
+        "num_children": num_children,
+        "child_ages": child_ages,
+        "qualified_dividend_income": qualified_dividend_income,
+        "long_term_capital_gains": long_term_capital_gains,
+        "short_term_capital_gains": short_term_capital_gains,
+        "deductible_mortgage_interest": deductible_mortgage_interest,
+        "charitable_cash_donations": charitable_cash_donations,
+    }
+    tax_benefit_system = _create_tax_benefit_system(baseline_scenario, reform_params)
+
+    incomes = np.linspace(min_income, max_income, income_count)
+    scan = np.linspace(min_salt, max_salt, scan_count)
+
+    # Coarse scan of every income in one simulation, laid out income-major
+    binds, households_simulated = _amt_binds(
+        household,
+        np.repeat(incomes, scan_count),
+        np.tile(scan, income_count),
+        tax_benefit_system,
+    )
+    binds = binds.reshape(income_count, scan_count)
+    iterations = 1
+
+    found = binds.any(axis=1)
+    first = np.argmax(binds, axis=1)
+    binds_at_min = found & (first == 0)
+    lo = scan[np.maximum(first - 1, 0)]
+    hi = scan[first]
+
+    active = found & ~binds_at_min
+    while np.any(active & (hi - lo > tolerance)):
+        index = np.flatnonzero(active & (hi - lo > tolerance))
+        mid = (lo[index] + hi[index]) / 2
+        binds_at_mid, simulated = _amt_binds(
+            household, incomes[index], mid, tax_benefit_system
+        )
+        hi[index] = np.where(binds_at_mid, mid, hi[index])
+        lo[index] = np.where(binds_at_mid, lo[index], mid)
+        households_simulated += simulated
+        iterations += 1
+
+    return {
+        "employment_income": incomes.tolist(),
+        "frontier_salt": [float(salt) if ok else None for salt, ok in zip(hi, found)],
+        "binds_at_min_salt": binds_at_min.tolist(),
+        "iterations": iterations,
+        "households_simulated": households_simulated,
+    }
+
+
+def calculate_effective_salt_cap(
+    is_married: bool,
+    state_code: str,
+    num_children: int,
+    child_ages: list[int],
+    qualified_dividend_income: float,
+    long_term_capital_gains: float,
+    short_term_capital_gains: float,
+    deductible_mortgage_interest: float,
+    charitable_cash_donations: float,
+    employment_incomes: list[float],
+    baseline_scenario: str = "Current Law",
+    reform_params: Optional[dict] = None,
+    min_salt: float = 0,
+    max_salt: float = 300000,
+    tolerance: float = 500,
+    delta: float = 100,
+    scan_count: int = 16,
+    slope_tolerance: float = 0.005,
+) -> dict:
+    """Find the kinks of income tax along SALT and the effective SALT cap.
+
+    Income tax is piecewise linear in ``reported_salt``. A coarse scan of
+    ``scan_count`` levels per income measures the slope (over a ``delta``
+    step) at each level; wherever neighbouring slopes differ, the first change
+    is bisected to within ``tolerance`` and then placed exactly at the
+    intersection of the line segments on either side, so ``tolerance`` only
+    needs to be small enough to isolate one kink. Every income's pending
+    points are evaluated together in one simulation per iteration.
+
+    The effective cap is the SALT level beyond which extra SALT no longer
+    lowers income tax: the kink ending the last falling segment, ``min_salt``
+    if tax never falls and None if tax is still falling at ``max_salt``.
+    Kinks closer together than ``2 * delta`` are reported as one.
+    """
+    household = {
+        "is_married": is_married,
+        "state_code": state_code,
+        "num_children": num_children,
+        "child_ages": child_ages,
+        "qualified_dividend_income": qualified_dividend_income,
+        "long_term_capital_gains": long_term_capital_gains,
+        "short_term_capital_gains": short_term_capital_gains,
+        "deductible_mortgage_interest": deductible_mortgage_interest,
+        "charitable_cash_donations": charitable_cash_donations,
+    }
+    tax_benefit_system = _create_tax_benefit_system(baseline_scenario, reform_params)
+    incomes = np.asarray(employment_incomes, dtype=float)
+    n = len(incomes)
+
+    def income_tax(point_incomes: np.ndarray, salts: np.ndarray) -> np.ndarray:
+        values = _evaluate_grid_points(
+            household, point_incomes, salts, tax_benefit_system, ["income_tax"]
+        )
+        return values["income_tax"].astype(float)
+
+    # Scan: income tax and forward slope at each level, income-major
+    scan = np.linspace(min_salt, max_salt, scan_count)
+    tax = income_tax(
+        np.repeat(incomes, 2 * scan_count),
+        np.tile(np.stack([scan, scan + delta], axis=1).ravel(), n),
+    ).reshape(n, scan_count, 2)
+    slopes = (tax[:, :, 1] - tax[:, :, 0]) / delta
+    households_simulated = 2 * n * scan_count
+    iterations = 1
+
+    # Brackets (income, a, b, end, slope at a, slope at end) hold the first
+    # slope change after a, somewhere before b + delta
+    changed = np.abs(np.diff(slopes, axis=1)) > slope_tolerance
+    income_index, k = np.nonzero(changed)
+    brackets = [
+        [i, scan[j], scan[j + 1], scan[j + 1], slopes[i, j], slopes[i, j + 1]]
+        for i, j in zip(income_index.tolist(), k.tolist())
+    ]
+    found = [[] for _ in range(n)]
+
+    while brackets:
+        bisecting = [b for b in brackets if b[2] - b[1] > tolerance]
+        settled = [b for b in brackets if b[2] - b[1] <= tolerance]
+
+        # Bisection needs (m, m + delta); settling needs the two segments
+        # (a, a + delta) and (b + delta, b + 2 * delta)
+        point_incomes, salts = [], []
+        for i, a, b, *_ in bisecting:
+            m = (a + b) / 2
+            point_incomes += [incomes[i]] * 2
+            salts += [m, m + delta]
+        for i, a, b, *_ in settled:
+            point_incomes += [incomes[i]] * 4
+            salts += [a, a + delta, b + delta, b + 2 * delta]
+        tax = income_tax(np.array(point_incomes), np.array(salts))
+        households_simulated += len(salts)
+        iterations += 1
+
+        next_brackets = []
+        for bracket, (t_m, t_m_delta) in zip(
+            bisecting, tax[: 2 * len(bisecting)].reshape(-1, 2)
+        ):
+            i, a, b, end, slope_a, slope_end = bracket
+            m = (a + b) / 2
+            if abs((t_m_delta - t_m) / delta - slope_a) <= slope_tolerance:
+                next_brackets.append([i, m, b, end, slope_a, slope_end])
+            else:
+                next_brackets.append([i, a, m, end, slope_a, slope_end])
+
+        for bracket, (t_a, t_a_delta, t_b, t_b_delta) in zip(
+            settled, tax[2 * len(bisecting) :].reshape(-1, 4)
+        ):
+            i, a, b, end, slope_a, slope_end = bracket
+            left = (t_a_delta - t_a) / delta
+            right = (t_b_delta - t_b) / delta
+            # Intersect the segment lines; fall back to the bracket midpoint
+            # where the change is a jump rather than a kink
+            kink = (a + b + delta) / 2
+            if abs(left - right) > slope_tolerance:
+                x = (t_b - t_a + left * a - right * (b + delta)) / (left - right)
+                if a <= x <= b + delta:
+                    kink = x
+            found[i].append((kink, t_a + left * (kink - a), right))
+            # Look for further changes between this kink and the end
+            if abs(right - slope_end) > slope_tolerance and end - b > 2 * delta:
+                next_brackets.append([i, b + delta, end, end, right, slope_end])
+
+        brackets = next_brackets
+
+    breakpoints, income_tax_at_breakpoints = [], []
+    segment_slopes, effective_caps = [], []
+    for i in range(n):
+        # A kink inside a scan point's slope window is found from both sides
+        kinks = []
+        for kink in sorted(found[i]):
+            if kinks and kink[0] - kinks[-1][0] < 2 * delta:
+                kinks[-1] = (kinks[-1][0], kinks[-1][1], kink[2])
+            else:
+                kinks.append(kink)
+        segments = [float(slopes[i, 0])] + [float(s) for _, _, s in kinks]
+        breakpoints.append([float(x) for x, _, _ in kinks])
+        income_tax_at_breakpoints.append([float(t) for _, t, _ in kinks])
+        segment_slopes.append(segments)
+
+        # End of the last stretch where SALT lowers tax, if it ends in range
+        if slopes[i, -1] < -slope_tolerance:
+            effective_caps.append(None)
+            continue
+        cap = float(min_salt)
+        for x, slope_before in zip(breakpoints[-1], segments[:-1]):
+            if slope_before < -slope_tolerance:
+                cap = x
+        effective_caps.append(cap)
+
+    return {
+        "employment_income": incomes.tolist(),
+        "effective_cap": effective_caps,
+        "breakpoints": breakpoints,
+        "income_tax_at_breakpoints": income_tax_at_breakpoints,
+        "segment_slopes": segment_slopes,
+        "iterations": iterations,
+        "households_simulated": households_simulated,
+    }
@@ -0,0 +1,159 @@
+"""Policy sweeps: one household evaluated under many policy configurations."""
+
+import json
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from policyengine_us import Simulation
+
+from .calculation import (
+    SINGLE_POINT_VARIABLES,
+    _build_tax_benefit_system,
+    _count_simulation,
+    _single_point_outputs,
+)
+from .profiling import track
+from .reforms import (
+    enumerate_policy_configs,
+    get_reform_params_from_config,
+    scenario_key,
+)
+from .situation import create_situation_without_axes
+
+# Outputs reported for each configuration, as in calculate_single_point
+SWEEP_OUTPUTS = list(SINGLE_POINT_VARIABLES) + [
+    "larger_of_state_sales_or_income_tax",
+    "state_income_tax_over_sales_tax",
+]
+
+# Worker processes kept for the life of the process, so sweeps after the
+# first find policyengine-us imported and its baseline system built
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _sweep_executor(workers: int) -> ProcessPoolExecutor:
+    """Return the process pool for sweeps, replacing it if resized."""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ProcessPoolExecutor(max_workers=workers)
+            _executor_workers = workers
+        return _executor
+
+
+def _discard_executor(executor: ProcessPoolExecutor):
+    """Drop a pool whose workers died, so the next sweep starts a new one."""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+
+def _run_reform(situation: dict, baseline_scenario: str, key: str) -> dict:
+    """Calculate the sweep outputs for one unique reform.
+
+    Each reform runs once per sweep and a reformed system holds hundreds of
+    megabytes, so it is built for the call rather than cached, leaving the
+    process's system cache to the scenarios requests share. Failures are
+    returned rather than raised so one unsupported reform does not abort the
+    rest of the sweep.
+    """
+    try:
+        system = _build_tax_benefit_system(baseline_scenario, json.loads(key))
+        simulation = _count_simulation(
+            "sweep", track(Simulation(situation=situation, tax_benefit_system=system))
+        )
+        outputs = _single_point_outputs(simulation)
+        return {"values": {name: outputs[name][0].item() for name in SWEEP_OUTPUTS}}
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def calculate_policy_sweep(
+    state_code: str,
+    real_estate_taxes: float,
+    is_married: bool,
+    num_children: int,
+    child_ages: list[int],
+    qualified_dividend_income: float,
+    long_term_capital_gains: float,
+    short_term_capital_gains: float,
+    deductible_mortgage_interest: float,
+    charitable_cash_donations: float,
+    employment_income: float,
+    policy_configs: Optional[list[dict]] = None,
+    baseline_scenario: str = "Current Law",
+    workers: int = 1,
+) -> dict:
+    """Calculate one household under many policy configurations.
+
+    ``policy_configs`` defaults to every enumerable configuration. The
+    situation is built once and configurations are grouped by their reform
+    parameters, so each distinct reform is simulated once; distinct reforms
+    are spread over a pool of ``workers`` processes kept between sweeps (in
+    this process when 1).
+
+    Returns one row per configuration: ``reform_index`` maps each to its
+    distinct reform, ``values`` holds one list per output and ``errors`` the
+    failure message (with None values) for reforms that could not be run.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if policy_configs is None:
+        policy_configs = enumerate_policy_configs()
+
+    situation = create_situation_without_axes(
+        state_code=state_code,
+        real_estate_taxes=real_estate_taxes,
+        is_married=is_married,
+        num_children=num_children,
+        child_ages=child_ages,
+        qualified_dividend_income=qualified_dividend_income,
+        long_term_capital_gains=long_term_capital_gains,
+        short_term_capital_gains=short_term_capital_gains,
+        deductible_mortgage_interest=deductible_mortgage_interest,
+        charitable_cash_donations=charitable_cash_donations,
+        employment_income=employment_income,
+    )
+
+    # Distinct scenario keys in first-seen order
+    index, reform_index = {}, []
+    for config in policy_configs:
+        key = scenario_key(baseline_scenario, get_reform_params_from_config(config))
+        reform_index.append(index.setdefault(key, len(index)))
+    keys = list(index)
+
+    if workers == 1:
+        results = [_run_reform(situation, *key) for key in keys]
+    else:
+        executor = _sweep_executor(workers)
+        try:
+            results = list(
+                executor.map(
+                    _run_reform,
+                    [situation] * len(keys),
+                    [scenario for scenario, _ in keys],
+                    [key for _, key in keys],
+                )
+            )
+        except BrokenProcessPool:
+            _discard_executor(executor)
+            raise
+
+    return {
+        "policy_configs": policy_configs,
+        "reform_index": reform_index,
+        "unique_reforms": len(keys),
+        "values": {
+            name: [results[i].get("values", {}).get(name) for i in reform_index]
+            for name in SWEEP_OUTPUTS
+        },
+        "errors": [results[i].get("error") for i in reform_index],
+    }
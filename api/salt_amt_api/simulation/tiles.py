@@ -0,0 +1,278 @@
+"""Map-style tiles over the SALT x income grid.
+
+The grid covers ``SALT_EXTENT`` x ``INCOME_EXTENT``. At zoom level ``z`` it
+is cut into ``2**z`` tiles per axis, each holding ``TILE_SIZE`` points per
+axis starting at the tile's lower edge, so every point of a tile is also a
+point of the tiles below it at the next zoom level. A request names a
+viewport and the number of points it wants across it; the shallowest zoom
+level that provides them is used, and only the tiles overlapping the
+viewport are returned.
+
+Computed tiles are saved to a ``TileStore`` under a key for the household
+and scenario, and read back memory-mapped, so panning and zooming reuse
+earlier work.
+"""
+
+import hashlib
+import json
+import math
+import os
+import tempfile
+from typing import Optional
+
+import numpy as np
+
+from .calculation import (
+    TWO_AXES_VARIABLES,
+    _calculate_two_axes_chunked,
+    _create_tax_benefit_system,
+)
+from .reforms import scenario_key
+
+# Points per axis in a tile
+TILE_SIZE = 32
+# Grid extent at zoom level 0, as in calculate_two_axes' defaults
+SALT_EXTENT = (-50000.0, 250000.0)
+INCOME_EXTENT = (0.0, 1000000.0)
+# Deepest zoom level: 2048 points per axis, about $150 and $500 apart
+MAX_ZOOM = 6
+# Most tiles one request may cover
+MAX_TILES = 256
+
+# Outputs stored per tile; the axis values follow from the tile's position
+TILE_OUTPUTS = [
+    name
+    for name in TWO_AXES_VARIABLES
+    if name not in ("employment_income", "reported_salt")
+]
+
+
+def tile_steps(zoom: int) -> tuple[float, float]:
+    """Return the SALT and income spacing of points at a zoom level."""
+    points = 2**zoom * TILE_SIZE
+    return (
+        (SALT_EXTENT[1] - SALT_EXTENT[0]) / points,
+        (INCOME_EXTENT[1] - INCOME_EXTENT[0]) / points,
+    )
+
+
+def tile_axes(zoom: int, x: int, y: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return the SALT values of tile column ``x`` and incomes of row ``y``."""
+    salt_step, income_step = tile_steps(zoom)
+    offsets = np.arange(TILE_SIZE)
+    return (
+        SALT_EXTENT[0] + (x * TILE_SIZE + offsets) * salt_step,
+        INCOME_EXTENT[0] + (y * TILE_SIZE + offsets) * income_step,
+    )
+
+
+def viewport_tiles(
+    min_salt: float,
+    max_salt: float,
+    min_income: float,
+    max_income: float,
+    resolution: int,
+) -> tuple[int, list[tuple[int, int]]]:
+    """Return the zoom level and (x, y) tiles covering a viewport.
+
+    The zoom level is the shallowest with at least ``resolution`` points
+    across the viewport on both axes, capped at ``MAX_ZOOM``.
+    """
+    if min_salt >= max_salt or min_income >= max_income:
+        raise ValueError("Viewport minimums must be below its maximums")
+    if resolution < 1:
+        raise ValueError("resolution must be at least 1")
+    if (
+        max_salt <= SALT_EXTENT[0]
+        or min_salt >= SALT_EXTENT[1]
+        or max_income <= INCOME_EXTENT[0]
+        or min_income >= INCOME_EXTENT[1]
+    ):
+        raise ValueError("Viewport lies outside the tile grid")
+
+    salt_step, income_step = tile_steps(0)
+    needed = max(
+        resolution * salt_step / (max_salt - min_salt),
+        resolution * income_step / (max_income - min_income),
+    )
+    zoom = min(max(math.ceil(math.log2(needed)), 0), MAX_ZOOM)
+
+    def tile_range(low: float, high: float, extent: tuple) -> range:
+        width = (extent[1] - extent[0]) / 2**zoom
+        first = max(math.floor((low - extent[0]) / width), 0)
+        last = min(math.ceil((high - extent[0]) / width), 2**zoom)
+        return range(first, last)
+
+    xs = tile_range(min_salt, max_salt, SALT_EXTENT)
+    ys = tile_range(min_income, max_income, INCOME_EXTENT)
+    if len(xs) * len(ys) > MAX_TILES:
+        raise ValueError(f"Viewport needs more than {MAX_TILES} tiles")
+    return zoom, [(x, y) for y in ys for x in xs]
+
+
+def tile_key(household: dict, baseline_scenario: str, reform_params=None) -> str:
+    """Return the store key for a household under a scenario."""
+    text = json.dumps(
+        [household, scenario_key(baseline_scenario, reform_params)],
+        sort_keys=True,
+        default=float,
+    )
+    return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+
+class TileStore:
+    """Computed tiles saved as ``.npy`` files and read back memory-mapped.
+
+    Each tile is a float32 array of shape ``(len(TILE_OUTPUTS), TILE_SIZE,
+    TILE_SIZE)`` indexed by output, income and SALT. Writes go through a
+    temporary file and a rename, so concurrent readers never see a partial
+    tile.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, key: str, zoom: int, x: int, y: int) -> str:
+        return os.path.join(self.directory, key, str(zoom), f"{x}_{y}.npy")
+
+    def get(self, key: str, zoom: int, x: int, y: int) -> Optional[np.ndarray]:
+        """Return a stored tile as a read-only memory map, or None."""
+        try:
+            return np.load(self._path(key, zoom, x, y), mmap_mode="r")
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, zoom: int, x: int, y: int, tile: np.ndarray) -> None:
+        """Save a tile, replacing any stored copy."""
+        path = self._path(key, zoom, x, y)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".npy")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.asarray(tile, dtype=np.float32))
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+def _compute_tiles(
+    household: dict, tax_benefit_system, zoom: int, tiles: list[tuple[int, int]]
+) -> list[np.ndarray]:
+    """Simulate the cells of several tiles together; return one array each.
+
+    Cells are simulated ``LOW_MEMORY_CHUNK_CELLS`` at a time, as a viewport
+    of ``MAX_TILES`` tiles would not fit in memory as one simulation.
+    """
+    salt, income = [], []
+    for x, y in tiles:
+        salt_values, income_values = tile_axes(zoom, x, y)
+        # Cells in axes order: income major, SALT minor
+        income.append(np.repeat(income_values, TILE_SIZE))
+        salt.append(np.tile(salt_values, TILE_SIZE))
+    values = _calculate_two_axes_chunked(
+        household=household,
+        tax_benefit_system=tax_benefit_system,
+        employment_income=np.concatenate(income),
+        reported_salt=np.concatenate(salt),
+        screen=True,
+        prune=True,
+    )
+    stacked = np.array([values[name] for name in TILE_OUTPUTS], dtype=np.float32)
+    return list(
+        stacked.reshape(len(TILE_OUTPUTS), len(tiles), TILE_SIZE, TILE_SIZE).swapaxes(
+            0, 1
+        )
+    )
+
+
+def calculate_tiles(
+    is_married: bool,
+    state_code: str,
+    num_children: int,
+    child_ages: list[int],
+    qualified_dividend_income: float,
+    long_term_capital_gains: float,
+    short_term_capital_gains: float,
+    deductible_mortgage_interest: float,
+    charitable_cash_donations: float,
+    min_salt: float,
+    max_salt: float,
+    min_income: float,
+    max_income: float,
+    resolution: int = 128,
+    baseline_scenario: str = "Current Law",
+    reform_params: Optional[dict] = None,
+    store: Optional[TileStore] = None,
+) -> dict:
+    """Return the tiles covering a viewport of the SALT x income grid.
+
+    Tiles missing from ``store`` are simulated together, in chunks of
+    ``LOW_MEMORY_CHUNK_CELLS`` cells (with AMT screening and pruning, which
+    do not change the outputs), and saved to it. Each tile reports its position, the SALT and income values of its
+    columns and rows, whether it came from the store, and each output as a
+    flat list in income-major order, as in ``calculate_two_axes``.
+    """
+    household = {
+        "is_married": is_married,
+        "state_code": state_code,
+        "num_children": num_children,
+        "child_ages": child_ages,
+        "qualified_dividend_income": qualified_dividend_income,
+        "long_term_capital_gains": long_term_capital_gains,
+        "short_term_capital_gains": short_term_capital_gains,
+        "deductible_mortgage_interest": deductible_mortgage_interest,
+        "charitable_cash_donations": charitable_cash_donations,
+    }
+    zoom, positions = viewport_tiles(
+        min_salt, max_salt, min_income, max_income, resolution
+    )
+    key = tile_key(household, baseline_scenario, reform_params)
+
+    tiles = {}
+    if store is not None:
+        for position in positions:
+            tile = store.get(key, zoom, *position)
+            if tile is not None:
+                tiles[position] = tile
+    cached = set(tiles)
+    missing = [position for position in positions if position not in cached]
+    if missing:
+        system = _create_tax_benefit_system(baseline_scenario, reform_params)
+        for position, tile in zip(
+            missing, _compute_tiles(household, system, zoom, missing)
+        ):
+            tiles[position] = tile
+            if store is not None:
+                store.put(key, zoom, *position, tile)
+
+    results = []
+    for x, y in positions:
+        tile = tiles[(x, y)]
+        salt_values, income_values = tile_axes(zoom, x, y)
+        outputs = {
+            name: tile[i].ravel().tolist() for i, name in enumerate(TILE_OUTPUTS)
+        }
+        amt_binds = (
+            tile[TILE_OUTPUTS.index("amt")] > tile[TILE_OUTPUTS.index("regular_tax")]
+        )
+        results.append(
+            {
+                "x": x,
+                "y": y,
+                "salt_values": salt_values.tolist(),
+                "income_values": income_values.tolist(),
+                "cached": (x, y) in cached,
+                **outputs,
+                "amt_binds": amt_binds.ravel().tolist(),
+            }
+        )
+    salt_step, income_step = tile_steps(zoom)
+    return {
+        "zoom": zoom,
+        "tile_size": TILE_SIZE,
+        "salt_step": salt_step,
+        "income_step": income_step,
+        "computed_tiles": len(missing),
+        "tiles": results,
+    }
@@ -0,0 +1,55 @@
+"""Shared fixtures for tests run on stubbed simulations."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from salt_amt_api.simulation import calculation, solvers
+
+
+class FakeSimulation:
+    """Simulation returning each household's inputs and ``outputs`` of them.
+
+    ``outputs`` maps variables to functions of the numeric inputs, by name;
+    other variables are zero. Every simulation made is kept in ``created``.
+    """
+
+    created = []
+    outputs = {}
+
+    def __init__(self, dataset, tax_benefit_system):
+        count = len(dataset["employment_income"])
+        self.inputs = {}
+        for name, values in dataset.items():
+            values = np.asarray(values)
+            if values.dtype.kind in "biuf" and values.size in (1, count):
+                self.inputs[name] = np.broadcast_to(values.astype(float).ravel(), count)
+        self.populations = {"household": SimpleNamespace(count=count)}
+        self.created.append(self)
+
+    def calculate(self, variable, map_to=None, period=None):
+        if variable in self.inputs:
+            return self.inputs[variable]
+        if variable in self.outputs:
+            return self.outputs[variable](self.inputs)
+        return np.zeros(self.populations["household"].count)
+
+    def set_input(self, variable, period, values):
+        self.inputs[variable] = np.asarray(values, dtype=float)
+
+
+@pytest.fixture
+def fake_simulation(monkeypatch):
+    """Run calculations and solvers on ``FakeSimulation``s.
+
+    Datasets are the columns passed to ``create_household_dataset``. Returns
+    the class, whose ``outputs`` tests set.
+    """
+    monkeypatch.setattr(FakeSimulation, "created", [])
+    monkeypatch.setattr(FakeSimulation, "outputs", {})
+    for module in (calculation, solvers):
+        monkeypatch.setattr(module, "Simulation", FakeSimulation)
+        monkeypatch.setattr(module, "create_household_dataset", lambda **c: c)
+        monkeypatch.setattr(module, "_create_tax_benefit_system", lambda *a: None)
+    return FakeSimulation
@@ -0,0 +1,162 @@
+"""Tests for request cost estimation and admission control."""
+
+import pytest
+
+from salt_amt_api import admission
+from salt_amt_api.admission import (
+    admit,
+    cost_features,
+    downscale,
+    estimate_cost,
+    fit_cost_model,
+)
+from salt_amt_api.models import SaltAxisRequest, TwoAxesRequest
+
+# One second per simulation, a millisecond per person and 0.1ms per
+# person-variable
+COST_MODEL = {
+    "fixed_seconds": 1.0,
+    "person_seconds": 1e-3,
+    "person_variable_seconds": 1e-4,
+}
+
+
+def grid(oversize=None, **household):
+    return TwoAxesRequest(
+        household={"state_code": "NY", **household},
+        income_count=100,
+        salt_count=50,
+        oversize=oversize,
+    )
+
+
+class TestEstimateCost:
+    """Tests for cost_features and estimate_cost functions."""
+
+    def test_features(self):
+        """Should count households, persons, periods and variables."""
+        features = cost_features("two_axes", grid(is_married=True, num_children=2))
+        assert features == {
+            "households": 5000,
+            "persons": 4,
+            "periods": 1,
+            "variables": 8,
+        }
+
+    def test_marginal_rates_and_years(self):
+        """Perturbed copies and extra years should add to the cost."""
+        request = SaltAxisRequest(
+            household={"state_code": "NY"},
+            count=100,
+            marginal_rates=True,
+            years=[2026, 2027, 2028],
+        )
+        features = cost_features("salt_axis", request)
+        assert (features["households"], features["periods"]) == (200, 3)
+
+    def test_estimate(self):
+        """Should apply the cost model to the features."""
+        estimate = estimate_cost("two_axes", grid(), COST_MODEL)
+        assert estimate["seconds"] == pytest.approx(1 + 5000 * (1e-3 + 8e-4))
+
+    def test_rejects_unknown_endpoint(self):
+        """Should only estimate axis endpoints."""
+        with pytest.raises(ValueError):
+            estimate_cost("single", grid(), COST_MODEL)
+
+
+class TestFitCostModel:
+    """Tests for fit_cost_model function."""
+
+    def benchmarks(self, cost_model):
+        benchmarks = []
+        for households in (100, 1000, 10000):
+            for persons, variables in [(1, 7), (2, 8), (4, 10)]:
+                features = {
+                    "households": households,
+                    "persons": persons,
+                    "periods": 1,
+                    "variables": variables,
+                }
+                person_periods = households * persons
+                seconds = (
+                    cost_model["fixed_seconds"]
+                    + cost_model["person_seconds"] * person_periods
+                    + cost_model["person_variable_seconds"] * person_periods * variables
+                )
+                benchmarks.append({**features, "seconds": seconds})
+        return benchmarks
+
+    def test_recovers_coefficients(self):
+        """Should recover the coefficients that generated the timings."""
+        fitted = fit_cost_model(self.benchmarks(COST_MODEL))
+        assert fitted == pytest.approx(COST_MODEL)
+
+    def test_no_negative_coefficients(self):
+        """Should drop coefficients that would lower the estimate."""
+        benchmarks = self.benchmarks({**COST_MODEL, "fixed_seconds": -5.0})
+        fitted = fit_cost_model(benchmarks)
+        assert fitted["fixed_seconds"] == 0
+        assert all(value >= 0 for value in fitted.values())
+
+    def test_requires_benchmarks(self):
+        """Should not fit without benchmarks."""
+        with pytest.raises(ValueError):
+            fit_cost_model([])
+
+
+class TestAdmit:
+    """Tests for admit and downscale functions."""
+
+    def test_accept(self):
+        """Should accept requests within the budget unchanged."""
+        request = grid()
+        decision = admit("two_axes", request, 10, cost_model=COST_MODEL)
+        assert decision["action"] == "accept"
+        assert decision["request"] is request
+
+    def test_reject(self):
+        """Should reject requests over the budget by default."""
+        decision = admit("two_axes", grid(), 5, cost_model=COST_MODEL)
+        assert decision["action"] == "reject"
+        assert decision["counts"] == {"income_count": 100, "salt_count": 50}
+
+    def test_accept_oversize(self):
+        """Should accept requests over the budget that ask to be."""
+        decision = admit("two_axes", grid("accept"), 5, cost_model=COST_MODEL)
+        assert decision["action"] == "accept"
+
+    def test_unfitted_default(self, monkeypatch, tmp_path):
+        """Until the cost model is fitted, should reject by default over a cap."""
+        monkeypatch.setattr(
+            admission, "DEFAULT_COST_MODEL_PATH", tmp_path / "cost_model.json"
+        )
+        monkeypatch.setattr(admission, "MAX_UNFITTED_POINTS", 5000)
+        assert admit("two_axes", grid(), 1)["action"] == "accept"
+        assert admit("two_axes", grid("reject"), 1)["action"] == "reject"
+        request = grid().model_copy(update={"years": [2026, 2027]})
+        assert admit("two_axes", request, 1)["action"] == "reject"
+        request = grid("accept").model_copy(update={"years": [2026, 2027]})
+        assert admit("two_axes", request, 1)["action"] == "accept"
+
+    def test_downscale(self):
+        """Should scale both counts by the same factor to fit the budget."""
+        decision = admit("two_axes", grid("downscale"), 5, cost_model=COST_MODEL)
+        assert decision["action"] == "downscale"
+        scaled = decision["request"]
+        assert scaled.income_count == 2 * scaled.salt_count
+        assert decision["estimate"]["seconds"] <= 5
+        assert scaled.income_count * scaled.salt_count > 2000
+
+    def test_downscale_impossible(self):
+        """Should reject if even the fewest points exceed the budget."""
+        assert downscale("two_axes", grid(), 1, COST_MODEL) is None
+        decision = admit("two_axes", grid("downscale"), 1, cost_model=COST_MODEL)
+        assert decision["action"] == "reject"
+
+    def test_queue(self):
+        """Should queue requests within the queue budget only."""
+        request = grid("queue")
+        assert admit("two_axes", request, 5, 100, COST_MODEL)["action"] == "queue"
+        assert admit("two_axes", request, 5, 6, COST_MODEL)["action"] == "reject"
+        assert admit("two_axes", request, 5, None, COST_MODEL)["action"] == "reject"
@@ -0,0 +1,135 @@
+"""Tests for the precomputed household atlas."""
+
+import numpy as np
+import pytest
+
+from salt_amt_api import atlas
+from salt_amt_api.atlas import (
+    Atlas,
+    archetypes,
+    build_atlas,
+    calculation_arguments,
+    load_atlas,
+    scenarios,
+)
+from salt_amt_api.models import HouseholdInput, SaltAxisRequest
+from salt_amt_api.simulation.reforms import CURRENT_POLICY_PARAMS
+
+SPEC = {
+    "state_codes": ["NY"],
+    "is_married": [True],
+    "num_children": [0, 2],
+    "endpoints": ["salt_axis"],
+    "baseline_scenarios": ["Current Law", "Current Policy"],
+    "policy_configs": [None],
+}
+
+
+def fake_salt_axis(
+    employment_income, num_children, min_salt, max_salt, count, reform_params, **_
+):
+    """Stand in for calculate_salt_axis; fails under any reform."""
+    if reform_params is not None:
+        raise ValueError("Unsupported reform")
+    salt = np.linspace(min_salt, max_salt, count)
+    tax = 0.2 * employment_income - 0.1 * salt + 1000 * num_children
+    return {
+        "axis_values": salt.tolist(),
+        "income_tax": tax.tolist(),
+        "marginal_income_tax": None,
+        "amt_binds": (salt > max_salt / 2).tolist(),
+    }
+
+
+@pytest.fixture
+def fake_endpoints(monkeypatch):
+    _, model, household_fields, request_fields = atlas.ENDPOINTS["salt_axis"]
+    monkeypatch.setitem(
+        atlas.ENDPOINTS,
+        "salt_axis",
+        (fake_salt_axis, model, household_fields, request_fields),
+    )
+
+
+def request(**household):
+    """Return a salt_axis request for the spec's married NY household."""
+    defaults = {
+        **atlas.DEFAULT_SPEC["household"],
+        "state_code": "NY",
+        "is_married": True,
+    }
+    return SaltAxisRequest(household=HouseholdInput(**{**defaults, **household}))
+
+
+class TestSpec:
+    """Tests for archetypes, scenarios and calculation_arguments."""
+
+    def test_archetypes_take_leading_child_ages(self):
+        """Each archetype should use the first child ages of the spec."""
+        households = archetypes({**atlas.DEFAULT_SPEC, **SPEC})
+        assert [h.child_ages for h in households] == [[], [10, 8]]
+
+    def test_default_scenarios_are_distinct(self):
+        """Both baselines with every config should reduce to distinct scenarios."""
+        distinct = scenarios(atlas.DEFAULT_SPEC)
+        assert ("Current Law", None) in distinct
+        assert len(distinct) == len(set(map(repr, distinct)))
+
+    def test_presentation_fields_are_not_arguments(self):
+        """Pruning and encoding should not distinguish requests."""
+        req = request()
+        pruned = req.model_copy(update={"prune": True, "encoding": "breakpoints"})
+        arguments = calculation_arguments("salt_axis", req)
+        assert arguments == calculation_arguments("salt_axis", pruned)
+        assert arguments["employment_income"] == 200000
+        assert "prune" not in arguments
+
+
+class TestAtlas:
+    """Tests for build_atlas and Atlas lookups."""
+
+    def test_round_trip(self, tmp_path, fake_endpoints):
+        """Lookups should return what the calculation returned."""
+        summary = build_atlas(tmp_path, SPEC)
+        # Current Policy without a config is a reform, which the fake rejects
+        assert summary["entries"] == 2
+        assert summary["failures"] == 2
+
+        req = request(num_children=2, child_ages=[10, 8])
+        result = load_atlas(str(tmp_path)).lookup_request("salt_axis", req)
+        expected = fake_salt_axis(
+            **calculation_arguments("salt_axis", req), reform_params=None
+        )
+        np.testing.assert_allclose(result["income_tax"], expected["income_tax"])
+        assert result["amt_binds"] == expected["amt_binds"]
+        assert "marginal_income_tax" not in result
+
+    def test_misses(self, tmp_path, fake_endpoints):
+        """Other households, axes, scenarios and endpoints should miss."""
+        build_atlas(tmp_path, SPEC)
+        stored = Atlas(tmp_path)
+        assert stored.lookup_request("salt_axis", request(num_children=1)) is None
+        shorter = request().model_copy(update={"count": 10})
+        assert stored.lookup_request("salt_axis", shorter) is None
+        reformed = stored.lookup_request("salt_axis", request(), CURRENT_POLICY_PARAMS)
+        assert reformed is None
+        assert stored.lookup_request("income_axis", request()) is None
+        assert stored.lookup_request("single", request()) is None
+
+    def test_other_version_not_loaded(self, tmp_path, fake_endpoints, monkeypatch):
+        """An atlas built by another PolicyEngine-US version should not load."""
+        monkeypatch.setattr(atlas, "policyengine_us_version", lambda: "1.0.0")
+        build_atlas(tmp_path, SPEC)
+        assert Atlas(tmp_path).version == "1.0.0"
+        assert load_atlas(str(tmp_path)) is not None
+        monkeypatch.setattr(atlas, "policyengine_us_version", lambda: "1.0.1")
+        assert load_atlas(str(tmp_path)) is None
+
+    def test_missing_atlas(self, tmp_path):
+        """A directory without an index should load as no atlas."""
+        assert load_atlas(str(tmp_path)) is None
+
+    def test_rejects_unknown_endpoint(self, tmp_path):
+        """Specs may only name atlas endpoints."""
+        with pytest.raises(ValueError):
+            build_atlas(tmp_path, {**SPEC, "endpoints": ["single"]})
@@ -0,0 +1,66 @@
+"""Tests for the bulk household batch runner's input handling."""
+
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from salt_amt_api.batch import households_from_frame, parse_child_ages, read_chunks
+
+
+class TestParseChildAges:
+    """Tests for parse_child_ages function."""
+
+    def test_parses_json_list(self):
+        """Should parse a JSON-style list."""
+        assert parse_child_ages("[4, 9]") == [4, 9]
+
+    def test_parses_semicolon_list(self):
+        """Should parse a semicolon-separated list."""
+        assert parse_child_ages("4;9") == [4, 9]
+
+    def test_empty_cells(self):
+        """Should treat empty strings and missing values as no children."""
+        assert parse_child_ages("") == []
+        assert parse_child_ages("[]") == []
+        assert parse_child_ages(float("nan")) == []
+        assert parse_child_ages(None) == []
+
+    def test_single_number(self):
+        """Should wrap a single numeric age."""
+        assert parse_child_ages(7) == [7]
+
+
+class TestHouseholdsFromFrame:
+    """Tests for households_from_frame function."""
+
+    def test_fills_defaults_and_ignores_extra_columns(self):
+        """Should default missing fields and drop unknown columns."""
+        frame = pd.DataFrame(
+            {
+                "id": [1, 2],
+                "state_code": ["CA", "NY"],
+                "employment_income": [100000, None],
+            }
+        )
+        households = households_from_frame(frame)
+        assert households[0]["state_code"] == "CA"
+        assert households[0]["employment_income"] == 100000
+        assert households[1]["employment_income"] == 0
+        assert households[1]["child_ages"] == []
+        assert "id" not in households[0]
+
+    def test_validates_rows(self):
+        """Should reject rows that are not valid HouseholdInput."""
+        frame = pd.DataFrame({"state_code": ["CA"], "employment_income": [-1]})
+        with pytest.raises(ValidationError):
+            households_from_frame(frame)
+
+
+class TestReadChunks:
+    """Tests for read_chunks function."""
+
+    def test_reads_csv_in_chunks(self, tmp_path):
+        """Should yield chunks of at most chunk_size rows."""
+        path = tmp_path / "households.csv"
+        pd.DataFrame({"state_code": ["CA"] * 5}).to_csv(path, index=False)
+        assert [len(chunk) for chunk in read_chunks(path, 2)] == [2, 2, 1]
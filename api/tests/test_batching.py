@@ -0,0 +1,113 @@
+"""Tests for micro-batching of single-point requests."""
+
+import threading
+
+import pytest
+
+from salt_amt_api.simulation import batching
+from salt_amt_api.simulation.batching import MicroBatcher
+from salt_amt_api.simulation.reforms import CURRENT_POLICY_PARAMS
+
+
+@pytest.fixture
+def recorded_batches(monkeypatch):
+    """Replace the simulation with one that echoes income and records batches."""
+    batches = []
+
+    def fake_calculate_households(households, tax_benefit_system=None):
+        batches.append((tax_benefit_system, len(households)))
+        if any(h["state_code"] == "ZZ" for h in households):
+            raise ValueError("bad state")
+        return {"income": [h["employment_income"] for h in households]}
+
+    monkeypatch.setattr(batching, "calculate_households", fake_calculate_households)
+    monkeypatch.setattr(
+        batching, "_cached_tax_benefit_system", lambda scenario, key: (scenario, key)
+    )
+    return batches
+
+
+def _submit_all(batcher, requests):
+    """Submit requests from concurrent threads and collect their futures."""
+    futures = [None] * len(requests)
+    barrier = threading.Barrier(len(requests))
+
+    def submit(i, household, scenario):
+        barrier.wait()
+        futures[i] = batcher.submit(household, scenario)
+
+    threads = [
+        threading.Thread(target=submit, args=(i, *request))
+        for i, request in enumerate(requests)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return futures
+
+
+class TestMicroBatcher:
+    """Tests for MicroBatcher."""
+
+    def test_groups_by_scenario_and_scatters_results(self, recorded_batches):
+        """Concurrent requests should share one batch per scenario."""
+        batcher = MicroBatcher(max_batch_size=64, max_wait=0.2)
+        requests = [
+            ({"state_code": "CA", "employment_income": i}, scenario)
+            for i in range(10)
+            for scenario in ["Current Law", "Current Policy"]
+        ]
+        futures = _submit_all(batcher, requests)
+
+        results = [future.result(timeout=5) for future in futures]
+        assert [r["income"] for r in results] == [i for i in range(10) for _ in "ab"]
+        assert sorted(size for _, size in recorded_batches) == [10, 10]
+        assert batcher.stats()["batch_size"]["count"] == 2
+
+    def test_equivalent_scenarios_share_a_batch(self, recorded_batches):
+        """The Current Policy baseline should batch with its own params."""
+        batcher = MicroBatcher(max_batch_size=64, max_wait=0.2)
+        household = {"state_code": "CA", "employment_income": 1}
+        futures = [
+            batcher.submit(household, "Current Policy"),
+            batcher.submit(household, "Current Law", CURRENT_POLICY_PARAMS),
+        ]
+
+        assert [f.result(timeout=5) for f in futures] == [{"income": 1}] * 2
+        assert [size for _, size in recorded_batches] == [1]
+
+    def test_respects_max_batch_size(self, recorded_batches):
+        """Full groups should be split at max_batch_size."""
+        batcher = MicroBatcher(max_batch_size=4, max_wait=0.2)
+        requests = [
+            ({"state_code": "CA", "employment_income": i}, "Current Law")
+            for i in range(10)
+        ]
+        futures = _submit_all(batcher, requests)
+
+        for future in futures:
+            future.result(timeout=5)
+        assert all(size <= 4 for _, size in recorded_batches)
+        assert sum(size for _, size in recorded_batches) == 10
+
+    def test_failure_only_affects_its_caller(self, recorded_batches):
+        """A household that fails should not fail the rest of its batch."""
+        batcher = MicroBatcher(max_batch_size=64, max_wait=0.2)
+        requests = [
+            ({"state_code": state, "employment_income": 1}, "Current Law")
+            for state in ["CA", "ZZ", "NY"]
+        ]
+        futures = _submit_all(batcher, requests)
+
+        with pytest.raises(ValueError):
+            futures[1].result(timeout=5)
+        assert futures[0].result(timeout=5) == {"income": 1}
+        assert futures[2].result(timeout=5) == {"income": 1}
+
+    def test_rejects_invalid_settings(self):
+        """Should reject empty batches and negative waits."""
+        with pytest.raises(ValueError):
+            MicroBatcher(max_batch_size=0)
+        with pytest.raises(ValueError):
+            MicroBatcher(max_wait=-1)
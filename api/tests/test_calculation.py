@@ -0,0 +1,166 @@
+"""Tests for calculation functions, on stubbed simulations."""
+
+import numpy as np
+import pytest
+
+from salt_amt_api.simulation import calculation
+from salt_amt_api.simulation.calculation import (
+    SENSITIVITY_INPUTS,
+    SENSITIVITY_OUTPUTS,
+    calculate_sensitivity,
+    calculate_two_axes,
+)
+
+HOUSEHOLD = dict(
+    state_code="NY",
+    is_married=False,
+    num_children=0,
+    child_ages=[],
+    employment_income=100000,
+    real_estate_taxes=40,
+    qualified_dividend_income=5000,
+    long_term_capital_gains=0,
+    short_term_capital_gains=0,
+    deductible_mortgage_interest=0,
+    charitable_cash_donations=0,
+)
+
+# Outputs as functions of the inputs: income tax is linear, and AMT kinks at
+# the base household's income
+OUTPUTS = {
+    "income_tax": lambda x: (
+        0.2 * x["employment_income"]
+        - 0.1 * x["real_estate_taxes"]
+        + 0.15 * x["qualified_dividend_income"]
+    ),
+    "amt_base_tax": lambda x: 0.3 * np.maximum(x["employment_income"] - 100000, 0),
+    "household_net_income": lambda x: 0.7 * x["employment_income"],
+}
+
+
+@pytest.fixture
+def sensitivity(fake_simulation):
+    """Calculate the sensitivity of ``HOUSEHOLD`` on a fake simulation."""
+    fake_simulation.outputs = OUTPUTS
+    return calculate_sensitivity(**HOUSEHOLD, delta=100)
+
+
+class TestCalculateSensitivity:
+    """Tests for calculate_sensitivity function."""
+
+    def test_values(self, sensitivity):
+        """Should report the base household's outputs."""
+        assert sensitivity["inputs"] == SENSITIVITY_INPUTS
+        assert sensitivity["outputs"] == SENSITIVITY_OUTPUTS
+        assert sensitivity["values"] == pytest.approx(
+            {"income_tax": 20746, "amt_base_tax": 0, "household_net_income": 70000}
+        )
+
+    def test_linear_rates(self, sensitivity):
+        """Forward, backward and central rates should agree on linear outputs."""
+        for rates in ("forward", "backward", "jacobian"):
+            income_tax = sensitivity[rates]["income_tax"]
+            assert income_tax["employment_income"] == pytest.approx(0.2)
+            assert income_tax["qualified_dividend_income"] == pytest.approx(0.15)
+            assert sensitivity[rates]["household_net_income"][
+                "real_estate_taxes"
+            ] == pytest.approx(0)
+
+    def test_rates_at_kink(self, sensitivity):
+        """At a kink the central rate should average the one-sided rates."""
+        assert sensitivity["forward"]["amt_base_tax"]["employment_income"] == (
+            pytest.approx(0.3)
+        )
+        assert sensitivity["backward"]["amt_base_tax"]["employment_income"] == (
+            pytest.approx(0)
+        )
+        assert sensitivity["jacobian"]["amt_base_tax"]["employment_income"] == (
+            pytest.approx(0.15)
+        )
+
+    def test_one_simulation(self, fake_simulation, sensitivity):
+        """The base and each input's up and down copies should share one run."""
+        (simulation,) = fake_simulation.created
+        assert simulation.populations["household"].count == 1 + 2 * len(
+            SENSITIVITY_INPUTS
+        )
+        up, down = 1, 2
+        income = simulation.inputs["employment_income"]
+        assert (income[0], income[up], income[down]) == (100000, 100100, 99900)
+
+    def test_down_step_clipped_at_zero(self, fake_simulation, sensitivity):
+        """Inputs below delta should step down to zero and no further."""
+        (simulation,) = fake_simulation.created
+        i = SENSITIVITY_INPUTS.index("real_estate_taxes")
+        taxes = simulation.inputs["real_estate_taxes"]
+        assert (taxes[1 + 2 * i], taxes[2 + 2 * i]) == (140, 0)
+        rates = {
+            rates: sensitivity[rates]["income_tax"]["real_estate_taxes"]
+            for rates in ("forward", "backward", "jacobian")
+        }
+        assert rates == pytest.approx(
+            {"forward": -0.1, "backward": -0.1, "jacobian": -0.1}
+        )
+
+    def test_zero_inputs_have_no_backward_rate(self, sensitivity):
+        """Inputs at zero should have forward and central rates only."""
+        for output in SENSITIVITY_OUTPUTS:
+            assert sensitivity["backward"][output]["long_term_capital_gains"] is None
+            assert sensitivity["jacobian"][output]["long_term_capital_gains"] == (
+                sensitivity["forward"][output]["long_term_capital_gains"]
+            )
+
+
+class TestVerifyAmtScreening:
+    """Tests for calculate_two_axes with verify_amt_screening."""
+
+    @pytest.fixture
+    def grid(self, fake_simulation, monkeypatch):
+        """Calculate a grid whose screen wrongly rules out incomes over $400k."""
+        # Only AMT is nonzero, binding above $500,000
+        fake_simulation.outputs = {
+            "amt_base_tax": lambda x: 0.3
+            * np.maximum(x["employment_income"] - 500000, 0)
+        }
+        monkeypatch.setattr(
+            calculation,
+            "screen_grid_points",
+            lambda system, employment_income, **kwargs: employment_income > 400000,
+        )
+        household = {
+            name: value
+            for name, value in HOUSEHOLD.items()
+            if name not in ("employment_income", "real_estate_taxes")
+        }
+
+        def grid(**kwargs):
+            return calculate_two_axes(
+                **household,
+                salt_count=2,
+                income_count=6,
+                amt_screening=True,
+                **kwargs,
+            )
+
+        return grid
+
+    def test_reports_misclassified_cells(self, grid):
+        """Screened cells with AMT should be listed, with their true AMT."""
+        result = grid(verify_amt_screening=True)
+        # Incomes 0, 200k, ..., 1M; AMT binds above $500k
+        assert result["amt_screened_cells"] == 6
+        assert result["amt_misclassified_cells"] == [6, 7, 8, 9, 10, 11]
+        assert result["amt"][-1] == pytest.approx(0.3 * 500000)
+
+    def test_low_memory_chunks(self, grid, monkeypatch):
+        """Chunked grids should report cells by their place in the whole grid."""
+        monkeypatch.setattr(calculation, "LOW_MEMORY_CHUNK_CELLS", 5)
+        monkeypatch.setattr(calculation, "_release_simulation", lambda s: None)
+        result = grid(verify_amt_screening=True, low_memory=True)
+        assert result["amt_misclassified_cells"] == [6, 7, 8, 9, 10, 11]
+
+    def test_unverified(self, grid):
+        """Without verification, screened cells should have AMT pinned to zero."""
+        result = grid()
+        assert "amt_misclassified_cells" not in result
+        assert result["amt"][-1] == 0
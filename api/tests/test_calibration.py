@@ -0,0 +1,200 @@
+"""Tests for calibrating axis point counts against interpolation error."""
+
+import numpy as np
+import pytest
+
+from salt_amt_api import calibration
+from salt_amt_api.calibration import (
+    auto_counts,
+    calibrate,
+    interpolation_errors,
+    resolve_counts,
+    subset_counts,
+    upsample,
+)
+from salt_amt_api.models import IncomeAxisRequest, SaltAxisRequest, TwoAxesRequest
+
+# SALT spacings of $10,000, $20,000 and $30,000 over the default range; the
+# coarsest happens to measure no error
+SALT_AXIS = {
+    "axes": ["count"],
+    "entries": [
+        {"spacing": [10000.0], "max_error": 0.0},
+        {"spacing": [20000.0], "max_error": 50.0},
+        {"spacing": [30000.0], "max_error": 0.0},
+    ],
+}
+
+TWO_AXES = {
+    "axes": ["income_count", "salt_count"],
+    "entries": [
+        {"spacing": [1000.0, 1000.0], "max_error": 0.0},
+        {"spacing": [1000.0, 10000.0], "max_error": 5.0},
+        {"spacing": [10000.0, 1000.0], "max_error": 20.0},
+        {"spacing": [10000.0, 10000.0], "max_error": 25.0},
+    ],
+}
+
+# The finest measured spacing is within $3 only
+INCOME_AXIS = {
+    "axes": ["count"],
+    "entries": [
+        {"spacing": [500.0], "max_error": 3.0},
+        {"spacing": [1000.0], "max_error": 8.0},
+    ],
+}
+
+CALIBRATION = {
+    "salt_axis": SALT_AXIS,
+    "income_axis": INCOME_AXIS,
+    "two_axes": TWO_AXES,
+}
+
+
+def kinked(x: np.ndarray) -> np.ndarray:
+    """A tax-like output: 10% below 7, 30% above."""
+    return np.where(x < 7, 0.1 * x, 0.7 + 0.3 * (x - 7))
+
+
+class TestInterpolation:
+    """Tests for subset_counts, upsample and interpolation_errors functions."""
+
+    def test_subset_counts(self):
+        """Should list counts whose points lie on the reference's."""
+        assert subset_counts(13) == [13, 7, 5]
+        assert subset_counts(13, min_count=2) == [13, 7, 5, 4, 3, 2]
+
+    def test_upsample(self):
+        """Should join every step-th point with straight lines."""
+        values = np.array([0.0, 5, 2, 9, 4])
+        np.testing.assert_allclose(upsample(values, 3), [0, 1, 2, 3, 4])
+        np.testing.assert_allclose(upsample(values, 5), values)
+        with pytest.raises(ValueError):
+            upsample(values, 4)
+
+    def test_error_at_kink(self):
+        """Should find the error where a coarse count cuts a kink."""
+        x = np.arange(13.0)
+        reference = kinked(x)[np.newaxis]
+        # Points at 0, 6 and 12 straddle the kink at 7
+        assert interpolation_errors(reference, [3])[0] == pytest.approx(1 / 6)
+        # Points every 3 fall at 6 and 9, closer to it
+        assert interpolation_errors(reference, [5])[0] == pytest.approx(2 / 3 * 0.2)
+        assert interpolation_errors(reference, [13])[0] == 0
+
+    def test_grid(self):
+        """Should interpolate bilinearly across both axes."""
+        income, salt = np.meshgrid(np.arange(5.0), np.arange(9.0), indexing="ij")
+        reference = np.array([income + 2 * salt + income * salt, salt**2])
+        # Bilinear terms interpolate exactly; the square's error is mid-cell
+        assert interpolation_errors(reference, [2, 2])[0] == pytest.approx(0)
+        np.testing.assert_allclose(interpolation_errors(reference, [3, 3]), [0, 4])
+
+
+class TestAutoCounts:
+    """Tests for auto_counts and resolve_counts functions."""
+
+    def test_cheapest_within_tolerance(self):
+        """Should pick the widest spacing within the tolerance."""
+        assert auto_counts("salt_axis", [(0, 300000)], 60, CALIBRATION) == {"count": 11}
+        assert auto_counts("salt_axis", [(0, 300000)], 10, CALIBRATION) == {"count": 31}
+
+    def test_bounds_by_finer_spacings(self):
+        """A coarse spacing should not beat the error of finer ones."""
+        counts = auto_counts("salt_axis", [(0, 300000)], 10, CALIBRATION)
+        assert counts != {"count": 11}
+
+    def test_scales_to_range(self):
+        """Should keep the spacing over other ranges."""
+        assert auto_counts("salt_axis", [(0, 95000)], 60, CALIBRATION) == {"count": 5}
+        assert auto_counts("salt_axis", [(5, 5)], 60, CALIBRATION) == {"count": 2}
+
+    def test_grid_minimizes_cells(self):
+        """Should pick the combination needing the fewest cells."""
+        assert auto_counts(
+            "two_axes", [(0, 1000000), (-50000, 250000)], 21, CALIBRATION
+        ) == {"income_count": 101, "salt_count": 301}
+        assert auto_counts(
+            "two_axes", [(0, 1000000), (-50000, 250000)], 25, CALIBRATION
+        ) == {"income_count": 101, "salt_count": 31}
+
+    def test_rejects_unmet_tolerance(self):
+        """Should not pick a spacing for tolerances finer than any measured."""
+        with pytest.raises(ValueError, match=r"finest measured is within \$3"):
+            auto_counts("income_axis", [(0, 1000000)], 1, CALIBRATION)
+        assert auto_counts("income_axis", [(0, 1000000)], 3, CALIBRATION) == {
+            "count": 2001
+        }
+
+    def test_rejects_uncalibrated(self):
+        """Should not pick counts for endpoints without a table."""
+        with pytest.raises(ValueError, match="not calibrated"):
+            auto_counts("salt_axis", [(0, 300000)], 100, {})
+
+    def test_resolve_counts(self, monkeypatch):
+        """Should set counts only for auto-resolution requests."""
+        monkeypatch.setattr(calibration, "load_calibration", lambda: CALIBRATION)
+        household = {"state_code": "NY"}
+        fixed = SaltAxisRequest(household=household, count=7)
+        assert resolve_counts("salt_axis", fixed, CALIBRATION) is fixed
+        auto = TwoAxesRequest(household=household, resolution="auto", max_error=6)
+        resolved = resolve_counts("two_axes", auto, CALIBRATION)
+        assert (resolved.income_count, resolved.salt_count) == (1001, 31)
+
+    def test_shipped_table(self):
+        """The shipped table should resolve default auto requests."""
+        household = {"state_code": "NY"}
+        for endpoint, request in [
+            ("salt_axis", SaltAxisRequest),
+            ("income_axis", IncomeAxisRequest),
+            ("two_axes", TwoAxesRequest),
+        ]:
+            auto = request(household=household, resolution="auto")
+            resolved = resolve_counts(endpoint, auto)
+            assert resolved != auto
+
+    def test_requests_not_resolved_when_validated(self, monkeypatch):
+        """Validating a request should not read the calibration table."""
+
+        def unreadable():
+            raise AssertionError("calibration read during validation")
+
+        monkeypatch.setattr(calibration, "load_calibration", unreadable)
+        household = {"state_code": "NY"}
+        SaltAxisRequest(household=household, resolution="auto")
+        IncomeAxisRequest(household=household, resolution="auto", max_error=1)
+
+
+class TestCalibrate:
+    """Tests for calibrate function."""
+
+    def test_salt_axis(self):
+        """Should measure the spacings coarser than the reference."""
+        table = calibrate(
+            ["salt_axis"],
+            households=1,
+            seed=1,
+            references={"salt_axis": {"count": (25, 12500.0)}},
+        )["salt_axis"]
+        assert (table["households"], table["failures"]) == (1, 0)
+        assert table["discontinuous_outputs"] == [
+            "amt",
+            "amt_income",
+            "regular_tax",
+            "taxable_income",
+        ]
+        # The reference's own spacing is not a candidate
+        spacings = [entry["spacing"] for entry in table["entries"]]
+        assert spacings[:2] == [[25000.0], [37500.0]]
+        assert table["entries"][-1]["max_error"] > 0
+        errors = table["entries"][-1]["output_errors"]
+        assert table["entries"][-1]["max_error"] == max(
+            errors[output]
+            for output in errors
+            if output not in table["discontinuous_outputs"]
+        )
+
+    def test_rejects_unknown_endpoint(self):
+        """Should only calibrate axis endpoints."""
+        with pytest.raises(ValueError):
+            calibrate(["single"])
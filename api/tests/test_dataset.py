@@ -0,0 +1,79 @@
+"""Tests for array-native household inputs."""
+
+import numpy as np
+import pytest
+from salt_amt_api.simulation.dataset import create_household_arrays
+
+
+def _values(data, name):
+    """Return the 2026 array of one variable."""
+    return data[name]["2026"]
+
+
+class TestCreateHouseholdArrays:
+    """Tests for create_household_arrays function."""
+
+    def test_single_household_matches_situation_layout(self):
+        """Should lay out head, spouse and children in one of each entity."""
+        data = create_household_arrays(
+            state_code="CA",
+            is_married=True,
+            num_children=2,
+            child_ages=[5, 8],
+            employment_income=100000,
+            real_estate_taxes=5000,
+        )
+        assert list(_values(data, "person_id")) == [0, 1, 2, 3]
+        assert list(_values(data, "age")) == [40, 40, 5, 8]
+        assert list(_values(data, "employment_income")) == [100000, 0, 0, 0]
+        assert list(_values(data, "real_estate_taxes")) == [5000, 0, 0, 0]
+        assert list(_values(data, "person_tax_unit_id")) == [0, 0, 0, 0]
+        assert list(_values(data, "household_id")) == [0]
+        assert list(_values(data, "state_code")) == ["CA"]
+
+    def test_households_vary_in_size(self):
+        """Should assign each person to their own household."""
+        data = create_household_arrays(
+            state_code=["CA", "NY", "TX"],
+            is_married=[False, True, False],
+            num_children=[1, 0, 2],
+            child_ages=[[3], [], [12]],
+            employment_income=[10, 20, 30],
+        )
+        assert list(_values(data, "person_household_id")) == [0, 0, 1, 1, 2, 2, 2]
+        assert list(_values(data, "age")) == [40, 3, 40, 40, 40, 12, 10]
+        assert list(_values(data, "employment_income")) == [10, 0, 20, 0, 30, 0, 0]
+        assert list(_values(data, "spm_unit_id")) == [0, 1, 2]
+
+    def test_broadcasts_shared_values(self):
+        """Scalars and a shared child_ages list should apply to every household."""
+        data = create_household_arrays(
+            state_code="NJ",
+            is_married=False,
+            num_children=1,
+            child_ages=[6],
+            employment_income=np.array([1.0, 2.0]),
+            reported_salt=[100, 200],
+        )
+        assert list(_values(data, "state_code")) == ["NJ", "NJ"]
+        assert list(_values(data, "age")) == [40, 6, 40, 6]
+        assert list(_values(data, "reported_salt")) == [100, 200]
+
+    def test_omits_unset_optional_inputs(self):
+        """Should not set optional inputs left as None."""
+        data = create_household_arrays(
+            state_code="CA", is_married=False, num_children=0, child_ages=[]
+        )
+        assert "real_estate_taxes" not in data
+        assert "reported_salt" not in data
+
+    def test_rejects_mismatched_lengths(self):
+        """Should reject per-household inputs of different lengths."""
+        with pytest.raises(ValueError):
+            create_household_arrays(
+                state_code=["CA", "NY"],
+                is_married=False,
+                num_children=0,
+                child_ages=[],
+                employment_income=[1, 2, 3],
+            )
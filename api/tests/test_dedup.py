@@ -0,0 +1,128 @@
+"""Tests for sharing results between equivalent requests."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from salt_amt_api.simulation.dedup import ResultCache, request_key, result_bytes
+from salt_amt_api.simulation.reforms import get_reform_params_from_config
+
+
+class TestRequestKey:
+    """Tests for request_key function."""
+
+    def test_baseline_ignored_with_policy_config(self):
+        """Either baseline with the same policy config should share a key."""
+        params = get_reform_params_from_config({"salt_cap": "$0 Cap"})
+        inputs = {"count": 10}
+        assert request_key("salt_axis", inputs, "Current Law", params) == (
+            request_key("salt_axis", inputs, "Current Policy", params)
+        )
+
+    def test_endpoint_and_inputs_distinguish(self):
+        """Different endpoints or inputs should have different keys."""
+        key = request_key("salt_axis", {"count": 10}, "Current Law")
+        assert key != request_key("income_axis", {"count": 10}, "Current Law")
+        assert key != request_key("salt_axis", {"count": 11}, "Current Law")
+
+    def test_ints_match_floats(self):
+        """An int default should match the same value parsed as a float."""
+        key = request_key("salt_axis", {"household": {"income": 0}}, "Current Law")
+        assert key == request_key(
+            "salt_axis", {"household": {"income": 0.0}}, "Current Law"
+        )
+
+
+class TestResultCache:
+    """Tests for ResultCache class."""
+
+    def test_computes_each_key_once(self):
+        """Repeated keys should be served from the cache."""
+        cache = ResultCache()
+        calls = []
+        for key in ["a", "b", "a"]:
+            cache.get_or_compute(key, lambda: calls.append(1) or len(calls))
+        assert calls == [1, 1]
+        assert cache.get_or_compute("a", lambda: 0) == 1
+        assert cache.stats() == {
+            "hits": 2,
+            "misses": 2,
+            "shared": 0,
+            "size": 2,
+            "bytes": 64,
+        }
+
+    def test_concurrent_requests_share_one_computation(self):
+        """Requests arriving while a key is computed should wait for it."""
+        cache = ResultCache()
+        started, release = threading.Event(), threading.Event()
+        results = []
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return "done"
+
+        owner = threading.Thread(
+            target=lambda: results.append(cache.get_or_compute("k", slow))
+        )
+        owner.start()
+        started.wait(5)
+        waiter = threading.Thread(
+            target=lambda: results.append(cache.get_or_compute("k", lambda: "again"))
+        )
+        waiter.start()
+        while cache.stats()["shared"] == 0:
+            pass
+        release.set()
+        owner.join()
+        waiter.join()
+        assert results == ["done", "done"]
+
+    def test_failures_not_cached(self):
+        """A failed computation should be retried by the next request."""
+        cache = ResultCache()
+
+        def fail():
+            raise ValueError("bad")
+
+        with pytest.raises(ValueError):
+            cache.get_or_compute("k", fail)
+        assert cache.get_or_compute("k", lambda: 1) == 1
+
+    def test_evicts_least_recently_used(self):
+        """Should keep at most maxsize results."""
+        cache = ResultCache(maxsize=2)
+        for key in ["a", "b", "a", "c"]:
+            cache.get_or_compute(key, lambda: key)
+        assert cache.get_or_compute("a", lambda: "recomputed") == "a"
+        assert cache.get_or_compute("b", lambda: "recomputed") == "recomputed"
+
+    def test_evicts_to_max_bytes(self):
+        """Should drop least recently used results to stay within max_bytes."""
+        cache = ResultCache(max_bytes=250)
+        for key in ["a", "b", "c"]:
+            cache.get_or_compute(key, lambda: np.zeros(10))
+        assert cache.stats()["size"] == 3
+        cache.get_or_compute("a", lambda: None)
+        cache.get_or_compute("d", lambda: np.zeros(10))
+        assert cache.stats()["bytes"] == 240
+        assert cache.get_or_compute("b", lambda: "recomputed") == "recomputed"
+
+    def test_large_results_shared_not_kept(self):
+        """Results over max_entry_bytes should be returned but not cached."""
+        cache = ResultCache(max_entry_bytes=100)
+        result = {"grid": np.zeros((10, 10))}
+        assert cache.get_or_compute("k", lambda: result) is result
+        assert cache.stats()["size"] == 0
+        assert cache.get_or_compute("k", lambda: "recomputed") == "recomputed"
+
+
+class TestResultBytes:
+    """Tests for result_bytes function."""
+
+    def test_nested_results(self):
+        """Should add arrays' bytes and estimate lists of numbers."""
+        result = {"a": np.zeros(4), "b": [[1.0, 2.0], [3.0]], "c": 1.0}
+        assert result_bytes(result) == 32 + 3 * 32 + 32
@@ -0,0 +1,99 @@
+"""Tests for breakpoint encoding of axis results."""
+
+import numpy as np
+import pytest
+
+from salt_amt_api.models import EncodedAxisResponse
+from salt_amt_api.simulation.encoding import (
+    breakpoints,
+    decode_axis_result,
+    decode_series,
+    encode_axis_result,
+    encode_series,
+)
+
+
+def kinked(count: int = 101) -> list[float]:
+    """A tax-like curve: flat, then 10%, then 22% from index 60."""
+    x = np.arange(count, dtype=float) * 1000
+    return (np.maximum(x - 20000, 0) * 0.1 + np.maximum(x - 60000, 0) * 0.12).tolist()
+
+
+class TestBreakpoints:
+    """Tests for breakpoints function."""
+
+    def test_keeps_ends_and_kinks_only(self):
+        """Should keep the endpoints and each change of slope."""
+        assert breakpoints(kinked()) == [0, 20, 60, 100]
+
+    def test_short_series(self):
+        """Should keep every point of series with two or fewer."""
+        assert breakpoints([5.0]) == [0]
+        assert breakpoints([1.0, 2.0]) == [0, 1]
+
+    def test_tolerance_absorbs_noise(self):
+        """Noise within the tolerance should not add breakpoints."""
+        rng = np.random.default_rng(0)
+        values = np.array(kinked()) + rng.uniform(-0.01, 0.01, 101)
+        assert len(breakpoints(values, tolerance=0)) > 4
+        assert len(breakpoints(values, tolerance=0.05)) <= 6
+
+    def test_rejects_negative_tolerance(self):
+        """Should reject a negative tolerance."""
+        with pytest.raises(ValueError):
+            breakpoints([1.0, 2.0, 3.0], tolerance=-1)
+
+
+class TestEncodeSeries:
+    """Tests for encode_series and decode_series functions."""
+
+    @pytest.mark.parametrize("tolerance", [0, 0.5, 50])
+    def test_round_trip_within_tolerance(self, tolerance):
+        """Decoded values should be within tolerance of the originals."""
+        rng = np.random.default_rng(1)
+        values = np.cumsum(rng.choice([0.0, 1.0, 5.0], 300) * 10).tolist()
+        decoded = decode_series(encode_series(values, tolerance), len(values))
+        assert np.max(np.abs(np.array(decoded) - values)) <= tolerance + 1e-9
+
+    def test_breakpoints_are_exact(self):
+        """Kept points should decode to their original values."""
+        values = kinked()
+        series = encode_series(values, tolerance=1000)
+        decoded = decode_series(series, len(values))
+        assert [decoded[i] for i in series["index"]] == series["value"]
+
+
+class TestEncodeAxisResult:
+    """Tests for encode_axis_result and decode_axis_result functions."""
+
+    result = {
+        "axis_values": np.linspace(0, 100000, 101).tolist(),
+        "income_tax": kinked(),
+        "marginal_income_tax": [0.0] * 20 + [0.1] * 40 + [0.22] * 41,
+        "gap": None,
+        "years": [2026, 2027],
+        "yearly": {"income_tax": [kinked(), kinked()]},
+    }
+
+    def test_round_trip(self):
+        """Should rebuild every series, including per-year ones."""
+        encoded = encode_axis_result(self.result, tolerance=0.1)
+        decoded = decode_axis_result(encoded)
+        assert decoded["years"] == [2026, 2027]
+        assert "gap" not in decoded
+        for name in ["axis_values", "income_tax", "marginal_income_tax"]:
+            np.testing.assert_allclose(decoded[name], self.result[name], atol=0.1)
+        np.testing.assert_allclose(decoded["yearly"]["income_tax"][1], kinked())
+
+    def test_compresses_and_validates(self):
+        """Should keep a handful of points and match the response model."""
+        encoded = EncodedAxisResponse(**encode_axis_result(self.result, 0.1))
+        assert encoded.count == 101
+        assert encoded.series["axis_values"].index == [0, 100]
+        assert len(encoded.series["income_tax"].index) == 4
+
+    def test_rates_encoded_exactly(self):
+        """Rate series should ignore the dollar tolerance."""
+        encoded = encode_axis_result(self.result, tolerance=1)
+        decoded = decode_axis_result(encoded)
+        assert decoded["marginal_income_tax"] == self.result["marginal_income_tax"]
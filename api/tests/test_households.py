@@ -0,0 +1,23 @@
+"""Tests for sampling households."""
+
+import numpy as np
+
+from salt_amt_api.households import sample_household
+from salt_amt_api.models import HouseholdInput
+
+
+class TestSampleHousehold:
+    """Tests for sample_household function."""
+
+    def test_households_validate(self):
+        """Drawn households should be valid request households."""
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            household = sample_household(rng)
+            HouseholdInput(**household)
+            assert len(household["child_ages"]) == household["num_children"]
+
+    def test_deterministic(self):
+        """The same seed should draw the same households."""
+        first = sample_household(np.random.default_rng(3))
+        assert sample_household(np.random.default_rng(3)) == first
@@ -0,0 +1,117 @@
+"""Tests for the load-testing harness."""
+
+import sys
+import time
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+from salt_amt_api.loadtest import (
+    ENDPOINTS,
+    InProcessBackend,
+    generate_requests,
+    run,
+    run_closed_loop,
+    run_open_loop,
+    summarize,
+)
+
+
+def fake_backend(endpoint, body):
+    """Reply after 10ms, failing two-axes requests."""
+    time.sleep(0.01)
+    if endpoint == "two_axes":
+        raise RuntimeError("grid too large")
+
+
+class TestGenerateRequests:
+    """Tests for generate_requests function."""
+
+    def test_bodies_validate(self):
+        """Every body should be a valid request for its endpoint."""
+        requests = generate_requests(60, seed=1)
+        for endpoint, body in requests:
+            ENDPOINTS[endpoint][0](**body)
+        assert {endpoint for endpoint, _ in requests} >= {"single", "salt_axis"}
+        assert any("policy_config" in body for _, body in requests)
+        assert len({body["household"]["state_code"] for _, body in requests}) > 10
+
+    def test_deterministic(self):
+        """The same seed should give the same requests."""
+        assert generate_requests(5, seed=3) == generate_requests(5, seed=3)
+        assert generate_requests(5, seed=3) != generate_requests(5, seed=4)
+
+    def test_mix_and_scale(self):
+        """Should only draw endpoints in the mix, with scaled counts."""
+        requests = generate_requests(5, {"two_axes": 1}, count_scale=0.01)
+        assert {endpoint for endpoint, _ in requests} == {"two_axes"}
+        assert requests[0][1]["salt_count"] == 7
+        assert requests[0][1]["income_count"] == 14
+
+    def test_rejects_unknown_endpoint(self):
+        """Mixes may only name load-tested endpoints."""
+        with pytest.raises(ValueError):
+            generate_requests(5, {"tiles": 1})
+
+
+class TestRun:
+    """Tests for run_closed_loop, run_open_loop and run functions."""
+
+    def test_closed_loop(self):
+        """Should send every request and record failures."""
+        requests = [("single", {})] * 6 + [("two_axes", {})] * 2
+        samples = run_closed_loop(fake_backend, requests, concurrency=4)
+        assert len(samples) == 8
+        assert sum(s["error"] is not None for s in samples) == 2
+        assert min(s["latency"] for s in samples) >= 0.01
+
+    def test_open_loop(self):
+        """Should send requests without waiting for replies."""
+        start = time.perf_counter()
+        samples = run_open_loop(fake_backend, [("single", {})] * 20, rate=1000)
+        assert len(samples) == 20
+        # Twenty sequential replies would take at least 200ms
+        assert time.perf_counter() - start < 0.15
+
+    def test_report(self):
+        """Should summarize overall and per endpoint."""
+        requests = [("single", {})] * 3 + [("two_axes", {})]
+        report = run(fake_backend, requests, concurrency=2)
+        assert report["overall"]["requests"] == 4
+        assert report["overall"]["error_rate"] == 0.25
+        assert report["endpoints"]["two_axes"]["p50"] is None
+        assert report["errors"] == ["RuntimeError: grid too large"]
+
+    def test_requires_one_load_shape(self):
+        """Exactly one of concurrency and rate should be set."""
+        with pytest.raises(ValueError):
+            run(fake_backend, [], concurrency=2, rate=1.0)
+
+
+class TestSummarize:
+    """Tests for summarize function."""
+
+    def test_percentiles(self):
+        """Should report percentiles and throughput of successful replies."""
+        samples = [
+            {"endpoint": "single", "latency": latency / 100, "error": None}
+            for latency in range(1, 101)
+        ]
+        summary = summarize(samples, seconds=10)["overall"]
+        assert summary["p50"] == pytest.approx(0.505)
+        assert summary["p99"] == pytest.approx(0.9901)
+        assert summary["throughput"] == 10
+
+
+class TestInProcessBackend:
+    """Tests for InProcessBackend class."""
+
+    def test_calls_handler_locally(self, monkeypatch):
+        """Should call the endpoint's Modal function locally."""
+        calls = []
+        app = ModuleType("fake_modal_app")
+        app.calculate_single = SimpleNamespace(local=calls.append)
+        monkeypatch.setitem(sys.modules, "fake_modal_app", app)
+
+        InProcessBackend("fake_modal_app")("single", {"household": {}})
+        assert calls == [{"household": {}}]
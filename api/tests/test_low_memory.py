@@ -0,0 +1,103 @@
+"""Tests for the low-memory two-axes mode."""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+from salt_amt_api.simulation import calculation
+from salt_amt_api.simulation.calculation import calculate_two_axes
+
+HOUSEHOLD = dict(
+    is_married=False,
+    state_code="NY",
+    num_children=2,
+    child_ages=[4, 8],
+    qualified_dividend_income=0,
+    long_term_capital_gains=0,
+    short_term_capital_gains=0,
+    deductible_mortgage_interest=0,
+    charitable_cash_donations=0,
+)
+
+# Peak RSS growth allowed while calculating a 5,000-cell grid for a couple
+# without children in 1,250-cell chunks; simulated whole it grows about 150MB
+RSS_BUDGET_MB = float(os.environ.get("SALT_AMT_RSS_BUDGET_MB", 100))
+
+RSS_SCRIPT = textwrap.dedent("""
+    from salt_amt_api.simulation import calculation
+
+    # Read from /proc, as getrusage's peak survives exec from the test run
+    def status_mb(field):
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field):
+                    return int(line.split()[1]) / 1024
+
+    household = dict(
+        is_married=True,
+        state_code="NY",
+        num_children=0,
+        child_ages=[],
+        qualified_dividend_income=0,
+        long_term_capital_gains=0,
+        short_term_capital_gains=0,
+        deductible_mortgage_interest=0,
+        charitable_cash_donations=0,
+    )
+    calculation.LOW_MEMORY_CHUNK_CELLS = 1250
+    # Load parameters and the tax-benefit system before measuring
+    calculation.calculate_two_axes(
+        **household, salt_count=3, income_count=3, low_memory=True
+    )
+    before = status_mb("VmRSS")
+    calculation.calculate_two_axes(
+        **household, salt_count=100, income_count=50, low_memory=True
+    )
+    print(status_mb("VmHWM") - before)
+    """)
+
+
+class TestLowMemory:
+    """Tests for calculate_two_axes with low_memory."""
+
+    def test_matches_dense_grid(self, monkeypatch):
+        """Chunked float32 outputs should equal the list outputs."""
+        monkeypatch.setattr(calculation, "LOW_MEMORY_CHUNK_CELLS", 24)
+        kwargs = dict(HOUSEHOLD, salt_count=5, max_income=500000, income_count=8)
+        dense = calculate_two_axes(**kwargs)
+        compact = calculate_two_axes(**kwargs, low_memory=True)
+
+        assert compact.keys() == dense.keys()
+        assert compact["amt_binds"].dtype == bool
+        assert compact["income_tax"].dtype == np.float32
+        for name, values in dense.items():
+            np.testing.assert_array_equal(compact[name], values)
+
+    def test_multi_year_grid(self):
+        """Multi-year grids should keep per-year outputs as 2D arrays."""
+        kwargs = dict(HOUSEHOLD, salt_count=3, income_count=2, years=[2026, 2027])
+        dense = calculate_two_axes(**kwargs)
+        compact = calculate_two_axes(**kwargs, low_memory=True)
+
+        assert compact["yearly"]["amt"].shape == (2, 6)
+        for name, by_year in dense["yearly"].items():
+            np.testing.assert_array_equal(compact["yearly"][name], by_year)
+
+    @pytest.mark.skipif(
+        not sys.platform.startswith("linux"), reason="Reads /proc/self/status"
+    )
+    def test_peak_rss_within_budget(self):
+        """Peak memory growth should stay under RSS_BUDGET_MB."""
+        output = subprocess.run(
+            [sys.executable, "-c", RSS_SCRIPT],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.dirname(__file__)),
+        ).stdout
+        growth = float(output.split()[-1])
+        assert growth < RSS_BUDGET_MB, f"Peak RSS grew by {growth:.0f}MB"
@@ -0,0 +1,117 @@
+"""Tests for per-request memory instrumentation."""
+
+import threading
+import tracemalloc
+
+from salt_amt_api.models import MemoryReport
+from salt_amt_api.simulation import memory
+from salt_amt_api.simulation.calculation import calculate_single_point
+from salt_amt_api.simulation.memory import (
+    MemoryMonitor,
+    memory_stats,
+    record_memory,
+    stage,
+)
+
+MB = 1024 * 1024
+
+
+class TestMemoryMonitor:
+    """Tests for MemoryMonitor class."""
+
+    def test_stages(self):
+        """Should attribute allocations to the stage that made them."""
+        with MemoryMonitor() as monitor:
+            with stage("allocate"):
+                kept = bytearray(4 * MB)
+            with stage("temporary"):
+                bytearray(8 * MB)
+        report = monitor.report()
+
+        assert report["stages"]["allocate"]["allocated_bytes"] > 3 * MB
+        assert report["stages"]["temporary"]["allocated_bytes"] < MB
+        assert report["stages"]["temporary"]["peak_bytes"] > 7 * MB
+        assert report["traced_peak_bytes"] > 11 * MB
+        assert report["top_allocations"][0]["site"].startswith(__file__)
+        assert report["peak_rss_bytes"] > 0
+        MemoryReport(**report)
+        del kept
+
+    def test_simulation_stages(self):
+        """Should mark simulation init and each top-level calculate."""
+        with MemoryMonitor(top=3) as monitor:
+            calculate_single_point(
+                is_married=False,
+                state_code="CA",
+                num_children=0,
+                child_ages=[],
+                qualified_dividend_income=0,
+                long_term_capital_gains=0,
+                short_term_capital_gains=0,
+                deductible_mortgage_interest=0,
+                charitable_cash_donations=0,
+                real_estate_taxes=10000,
+                employment_income=100000,
+            )
+        stages = monitor.report()["stages"]
+
+        assert stages["simulation init"]["calls"] >= 1
+        assert "calculate income_tax" in stages
+        # Formulas calculating their inputs belong to the outer call
+        assert "calculate adjusted_gross_income" not in stages
+        assert len(monitor.top_allocations) <= 3
+
+    def test_concurrent_monitors(self):
+        """Monitors in other threads should wait rather than stop tracing."""
+        entered = threading.Event()
+        release = threading.Event()
+        errors = []
+
+        def first():
+            with MemoryMonitor():
+                entered.set()
+                release.wait(5)
+
+        def second():
+            try:
+                with MemoryMonitor() as monitor:
+                    bytearray(MB)
+                monitor.report()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=first), threading.Thread(target=second)]
+        threads[0].start()
+        entered.wait(5)
+        threads[1].start()
+        release.set()
+        for thread in threads:
+            thread.join(10)
+        assert errors == []
+        assert not tracemalloc.is_tracing()
+
+
+class TestStage:
+    """Tests for stage function."""
+
+    def test_inactive(self):
+        """Should run the block without a monitor."""
+        with stage("anything"):
+            value = 1
+        assert value == 1
+
+
+class TestMemoryMetrics:
+    """Tests for record_memory and memory_stats functions."""
+
+    def test_record(self, monkeypatch):
+        """Should count each report in the endpoint's histograms."""
+        monkeypatch.setattr(memory, "_metrics", {})
+        report = {"peak_rss_bytes": 100 * MB, "traced_peak_bytes": 10 * MB}
+        record_memory("single", report)
+        record_memory("single", report)
+
+        stats = memory_stats()["single"]
+        assert stats["peak_rss_bytes"]["count"] == 2
+        assert stats["peak_rss_bytes"]["sum"] == 200 * MB
+        assert stats["traced_peak_bytes"]["counts"][0] == 2
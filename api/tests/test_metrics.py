@@ -0,0 +1,41 @@
+"""Tests for the in-process metrics."""
+
+from salt_amt_api.metrics import Counter, Gauge, Histogram
+
+
+class TestHistogram:
+    """Tests for Histogram class."""
+
+    def test_counts_into_buckets(self):
+        """Should count each value in the first bucket bounding it."""
+        histogram = Histogram((1, 4, 16))
+        for value in [1, 2, 4, 5, 100]:
+            histogram.observe(value)
+        snapshot = histogram.snapshot()
+        assert snapshot["counts"] == [1, 2, 1, 1]
+        assert snapshot["count"] == 5
+        assert snapshot["sum"] == 112
+
+
+class TestCounter:
+    """Tests for Counter class."""
+
+    def test_increments(self):
+        """Should add one by default and the given amount otherwise."""
+        counter = Counter()
+        counter.inc()
+        counter.inc(2.5)
+        assert counter.value == 3.5
+
+
+class TestGauge:
+    """Tests for Gauge class."""
+
+    def test_up_and_down(self):
+        """Should track increments, decrements and sets."""
+        gauge = Gauge()
+        gauge.inc(3)
+        gauge.dec()
+        assert gauge.value == 2
+        gauge.set(0.5)
+        assert gauge.value == 0.5
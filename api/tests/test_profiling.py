@@ -0,0 +1,80 @@
+"""Tests for variable-level profiling."""
+
+from types import SimpleNamespace
+
+from policyengine_core.tracers import TraceNode
+from salt_amt_api.simulation.calculation import _create_tax_benefit_system
+from salt_amt_api.simulation.profiling import VariableProfiler, profiling, track
+
+
+def make_profiler() -> VariableProfiler:
+    """A profiler over one trace: income_tax calls agi twice and amt once."""
+    root = TraceNode("income_tax", "2026", start=0.0, end=1.0)
+    for name, start, end in [("agi", 0.1, 0.3), ("amt", 0.3, 0.7), ("agi", 0.7, 0.8)]:
+        root.append_child(TraceNode(name, "2026", parent=root, start=start, end=end))
+    profiler = VariableProfiler()
+    profiler.simulations.append(SimpleNamespace(tracer=SimpleNamespace(trees=[root])))
+    return profiler
+
+
+class TestVariableProfiler:
+    """Tests for VariableProfiler class."""
+
+    def test_stats(self):
+        """Should count calls and split inclusive and self time."""
+        stats = make_profiler().stats()
+        assert stats[("agi", "2026")]["calls"] == 2
+        assert round(stats[("agi", "2026")]["seconds"], 6) == 0.3
+        assert round(stats[("income_tax", "2026")]["seconds"], 6) == 1.0
+        assert round(stats[("income_tax", "2026")]["self_seconds"], 6) == 0.3
+
+    def test_report_sorted_by_self_time(self):
+        """Should list the slowest variable first."""
+        lines = make_profiler().report().splitlines()
+        assert lines[2].endswith("amt [2026]")
+        assert len(lines) == 5
+
+    def test_folded_stacks(self):
+        """Should merge identical stacks and report microseconds."""
+        folded = make_profiler().folded_stacks().splitlines()
+        assert "income_tax[2026];agi[2026] 300000" in folded
+        assert "income_tax[2026] 300000" in folded
+        assert len(folded) == 3
+
+    def test_write(self, tmp_path):
+        """Should write the report and folded stacks."""
+        report, folded = make_profiler().write(str(tmp_path), "request")
+        assert open(report).read().startswith("Profiled 1 simulation")
+        assert open(folded).read().count("\n") == 3
+
+
+class TestTrack:
+    """Tests for track function."""
+
+    def test_inactive(self):
+        """Should leave simulations untouched without an active profiler."""
+        simulation = SimpleNamespace(trace=False)
+        assert track(simulation) is simulation
+        assert not simulation.trace
+
+    def test_active(self):
+        """Should enable tracing and register the simulation."""
+        simulation = SimpleNamespace(trace=False)
+        with VariableProfiler() as profiler:
+            assert profiling()
+            track(simulation)
+        assert simulation.trace
+        assert profiler.simulations == [simulation]
+        assert not profiling()
+
+
+class TestPrivateSystem:
+    """Tests for the tax-benefit systems of profiled simulations."""
+
+    def test_profiled_system_not_shared(self):
+        """Profiled requests should not trace the shared system."""
+        shared = _create_tax_benefit_system("Current Law")
+        with VariableProfiler():
+            private = _create_tax_benefit_system("Current Law")
+        assert private is not shared
+        assert _create_tax_benefit_system("Current Law") is shared
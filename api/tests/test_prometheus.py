@@ -0,0 +1,214 @@
+"""Tests for the Prometheus metrics exposition."""
+
+import pytest
+
+from salt_amt_api import prometheus
+from salt_amt_api.metrics import Histogram
+from salt_amt_api.prometheus import (
+    collect,
+    merge_snapshots,
+    observe_request,
+    render,
+    render_metrics,
+    retire_snapshots,
+)
+from salt_amt_api.simulation import calculation
+from salt_amt_api.simulation.calculation import calculate_households, simulation_stats
+from salt_amt_api.simulation.dedup import ResultCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics(monkeypatch):
+    """Start each test with no recorded requests."""
+    monkeypatch.setattr(prometheus, "_requests", {})
+    monkeypatch.setattr(prometheus, "_request_seconds", {})
+    monkeypatch.setattr(prometheus, "_in_flight", {})
+
+
+def histogram(*values) -> dict:
+    """Snapshot a histogram with bounds 1 and 10 after observing ``values``."""
+    h = Histogram((1, 10))
+    for value in values:
+        h.observe(value)
+    return h.snapshot()
+
+
+def snapshot(time, requests, in_flight, ready=1.0, latencies=()) -> dict:
+    """A published snapshot of one container."""
+    return {
+        "time": time,
+        "families": {
+            "salt_amt_requests_total": {
+                "type": "counter",
+                "help": "Requests.",
+                "samples": [[{"endpoint": "single", "status": "ok"}, requests]],
+            },
+            "salt_amt_requests_in_flight": {
+                "type": "gauge",
+                "help": "In flight.",
+                "samples": [[{"endpoint": "single"}, in_flight]],
+            },
+            "salt_amt_ready": {
+                "type": "gauge",
+                "help": "Ready.",
+                "samples": [[{}, ready]],
+                "merge": "max",
+            },
+            "salt_amt_request_duration_seconds": {
+                "type": "histogram",
+                "help": "Latency.",
+                "samples": [[{"endpoint": "single"}, histogram(*latencies)]],
+            },
+        },
+    }
+
+
+def samples(families: dict, name: str) -> list:
+    """Return the sample values of a metric family."""
+    return [value for _, value in families[name]["samples"]]
+
+
+class TestObserveRequest:
+    """Tests for observe_request function."""
+
+    def test_counts_and_in_flight(self):
+        """Should count requests by status and track them in flight."""
+        with observe_request("single"):
+            assert prometheus._in_flight["single"].value == 1
+        with pytest.raises(ValueError):
+            with observe_request("single"):
+                raise ValueError("bad request")
+
+        families = collect()["families"]
+        statuses = {
+            labels["status"]: value
+            for labels, value in families["salt_amt_requests_total"]["samples"]
+        }
+        assert statuses == {"ok": 1, "error": 1}
+        assert samples(families, "salt_amt_requests_in_flight") == [0]
+        [latency] = samples(families, "salt_amt_request_duration_seconds")
+        assert latency["count"] == 2
+        assert samples(families, "salt_amt_ready") == [1.0]
+
+    def test_cache(self):
+        """Should report result-cache lookups when given the cache."""
+        cache = ResultCache()
+        cache.get_or_compute("key", lambda: 1)
+        cache.get_or_compute("key", lambda: 1)
+        families = collect(cache)["families"]
+        assert samples(families, "salt_amt_result_cache_requests_total") == [1, 0, 1]
+        assert "salt_amt_result_cache_requests_total" not in collect()["families"]
+
+
+class TestSimulationStats:
+    """Tests for simulation_stats function."""
+
+    def test_counts_households(self, monkeypatch):
+        """Should count simulations and households by kind."""
+        monkeypatch.setattr(calculation, "simulation_counts", {})
+        monkeypatch.setattr(calculation, "household_counts", {})
+        household = dict(
+            state_code="TX",
+            is_married=False,
+            num_children=0,
+            child_ages=[],
+            qualified_dividend_income=0,
+            long_term_capital_gains=0,
+            short_term_capital_gains=0,
+            deductible_mortgage_interest=0,
+            charitable_cash_donations=0,
+            real_estate_taxes=0,
+        )
+        households = [
+            dict(household, employment_income=income) for income in (1e4, 1e5, 1e6)
+        ]
+        calculate_households(households)
+        assert simulation_stats() == {"single": {"simulations": 1, "households": 3}}
+
+
+class TestMerge:
+    """Tests for merge_snapshots and render_metrics functions."""
+
+    def test_sums_across_containers(self):
+        """Should sum counters, histograms and fresh gauges."""
+        families = merge_snapshots(
+            [
+                snapshot(100, requests=2, in_flight=1, latencies=[0.5]),
+                snapshot(110, requests=3, in_flight=2, latencies=[5, 20]),
+            ],
+            now=120,
+        )
+        assert samples(families, "salt_amt_requests_total") == [5]
+        assert samples(families, "salt_amt_requests_in_flight") == [3]
+        assert samples(families, "salt_amt_ready") == [1.0]
+        [latency] = samples(families, "salt_amt_request_duration_seconds")
+        assert latency["counts"] == [1, 1, 1]
+        assert latency["count"] == 3
+
+    def test_stale_gauges(self):
+        """Should keep counters but drop gauges of containers gone quiet."""
+        families = merge_snapshots(
+            [
+                snapshot(0, requests=2, in_flight=4),
+                snapshot(500, requests=1, in_flight=0, ready=0.0),
+            ],
+            now=520,
+        )
+        assert samples(families, "salt_amt_requests_total") == [3]
+        assert samples(families, "salt_amt_requests_in_flight") == [0]
+        assert samples(families, "salt_amt_ready") == [0.0]
+
+    def test_retires_stopped_containers(self):
+        """Snapshots gone quiet should fold into the retired snapshot."""
+        snapshots = {
+            "a": snapshot(0, requests=2, in_flight=4, latencies=[0.5]),
+            "b": snapshot(1000, requests=1, in_flight=1),
+            "retired": {
+                "time": 0,
+                "families": {
+                    "salt_amt_requests_total": snapshot(0, 5, 0)["families"][
+                        "salt_amt_requests_total"
+                    ]
+                },
+            },
+        }
+        retired, stale = retire_snapshots(snapshots, now=1010)
+        assert stale == ["a"]
+        assert samples(retired["families"], "salt_amt_requests_total") == [7]
+        assert "salt_amt_requests_in_flight" not in retired["families"]
+        [latency] = samples(retired["families"], "salt_amt_request_duration_seconds")
+        assert latency["count"] == 1
+
+        families = merge_snapshots([snapshots["b"], retired], now=1010)
+        assert samples(families, "salt_amt_requests_total") == [8]
+        assert samples(families, "salt_amt_requests_in_flight") == [1]
+        assert retire_snapshots({"b": snapshots["b"]}, now=1010) == (None, [])
+
+    def test_not_ready_without_containers(self):
+        """Should report not ready when no container has published."""
+        assert "salt_amt_ready 0.0" in render_metrics([], now=0).splitlines()
+
+
+class TestRender:
+    """Tests for render function."""
+
+    def test_text_format(self):
+        """Should write cumulative buckets and escape label values."""
+        text = render(
+            {
+                "latency": {
+                    "type": "histogram",
+                    "help": "Latency.",
+                    "samples": [[{"endpoint": 'a"b'}, histogram(0.5, 5, 20)]],
+                }
+            }
+        )
+        assert text.splitlines() == [
+            "# HELP latency Latency.",
+            "# TYPE latency histogram",
+            'latency_bucket{endpoint="a\\"b",le="1.0"} 1',
+            'latency_bucket{endpoint="a\\"b",le="10.0"} 2',
+            'latency_bucket{endpoint="a\\"b",le="+Inf"} 3',
+            'latency_sum{endpoint="a\\"b"} 25.5',
+            'latency_count{endpoint="a\\"b"} 3',
+        ]
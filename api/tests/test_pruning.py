@@ -0,0 +1,51 @@
+"""Tests for pruning of programs that cannot affect the outputs."""
+
+from salt_amt_api.simulation.calculation import calculate_two_axes
+from salt_amt_api.simulation.pruning import _state_of, pruned_variables
+
+OUTPUTS = ("amt_base_tax", "income_tax", "salt_deduction")
+
+
+class TestStateOf:
+    """Tests for _state_of function."""
+
+    def test_state_variable(self):
+        """Should read the state code from a state program's module."""
+        assert _state_of("gov.states.al.dhs.tanf.al_tanf") == "AL"
+
+    def test_federal_variable(self):
+        """Should return None outside gov.states."""
+        assert _state_of("gov.irs.income.amt.amt_base_tax") is None
+
+    def test_state_wide_module(self):
+        """Should not treat shared gov.states modules as a state."""
+        assert _state_of("gov.states.tax.income.state_income_tax") is None
+
+
+class TestPrunedVariables:
+    """Tests for pruned_variables function."""
+
+    def test_pins_other_states_programs_only(self):
+        """Should pin other states' TANF but keep the household's own."""
+        names = pruned_variables(OUTPUTS, "NY")
+        assert "al_tanf" in names
+        assert "ny_tanf" not in names
+        assert "medicare_part_b_premium" in names
+
+    def test_pruned_grid_matches_unpruned(self):
+        """Pruned and unpruned runs should give identical outputs."""
+        kwargs = dict(
+            is_married=False,
+            state_code="NY",
+            num_children=2,
+            child_ages=[4, 8],
+            qualified_dividend_income=0,
+            long_term_capital_gains=0,
+            short_term_capital_gains=0,
+            deductible_mortgage_interest=0,
+            charitable_cash_donations=0,
+            salt_count=5,
+            max_income=500000,
+            income_count=8,
+        )
+        assert calculate_two_axes(**kwargs, prune=True) == calculate_two_axes(**kwargs)
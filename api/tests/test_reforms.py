@@ -1,12 +1,19 @@
 """Tests for reform parameter generation."""
 
 import pytest
+from types import SimpleNamespace
 import numpy as np
 from salt_amt_api.simulation.reforms import (
     PolicyReforms,
     get_reform_params_from_config,
     CURRENT_POLICY_PARAMS,
+    enumerate_policy_configs,
+    reform_params_key,
+    minimal_reform_dict,
+    canonical_scenario,
+    scenario_key,
 )
+from salt_amt_api.models import PolicyConfig
 
 
 class TestGetReformParamsFromConfig:
@@ -131,3 +138,143 @@ class TestPolicyReforms:
 
         # TCJA adds many more parameters
         assert len(reform_with) > len(reform_without)
+
+
+class TestEnumeratePolicyConfigs:
+    """Tests for enumerate_policy_configs and reform_params_key."""
+
+    def test_configs_are_valid_and_distinct(self):
+        """Every enumerated config should be a distinct valid PolicyConfig."""
+        configs = enumerate_policy_configs()
+        assert len({tuple(c.items()) for c in configs}) == len(configs)
+        for config in configs:
+            PolicyConfig(**config)
+
+    def test_equivalent_configs_share_key(self):
+        """Configs that only differ in unused options should dedupe."""
+        base = {"salt_cap": "$15k"}
+        other = {
+            **base,
+            "amt_phaseout": "Current Policy ($639,300 Single, $1,278,575 Joint)",
+        }
+        assert reform_params_key(
+            get_reform_params_from_config(base)
+        ) == reform_params_key(get_reform_params_from_config(other))
+
+    def test_different_configs_have_different_keys(self):
+        """Configs with different reform params should not dedupe."""
+        keys = {
+            reform_params_key(get_reform_params_from_config({"salt_cap": cap}))
+            for cap in ["$15k", "$100k", "Current Law (Uncapped)"]
+        }
+        assert len(keys) == 3
+
+    def test_enumeration_dedupes(self):
+        """The full enumeration should collapse to fewer distinct reforms."""
+        configs = enumerate_policy_configs()
+        keys = {reform_params_key(get_reform_params_from_config(c)) for c in configs}
+        assert 1 < len(keys) < len(configs)
+
+
+class FakeParameter:
+    """A leaf parameter with dated values, as in the baseline tree."""
+
+    def __init__(self, values: dict):
+        self.values_list = [
+            SimpleNamespace(instant_str=instant, value=value)
+            for instant, value in sorted(values.items(), reverse=True)
+        ]
+
+    def __call__(self, instant: str):
+        return next(
+            entry.value for entry in self.values_list if entry.instant_str <= instant
+        )
+
+
+class FakeParameters:
+    """A parameter tree holding FakeParameter leaves by path."""
+
+    def __init__(self, leaves: dict):
+        self.leaves = leaves
+
+    def get_child(self, path: str):
+        if path not in self.leaves:
+            raise ValueError(f"Unknown parameter {path}")
+        return self.leaves[path]
+
+
+class TestMinimalReformDict:
+    """Tests for minimal_reform_dict function."""
+
+    parameters = FakeParameters(
+        {
+            "cap": FakeParameter({"2018-01-01": 10000, "2026-01-01": 40000}),
+            "rate": FakeParameter({"2018-01-01": 0.26}),
+        }
+    )
+
+    def test_drops_unchanged_entries(self):
+        """Should keep only entries that change a baseline value."""
+        reform = {
+            "cap": {"2026-01-01.2100-12-31": 40000},
+            "rate": {"2026-01-01.2100-12-31": 0.28},
+        }
+        assert minimal_reform_dict(reform, self.parameters) == {
+            "rate": {"2026-01-01.2100-12-31": 0.28}
+        }
+
+    def test_baseline_change_within_period(self):
+        """Should keep an entry the baseline departs from during its period."""
+        reform = {"cap": {"2020-01-01.2100-12-31": 10000}}
+        assert minimal_reform_dict(reform, self.parameters) == reform
+
+    def test_single_year_period(self):
+        """Should read a bare year as that calendar year."""
+        reform = {"cap": {"2025": 10000}}
+        assert minimal_reform_dict(reform, self.parameters) == {}
+
+    def test_unknown_parameter_kept(self):
+        """Should keep entries whose parameter is not in the tree."""
+        reform = {"missing": {"2026-01-01.2100-12-31": 1}}
+        assert minimal_reform_dict(reform, self.parameters) == reform
+
+
+class TestCanonicalScenario:
+    """Tests for canonical_scenario and scenario_key functions."""
+
+    def test_baseline_ignored_with_reform_params(self):
+        """A policy config should give one key under either baseline."""
+        params = get_reform_params_from_config({"salt_cap": "$15k"})
+        assert scenario_key("Current Law", params) == scenario_key(
+            "Current Policy", params
+        )
+
+    def test_current_policy_baseline_as_params(self):
+        """The Current Policy baseline should equal its params."""
+        assert scenario_key("Current Policy") == scenario_key(
+            "Current Law", CURRENT_POLICY_PARAMS
+        )
+        assert scenario_key("Current Law") != scenario_key("Current Policy")
+
+    def test_disabled_phase_out_settings_ignored(self):
+        """Phase-out settings should not matter while it is disabled."""
+        params = dict(CURRENT_POLICY_PARAMS, salt_phase_out_rate=0.1)
+        assert scenario_key("Current Law", params) == scenario_key("Current Policy")
+        enabled = dict(params, salt_phase_out_enabled=True)
+        assert scenario_key("Current Law", enabled) != scenario_key("Current Policy")
+
+    def test_drops_unused_fields_and_normalizes_numbers(self):
+        """Unused fields should be dropped and numbers made floats."""
+        params = get_reform_params_from_config({"amt_repealed": True})
+        _, canonical = canonical_scenario("Current Law", params)
+        assert "amt_phase_out_rate" not in canonical
+        assert canonical["salt_caps"]["JOINT"] == float("inf")
+        assert canonical["amt_exemptions"]["JOINT"] == float("inf")
+        assert scenario_key("Current Law", canonical) == scenario_key(
+            "Current Law", params
+        )
+
+    def test_invalid_baseline(self):
+        """Should reject unknown baseline scenarios without params."""
+        with pytest.raises(ValueError):
+            canonical_scenario("Future Law")
@@ -0,0 +1,86 @@
+"""Tests for AMT screening bounds."""
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from salt_amt_api.models import TwoAxesRequest
+from salt_amt_api.simulation.calculation import calculate_two_axes
+from salt_amt_api.simulation.screening import amt_cannot_bind, amti_upper_bound
+
+
+class TestAmtiUpperBound:
+    """Tests for amti_upper_bound function."""
+
+    def test_gross_income_dominates(self):
+        """Should use gross income when it exceeds the add-backs."""
+        bound = amti_upper_bound(np.array([200000.0]), np.array([10000.0]), 30000, 0)
+        assert bound[0] == 200000
+
+    def test_add_backs_can_exceed_income(self):
+        """SALT above income should raise the bound past gross income."""
+        bound = amti_upper_bound(np.array([80000.0]), np.array([120000.0]), 30000, 5000)
+        assert bound[0] == 125000
+
+    def test_standard_deduction_when_salt_is_small(self):
+        """Negative or small SALT should fall back to the standard deduction."""
+        bound = amti_upper_bound(np.array([0.0]), np.array([-50000.0]), 30000, 0)
+        assert bound[0] == 30000
+
+
+class TestAmtCannotBind:
+    """Tests for amt_cannot_bind function."""
+
+    def test_below_exemption(self):
+        """Should screen bounds at or below the exemption."""
+        screened = amt_cannot_bind(np.array([0, 100000, 140000]), 140000, 1e6, 0.5)
+        assert screened.tolist() == [True, True, True]
+
+    def test_above_exemption(self):
+        """Should not screen bounds above the exemption."""
+        assert not amt_cannot_bind(np.array([140001]), 140000, 1e6, 0.5)[0]
+
+    def test_phase_out_shrinks_exemption(self):
+        """The phase-out should be applied before comparing."""
+        # Exemption 100k, fully phased out from 100k at a 100% rate
+        assert not amt_cannot_bind(np.array([60000]), 100000, 10000, 1.0)[0]
+        assert amt_cannot_bind(np.array([50000]), 100000, 50000, 1.0)[0]
+
+    def test_repealed_amt_screens_everything(self):
+        """An infinite exemption should screen every bound."""
+        assert amt_cannot_bind(np.array([1e9]), np.inf, np.inf, 0.5)[0]
+
+
+class TestScreenGridPoints:
+    """Tests for screen_grid_points function."""
+
+    @pytest.mark.parametrize("baseline_scenario", ["Current Law", "Current Policy"])
+    def test_screened_cells_have_no_amt(self, baseline_scenario):
+        """A real grid should have no AMT in any cell the screen rules out."""
+        result = calculate_two_axes(
+            is_married=True,
+            state_code="NY",
+            num_children=2,
+            child_ages=[4, 8],
+            qualified_dividend_income=0,
+            long_term_capital_gains=0,
+            short_term_capital_gains=0,
+            deductible_mortgage_interest=0,
+            charitable_cash_donations=0,
+            salt_count=6,
+            max_income=1000000,
+            income_count=11,
+            amt_screening=True,
+            verify_amt_screening=True,
+            baseline_scenario=baseline_scenario,
+        )
+        assert 0 < result["amt_screened_cells"] < 66
+        assert result["amt_misclassified_cells"] == []
+
+    def test_requests_validated(self):
+        """Requests should not combine AMT screening with years."""
+        household = {"state_code": "NY"}
+        TwoAxesRequest(household=household, amt_screening=True)
+        TwoAxesRequest(household=household, years=[2026, 2027])
+        with pytest.raises(ValidationError, match="2026 grid"):
+            TwoAxesRequest(household=household, amt_screening=True, years=[2027])
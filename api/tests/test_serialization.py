@@ -0,0 +1,204 @@
+"""Tests for trusted-output serialization and the response contracts."""
+
+import json
+from typing import Optional
+
+import numpy as np
+import pytest
+from pydantic import BaseModel, Field
+
+from salt_amt_api import serialization
+from salt_amt_api.models import (
+    AllStatesResponse,
+    AxisResponse,
+    EncodedAxisResponse,
+    SensitivityResponse,
+    SinglePointResponse,
+    TwoAxesResponse,
+)
+from salt_amt_api.serialization import (
+    _validated_body,
+    add_fields,
+    dumps,
+    encode_response,
+    response_payload,
+)
+from salt_amt_api.simulation.calculation import (
+    calculate_all_states,
+    calculate_income_axis,
+    calculate_salt_axis,
+    calculate_sensitivity,
+    calculate_single_point,
+    calculate_two_axes,
+)
+from salt_amt_api.simulation.encoding import encode_axis_result
+
+HOUSEHOLD = dict(
+    is_married=True,
+    num_children=1,
+    child_ages=[6],
+    qualified_dividend_income=0,
+    long_term_capital_gains=0,
+    short_term_capital_gains=0,
+    deductible_mortgage_interest=0,
+    charitable_cash_donations=0,
+)
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    """Run a test with each encoder available."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+    return request.param
+
+
+class Result(BaseModel):
+    """A response model with required, optional and factory fields."""
+
+    values: list[float]
+    note: Optional[str] = None
+    tags: list[str] = Field(default_factory=list)
+
+
+def as_lists(value):
+    """Return a result with NumPy arrays as lists, as the models accept."""
+    if isinstance(value, dict):
+        return {name: as_lists(item) for name, item in value.items()}
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
+
+
+def assert_close(actual, expected):
+    """Compare decoded JSON, allowing float32 values their precision."""
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys()
+        for name in expected:
+            assert_close(actual[name], expected[name])
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected)
+        for a, e in zip(actual, expected):
+            assert_close(a, e)
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, rel=1e-6)
+    else:
+        assert actual == expected
+
+
+def assert_contract(model, result):
+    """A result should validate as ``model`` and encode as its dump would."""
+    assert set(result) <= set(model.model_fields)
+    expected = json.loads(_validated_body(model, as_lists(result)))
+    assert_close(json.loads(encode_response(model, result)), expected)
+
+
+class TestDumps:
+    """Tests for dumps function."""
+
+    def test_numpy_values(self, encoder):
+        """Should encode arrays, including non-contiguous ones, and scalars."""
+        grid = np.arange(6, dtype=np.float64).reshape(2, 3)
+        value = {
+            "rows": grid,
+            "column": grid[:, 1],
+            "binds": np.array([True, False]),
+            "total": np.float64(2.5),
+        }
+        assert json.loads(dumps(value)) == {
+            "rows": [[0, 1, 2], [3, 4, 5]],
+            "column": [1, 4],
+            "binds": [True, False],
+            "total": 2.5,
+        }
+
+    def test_float32(self, encoder):
+        """Should keep float32 values to their precision."""
+        decoded = json.loads(dumps(np.array([0.1, 1e6], dtype=np.float32)))
+        assert decoded == pytest.approx([0.1, 1e6], rel=1e-6)
+
+    def test_rejects_other_objects(self, encoder):
+        """Should not encode arbitrary objects."""
+        with pytest.raises(TypeError):
+            dumps({"value": object()})
+
+
+class TestResponsePayload:
+    """Tests for response_payload and add_fields functions."""
+
+    def test_defaults_and_extra_fields(self):
+        """Should fill in defaults and drop fields the model lacks."""
+        payload = response_payload(Result, {"debug": True, "values": [1.0]})
+        assert payload == {"values": [1.0], "note": None, "tags": []}
+        assert list(payload) == list(Result.model_fields)
+
+    def test_missing_field(self):
+        """Should reject results without a required field."""
+        with pytest.raises(ValueError):
+            response_payload(Result, {"note": "empty"})
+
+    def test_add_fields(self):
+        """Should add fields to an encoded object."""
+        body = add_fields(dumps({"a": 1}), {"memory": {"peak": 2}})
+        assert json.loads(body) == {"a": 1, "memory": {"peak": 2}}
+        assert json.loads(add_fields(b"{}", {"b": 2})) == {"b": 2}
+        assert add_fields(b'{"a":1}', {}) == b'{"a":1}'
+
+
+class TestContracts:
+    """Calculation outputs against the response models they are sent as."""
+
+    def test_single_point(self):
+        """Single-point results should match SinglePointResponse."""
+        result = calculate_single_point(
+            **HOUSEHOLD,
+            state_code="NY",
+            real_estate_taxes=20000,
+            employment_income=250000,
+        )
+        assert_contract(SinglePointResponse, result)
+
+    def test_sensitivity(self):
+        """Sensitivity results should match SensitivityResponse."""
+        result = calculate_sensitivity(
+            **HOUSEHOLD,
+            state_code="NY",
+            real_estate_taxes=20000,
+            employment_income=250000,
+        )
+        assert_contract(SensitivityResponse, result)
+
+    def test_axes(self):
+        """Axis results, plain and encoded, should match their responses."""
+        salt = calculate_salt_axis(
+            **HOUSEHOLD,
+            state_code="NJ",
+            employment_income=300000,
+            count=5,
+            marginal_rates=True,
+        )
+        assert_contract(AxisResponse, salt)
+        assert_contract(EncodedAxisResponse, encode_axis_result(salt, 1.0))
+
+        income = calculate_income_axis(
+            **HOUSEHOLD, state_code="NJ", count=4, years=[2026, 2027]
+        )
+        assert_contract(AxisResponse, income)
+
+    def test_two_axes(self):
+        """Dense and low-memory grids should match TwoAxesResponse."""
+        kwargs = dict(HOUSEHOLD, state_code="CA", salt_count=3, income_count=2)
+        assert_contract(TwoAxesResponse, calculate_two_axes(**kwargs))
+        assert_contract(TwoAxesResponse, calculate_two_axes(**kwargs, low_memory=True))
+
+    def test_all_states(self):
+        """All-states results should match AllStatesResponse."""
+        result = calculate_all_states(
+            **HOUSEHOLD,
+            employment_income=200000,
+            real_estate_taxes=15000,
+            state_codes=["NY", "TX"],
+        )
+        assert_contract(AllStatesResponse, result)
@@ -1,11 +1,24 @@
 """Tests for situation builders."""
 
 import pytest
+from pydantic import ValidationError
+
+from salt_amt_api.models import (
+    AllStatesRequest,
+    IncomeAxisRequest,
+    SaltAxisRequest,
+    SinglePointRequest,
+    TwoAxesRequest,
+)
 from salt_amt_api.simulation.situation import (
     create_situation_without_axes,
     create_situation_with_one_property_tax_axes,
     create_situation_with_one_income_axes,
     create_situation_with_two_axes,
+    combine_situations,
+    add_perturbed_copy,
+    expand_years,
+    STATE_CODES,
 )
 
 
@@ -203,3 +216,199 @@ class TestCreateSituationWithTwoAxes:
         assert len(situation["axes"]) == 2
         assert situation["axes"][0][0]["name"] == "reported_salt"
         assert situation["axes"][1][0]["name"] == "employment_income"
+
+
+class TestCombineSituations:
+    """Tests for combine_situations function."""
+
+    def _salt_axis_situation(self, is_married=False, **kwargs):
+        return create_situation_with_one_property_tax_axes(
+            is_married=is_married,
+            state_code="CA",
+            num_children=0,
+            child_ages=[],
+            qualified_dividend_income=0,
+            long_term_capital_gains=0,
+            short_term_capital_gains=0,
+            deductible_mortgage_interest=0,
+            charitable_cash_donations=0,
+            employment_income=100000,
+            **kwargs,
+        )
+
+    def test_prefixes_entity_ids_and_members(self):
+        """Entities from each source should get unique, consistent ids."""
+        combined = combine_situations(
+            [self._salt_axis_situation(), self._salt_axis_situation()]
+        )
+
+        assert list(combined["people"]) == ["household_0/you", "household_1/you"]
+        assert combined["tax_units"]["household_1/your tax unit"]["members"] == [
+            "household_1/you"
+        ]
+
+    def test_merges_axes_as_parallel_with_offset_index(self):
+        """Each source's axis should point at its own tax unit."""
+        combined = combine_situations(
+            [
+                self._salt_axis_situation(is_married=True),
+                self._salt_axis_situation(min_salt=5, max_salt=10),
+            ]
+        )
+
+        assert len(combined["axes"]) == 1
+        first, second = combined["axes"][0]
+        assert first["index"] == 0
+        assert second["index"] == 1
+        assert second["min"] == 5
+
+    def test_rejects_mismatched_axes(self):
+        """Sources with different axes shapes cannot be merged."""
+        with pytest.raises(ValueError):
+            combine_situations(
+                [self._salt_axis_situation(), self._salt_axis_situation(count=10)]
+            )
+
+
+class TestAddPerturbedCopy:
+    """Tests for add_perturbed_copy function."""
+
+    def test_shifts_axis_of_copy(self):
+        """The copy's axis should be shifted by delta, on the copy's person."""
+        situation = create_situation_with_one_income_axes(
+            is_married=True,
+            state_code="CA",
+            num_children=1,
+            child_ages=[5],
+            qualified_dividend_income=0,
+            long_term_capital_gains=0,
+            short_term_capital_gains=0,
+            deductible_mortgage_interest=0,
+            charitable_cash_donations=0,
+        )
+        perturbed = add_perturbed_copy(situation, 100)
+
+        base_axis, copy_axis = perturbed["axes"][0]
+        assert copy_axis["min"] == base_axis["min"] + 100
+        assert copy_axis["max"] == base_axis["max"] + 100
+        # Three people per household, so the copy's head is person index 3
+        assert copy_axis["index"] == 3
+        # The source situation is left untouched
+        assert situation["axes"][0][0]["min"] == 0
+
+    def test_rejects_two_axes(self):
+        """Only one-axis situations can be perturbed."""
+        situation = create_situation_with_two_axes(
+            is_married=False,
+            state_code="CA",
+            num_children=0,
+            child_ages=[],
+            qualified_dividend_income=0,
+            long_term_capital_gains=0,
+            short_term_capital_gains=0,
+            deductible_mortgage_interest=0,
+            charitable_cash_donations=0,
+        )
+        with pytest.raises(ValueError):
+            add_perturbed_copy(situation, 100)
+
+
+class TestStateCodes:
+    """Tests for the STATE_CODES list used by all-states batches."""
+
+    def test_covers_fifty_states_and_dc(self):
+        """Should list 51 distinct jurisdictions including DC."""
+        assert len(STATE_CODES) == 51
+        assert len(set(STATE_CODES)) == 51
+        assert "DC" in STATE_CODES
+
+    def test_one_household_per_state_combines(self):
+        """Should merge one household per state into one situation."""
+        situations = [
+            create_situation_without_axes(
+                state_code=state_code,
+                real_estate_taxes=0,
+                is_married=False,
+                num_children=0,
+                child_ages=[],
+                qualified_dividend_income=0,
+                long_term_capital_gains=0,
+                short_term_capital_gains=0,
+                deductible_mortgage_interest=0,
+                charitable_cash_donations=0,
+                employment_income=100000,
+            )
+            for state_code in STATE_CODES
+        ]
+        combined = combine_situations(situations)
+        households = list(combined["households"].values())
+        assert [h["state_code"]["2026"] for h in households] == STATE_CODES
+
+    def test_requests_validated(self):
+        """Requests should reject unknown states and drop repeated ones."""
+        household = {"state_code": "NY"}
+        request = AllStatesRequest(household=household, state_codes=["TX", "NY", "TX"])
+        assert request.state_codes == ["TX", "NY"]
+        assert AllStatesRequest(household=household).state_codes is None
+        with pytest.raises(ValidationError, match="XX"):
+            AllStatesRequest(household=household, state_codes=["NY", "XX"])
+
+
+class TestExpandYears:
+    """Tests for expand_years function."""
+
+    def make_situation(self):
+        return create_situation_with_two_axes(
+            is_married=True,
+            state_code="NY",
+            num_children=0,
+            child_ages=[],
+            qualified_dividend_income=0,
+            long_term_capital_gains=0,
+            short_term_capital_gains=0,
+            deductible_mortgage_interest=0,
+            charitable_cash_donations=0,
+            salt_count=3,
+            income_count=4,
+        )
+
+    def test_copies_inputs_to_each_year(self):
+        """Should set every 2026 input for each requested year."""
+        expanded = expand_years(self.make_situation(), [2026, 2030])
+        assert expanded["people"]["spouse"]["age"] == {"2026": 40, "2030": 40}
+        state_code = expanded["households"]["your household"]["state_code"]
+        assert state_code == {"2026": "NY", "2030": "NY"}
+
+    def test_repeats_axes_in_parallel(self):
+        """Should repeat each axis per year within its dimension."""
+        expanded = expand_years(self.make_situation(), [2026, 2030])
+        assert [len(dimension) for dimension in expanded["axes"]] == [2, 2]
+        assert [axis["period"] for axis in expanded["axes"][1]] == [2026, 2030]
+        assert expanded["axes"][0][1]["count"] == 3
+
+    def test_leaves_source_unchanged(self):
+        """Should not modify the input situation."""
+        situation = self.make_situation()
+        expand_years(situation, [2027])
+        assert situation["people"]["you"]["age"] == {"2026": 40}
+
+    def test_rejects_repeated_years(self):
+        """Should raise for empty or repeated years."""
+        with pytest.raises(ValueError):
+            expand_years(self.make_situation(), [2026, 2026])
+        with pytest.raises(ValueError):
+            expand_years(self.make_situation(), [])
+
+    def test_requests_validated(self):
+        """Requests should reject repeated or unsupported years."""
+        household = {"state_code": "NY"}
+        for model in (
+            SinglePointRequest,
+            SaltAxisRequest,
+            IncomeAxisRequest,
+            TwoAxesRequest,
+        ):
+            model(household=household, years=[2026, 2030, 2100])
+            for years in ([2026, 2026], [2025], [2101], []):
+                with pytest.raises(ValidationError):
+                    model(household=household, years=years)
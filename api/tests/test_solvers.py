@@ -0,0 +1,197 @@
+"""Tests for solvers over the SALT x income grid, on stubbed simulations."""
+
+import numpy as np
+import pytest
+
+from salt_amt_api.simulation import solvers
+from salt_amt_api.simulation.solvers import (
+    calculate_amt_frontier,
+    calculate_effective_salt_cap,
+)
+
+HOUSEHOLD = dict(
+    is_married=True,
+    state_code="NY",
+    num_children=0,
+    child_ages=[],
+    qualified_dividend_income=0,
+    long_term_capital_gains=0,
+    short_term_capital_gains=0,
+    deductible_mortgage_interest=0,
+    charitable_cash_donations=0,
+)
+
+
+@pytest.fixture
+def curves(fake_simulation, monkeypatch):
+    """Simulate ``curves[variable](income, salt)`` with nothing screened."""
+    curves = {}
+    fake_simulation.outputs = {
+        variable: lambda x, variable=variable: curves[variable](
+            x["employment_income"], x["reported_salt"]
+        )
+        for variable in ["regular_tax_before_credits", "amt_base_tax", "income_tax"]
+    }
+    monkeypatch.setattr(
+        solvers,
+        "screen_grid_points",
+        lambda system, employment_income, **kwargs: np.zeros(
+            len(employment_income), dtype=bool
+        ),
+    )
+    return curves
+
+
+def simulated(fake_simulation) -> list[int]:
+    """Return the number of points each simulation evaluated."""
+    return [
+        simulation.populations["household"].count
+        for simulation in fake_simulation.created
+    ]
+
+
+def capped_tax(incomes, salts):
+    """Tax falling 24 cents per SALT dollar up to a cap of 5% of income."""
+    cap = 0.05 * incomes
+    return 0.3 * incomes - 0.24 * np.clip(salts, 0, cap)
+
+
+def amt_from(threshold):
+    """AMT of a quarter of income, for incomes of at least ``threshold``."""
+    return lambda incomes, salts: np.where(incomes >= threshold, 0.25 * incomes, 0)
+
+
+class TestCalculateAmtFrontier:
+    """Tests for calculate_amt_frontier function."""
+
+    @pytest.fixture
+    def curves(self, curves):
+        # Regular tax falls 24 cents per SALT dollar, so a quarter-of-income
+        # AMT binds above SALT of income * 0.05 / 0.24
+        curves["regular_tax_before_credits"] = (
+            lambda incomes, salts: 0.3 * incomes - 0.24 * salts
+        )
+        curves["amt_base_tax"] = amt_from(0)
+        return curves
+
+    @pytest.mark.parametrize("tolerance", [100, 5])
+    def test_converges_to_tolerance(self, curves, tolerance):
+        """Should bracket each income's frontier from above within tolerance."""
+        result = calculate_amt_frontier(
+            **HOUSEHOLD,
+            min_income=240000,
+            max_income=480000,
+            income_count=3,
+            tolerance=tolerance,
+        )
+        exact = np.array([50000, 75000, 100000])
+        frontier = np.array(result["frontier_salt"])
+        assert np.all(frontier > exact)
+        assert np.all(frontier - exact <= tolerance)
+        assert result["binds_at_min_salt"] == [False] * 3
+
+    def test_never_binds(self, curves):
+        """Incomes where no scanned SALT binds should have no frontier."""
+        curves["amt_base_tax"] = amt_from(300000)
+        result = calculate_amt_frontier(
+            **HOUSEHOLD, min_income=240000, max_income=480000, income_count=2
+        )
+        assert result["frontier_salt"][0] is None
+        assert result["frontier_salt"][1] == pytest.approx(100000, abs=100)
+        assert result["binds_at_min_salt"] == [False, False]
+
+    def test_always_binds(self, curves):
+        """Incomes bound at min_salt should stop there without bisecting."""
+        curves["regular_tax_before_credits"] = lambda incomes, salts: 0 * salts
+        result = calculate_amt_frontier(
+            **HOUSEHOLD, min_income=100000, max_income=200000, income_count=2
+        )
+        assert result["frontier_salt"] == [-50000.0, -50000.0]
+        assert result["binds_at_min_salt"] == [True, True]
+        assert result["iterations"] == 1
+        assert result["households_simulated"] == 2 * 16
+
+    def test_skips_screened_points(self, curves, fake_simulation, monkeypatch):
+        """Points the AMT screen rules out should not be simulated."""
+        monkeypatch.setattr(
+            solvers,
+            "screen_grid_points",
+            lambda system, employment_income, **kwargs: employment_income < 300000,
+        )
+        result = calculate_amt_frontier(
+            **HOUSEHOLD, min_income=240000, max_income=480000, income_count=2
+        )
+        assert result["frontier_salt"][0] is None
+        assert result["frontier_salt"][1] == pytest.approx(100000, abs=100)
+        calls = simulated(fake_simulation)
+        assert calls[0] == 16
+        assert result["households_simulated"] == sum(calls)
+
+
+class TestCalculateEffectiveSaltCap:
+    """Tests for calculate_effective_salt_cap function."""
+
+    def test_finds_kinks(self, curves, fake_simulation):
+        """Should place each kink exactly and end the cap at the last fall."""
+
+        def two_rates(incomes, salts):
+            # Falls 24 cents per dollar to 47,000, then 10 cents to 113,000
+            return (
+                100000
+                - 0.24 * np.clip(salts, 0, 47000)
+                - 0.10 * np.clip(salts - 47000, 0, 66000)
+            )
+
+        curves["income_tax"] = two_rates
+        result = calculate_effective_salt_cap(**HOUSEHOLD, employment_incomes=[500000])
+        assert result["breakpoints"][0] == pytest.approx([47000, 113000])
+        assert result["income_tax_at_breakpoints"][0] == pytest.approx(
+            [100000 - 0.24 * 47000, 100000 - 0.24 * 47000 - 6600]
+        )
+        assert result["segment_slopes"][0] == pytest.approx([-0.24, -0.10, 0])
+        assert result["effective_cap"] == pytest.approx([113000])
+        calls = simulated(fake_simulation)
+        assert result["households_simulated"] == sum(calls)
+        assert result["iterations"] == len(calls)
+
+    def test_incomes_solved_together(self, curves, fake_simulation):
+        """Each income should get its own cap from shared simulations."""
+        curves["income_tax"] = capped_tax
+        result = calculate_effective_salt_cap(
+            **HOUSEHOLD, employment_incomes=[400000, 1000000]
+        )
+        assert result["effective_cap"] == pytest.approx([20000, 50000])
+        assert len(fake_simulation.created) == result["iterations"]
+
+    def test_no_kink(self, curves):
+        """Tax that SALT never lowers should have no kinks and cap at min_salt."""
+        curves["income_tax"] = lambda incomes, salts: 0.3 * incomes
+        result = calculate_effective_salt_cap(
+            **HOUSEHOLD, employment_incomes=[200000], min_salt=1000
+        )
+        assert result["breakpoints"] == [[]]
+        assert result["segment_slopes"] == [[0.0]]
+        assert result["effective_cap"] == [1000.0]
+        assert result["iterations"] == 1
+
+    def test_still_falling(self, curves):
+        """Tax still falling at max_salt should have no effective cap."""
+        curves["income_tax"] = capped_tax
+        result = calculate_effective_salt_cap(
+            **HOUSEHOLD, employment_incomes=[10000000], max_salt=300000
+        )
+        assert result["breakpoints"] == [[]]
+        assert result["effective_cap"] == [None]
+
+    def test_all_amt(self, curves):
+        """Under AMT, where SALT is not deductible, tax should be flat."""
+
+        def amt(incomes, salts):
+            # AMT binds everywhere, so the regular tax's SALT deduction is
+            # irrelevant
+            return np.maximum(capped_tax(incomes, salts), 0.35 * incomes)
+
+        curves["income_tax"] = amt
+        result = calculate_effective_salt_cap(**HOUSEHOLD, employment_incomes=[300000])
+        assert result["breakpoints"] == [[]]
+        assert result["effective_cap"] == [0.0]
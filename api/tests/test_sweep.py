@@ -0,0 +1,97 @@
+"""Tests for policy sweeps, on stubbed reform runs."""
+
+import pytest
+
+from salt_amt_api.simulation import sweep
+from salt_amt_api.simulation.reforms import enumerate_policy_configs
+from salt_amt_api.simulation.sweep import SWEEP_OUTPUTS, calculate_policy_sweep
+
+HOUSEHOLD = dict(
+    state_code="NY",
+    real_estate_taxes=20000,
+    is_married=True,
+    num_children=0,
+    child_ages=[],
+    qualified_dividend_income=0,
+    long_term_capital_gains=0,
+    short_term_capital_gains=0,
+    deductible_mortgage_interest=0,
+    charitable_cash_donations=0,
+    employment_income=300000,
+)
+
+# Two configurations with different AMT exemptions
+CONFIGS = enumerate_policy_configs()
+FIRST, OTHER = CONFIGS[0], CONFIGS[4]
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    """Replace reform runs with values numbered by run; keys in ``fail`` fail."""
+    runs, fail = [], set()
+
+    def fake_run(situation, baseline_scenario, key):
+        runs.append(key)
+        if key in fail:
+            return {"error": "ValueError: unsupported"}
+        return {"values": {name: float(len(runs)) for name in SWEEP_OUTPUTS}}
+
+    monkeypatch.setattr(sweep, "_run_reform", fake_run)
+    return runs, fail
+
+
+class TestCalculatePolicySweep:
+    """Tests for calculate_policy_sweep function."""
+
+    def test_runs_each_reform_once(self, runs):
+        """Configurations with the same reform should share one run."""
+        calls, _ = runs
+        result = calculate_policy_sweep(
+            **HOUSEHOLD, policy_configs=[FIRST, OTHER, FIRST, OTHER]
+        )
+        assert len(calls) == len(set(calls)) == 2
+        assert result["unique_reforms"] == 2
+        assert result["reform_index"] == [0, 1, 0, 1]
+        assert result["values"]["federal_income_tax"] == [1.0, 2.0, 1.0, 2.0]
+        assert result["errors"] == [None] * 4
+
+    def test_default_configs(self, runs):
+        """Should sweep every enumerable configuration by default."""
+        calls, _ = runs
+        result = calculate_policy_sweep(**HOUSEHOLD)
+        assert result["policy_configs"] == CONFIGS
+        assert len(result["reform_index"]) == len(CONFIGS)
+        assert result["unique_reforms"] == len(calls) < len(CONFIGS)
+        assert sorted(set(result["reform_index"])) == list(range(len(calls)))
+
+    def test_error_rows(self, runs):
+        """Failed reforms should give an error and None values on their rows."""
+        calls, fail = runs
+        calculate_policy_sweep(**HOUSEHOLD, policy_configs=[OTHER])
+        fail.add(calls[0])
+        result = calculate_policy_sweep(
+            **HOUSEHOLD, policy_configs=[FIRST, OTHER, FIRST]
+        )
+        assert result["errors"] == [None, "ValueError: unsupported", None]
+        assert result["values"]["federal_income_tax"] == [2.0, None, 2.0]
+
+    def test_requires_workers(self):
+        """Should need at least one worker."""
+        with pytest.raises(ValueError):
+            calculate_policy_sweep(**HOUSEHOLD, workers=0)
+
+
+class TestSweepExecutor:
+    """Tests for _sweep_executor function."""
+
+    def test_pool_kept_between_sweeps(self, monkeypatch):
+        """The pool should be reused, and replaced only when resized."""
+        monkeypatch.setattr(sweep, "_executor", None)
+        first = sweep._sweep_executor(2)
+        try:
+            assert sweep._sweep_executor(2) is first
+            resized = sweep._sweep_executor(3)
+            assert resized is not first
+            resized.shutdown()
+        finally:
+            first.shutdown()
@@ -0,0 +1,159 @@
+"""Tests for tiles over the two-axes grid."""
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from salt_amt_api.models import TilesRequest, TilesResponse
+from salt_amt_api.simulation import calculation, tiles
+from salt_amt_api.simulation.reforms import CURRENT_POLICY_PARAMS
+from salt_amt_api.simulation.tiles import (
+    TILE_OUTPUTS,
+    TILE_SIZE,
+    TileStore,
+    _compute_tiles,
+    calculate_tiles,
+    tile_axes,
+    tile_steps,
+    tile_key,
+    viewport_tiles,
+)
+
+HOUSEHOLD = dict(
+    is_married=True,
+    state_code="NY",
+    num_children=0,
+    child_ages=[],
+    qualified_dividend_income=0,
+    long_term_capital_gains=0,
+    short_term_capital_gains=0,
+    deductible_mortgage_interest=0,
+    charitable_cash_donations=0,
+)
+
+
+class TestViewportTiles:
+    """Tests for viewport_tiles and tile_axes functions."""
+
+    def test_whole_grid_at_low_resolution(self):
+        """A coarse view of the whole grid should be the single root tile."""
+        assert viewport_tiles(-50000, 250000, 0, 1000000, 32) == (0, [(0, 0)])
+
+    def test_zooms_in_for_small_viewports(self):
+        """Should pick the shallowest level with enough points."""
+        zoom, positions = viewport_tiles(0, 30000, 0, 100000, 16)
+        assert zoom == 3
+        assert positions == [(1, 0), (2, 0)]
+        assert 30000 / tile_steps(zoom)[0] >= 16 > 30000 / tile_steps(zoom - 1)[0]
+
+    def test_child_tiles_contain_parent_points(self):
+        """Every other point of a child tile should be a parent point."""
+        parent_salt, parent_income = tile_axes(2, 1, 3)
+        child_salt, child_income = tile_axes(3, 2, 6)
+        np.testing.assert_allclose(child_salt[::2], parent_salt[: TILE_SIZE // 2])
+        np.testing.assert_allclose(child_income[::2], parent_income[: TILE_SIZE // 2])
+
+    def test_rejects_bad_viewports(self):
+        """Should reject empty or out-of-grid viewports."""
+        with pytest.raises(ValueError):
+            viewport_tiles(10, 10, 0, 1, 32)
+        with pytest.raises(ValueError):
+            viewport_tiles(300000, 400000, 0, 1000, 32)
+
+    def test_requests_validated(self):
+        """Requests for bad viewports should fail validation."""
+        household = {"state_code": "NY"}
+        TilesRequest(household=household)
+        for viewport in [
+            {"min_salt": 10, "max_salt": 10},
+            {"min_income": 2000000, "max_income": 3000000},
+            {"resolution": 2048},
+        ]:
+            with pytest.raises(ValidationError):
+                TilesRequest(household=household, **viewport)
+
+
+class TestTileStore:
+    """Tests for TileStore class."""
+
+    def test_round_trip_memory_mapped(self, tmp_path):
+        """Stored tiles should load back as read-only memory maps."""
+        store = TileStore(str(tmp_path))
+        tile = np.arange(2 * 4, dtype=np.float32).reshape(2, 2, 2)
+        assert store.get("key", 1, 0, 1) is None
+        store.put("key", 1, 0, 1, tile)
+        loaded = store.get("key", 1, 0, 1)
+        assert isinstance(loaded, np.memmap)
+        np.testing.assert_array_equal(loaded, tile)
+
+    def test_key_shared_by_equivalent_scenarios(self):
+        """Either baseline with the same reform should share stored tiles."""
+        assert tile_key(HOUSEHOLD, "Current Policy") == tile_key(
+            HOUSEHOLD, "Current Law", CURRENT_POLICY_PARAMS
+        )
+        assert tile_key(HOUSEHOLD, "Current Law") != tile_key(
+            HOUSEHOLD, "Current Policy"
+        )
+
+
+class TestCalculateTiles:
+    """Tests for calculate_tiles function."""
+
+    def test_computes_once_then_serves_from_store(self, tmp_path, monkeypatch):
+        """Tiles should be simulated once and then read from the store."""
+        computed = []
+
+        def fake_compute(household, system, zoom, positions):
+            computed.extend(positions)
+            return [
+                np.full((len(TILE_OUTPUTS), TILE_SIZE, TILE_SIZE), x + y, np.float32)
+                for x, y in positions
+            ]
+
+        monkeypatch.setattr(tiles, "_compute_tiles", fake_compute)
+        monkeypatch.setattr(tiles, "_create_tax_benefit_system", lambda *a: None)
+        store = TileStore(str(tmp_path))
+        viewport = dict(min_salt=0, max_salt=30000, min_income=0, max_income=100000)
+
+        first = calculate_tiles(**HOUSEHOLD, **viewport, resolution=16, store=store)
+        second = calculate_tiles(**HOUSEHOLD, **viewport, resolution=16, store=store)
+
+        assert computed == [(1, 0), (2, 0)]
+        assert first["computed_tiles"] == 2 and second["computed_tiles"] == 0
+        assert [t["cached"] for t in second["tiles"]] == [True, True]
+        assert second["tiles"][1]["income_tax"] == [2.0] * TILE_SIZE**2
+        TilesResponse(**second)
+
+
+class TestComputeTiles:
+    """Tests for _compute_tiles function."""
+
+    def test_simulated_in_chunks(self, fake_simulation, monkeypatch):
+        """Tiles should be simulated a chunk at a time and split back apart."""
+        fake_simulation.outputs = {
+            "income_tax": lambda x: x["employment_income"],
+            "salt_deduction": lambda x: x["reported_salt"],
+        }
+        monkeypatch.setattr(calculation, "LOW_MEMORY_CHUNK_CELLS", 1000)
+        monkeypatch.setattr(calculation, "_release_simulation", lambda s: None)
+        monkeypatch.setattr(calculation, "prune_simulation", lambda *a: None)
+        monkeypatch.setattr(
+            calculation,
+            "screen_grid_points",
+            lambda system, employment_income, **kwargs: np.zeros(
+                len(employment_income), dtype=bool
+            ),
+        )
+        positions = [(1, 0), (2, 3)]
+        computed = _compute_tiles(HOUSEHOLD, None, 3, positions)
+        assert [s.populations["household"].count for s in fake_simulation.created] == [
+            1000,
+            1000,
+            48,
+        ]
+        for (x, y), tile in zip(positions, computed):
+            salt_values, income_values = tile_axes(3, x, y)
+            income_tax = tile[TILE_OUTPUTS.index("income_tax")]
+            salt_deduction = tile[TILE_OUTPUTS.index("salt_deduction")]
+            np.testing.assert_allclose(income_tax[:, 0], income_values)
+            np.testing.assert_allclose(salt_deduction[0], salt_values)
@@ -7,9 +7,13 @@ import type {
   PolicyConfig,
   SinglePointResult,
   AxisResult,
+  EncodedAxisResult,
   TwoAxesResult,
+  Tile,
+  TilesResult,
   BaselineScenario,
 } from '@/types';
+import { decodeAxisResult } from '@/utils/decodeBreakpoints';
 
 // Modal API endpoints - each function has its own URL
 const MODAL_BASE = 'https://policyengine--salt-amt-api';
@@ -19,6 +23,7 @@ const ENDPOINTS = {
   calculateSaltAxis: `${MODAL_BASE}-calculate-salt-axis.modal.run`,
   calculateIncomeAxis: `${MODAL_BASE}-calculate-income-axis.modal.run`,
   calculateTwoAxes: `${MODAL_BASE}-calculate-two-axes.modal.run`,
+  calculateTiles: `${MODAL_BASE}-calculate-tiles.modal.run`,
 };
 
 // Convert camelCase to snake_case for API
@@ -87,14 +92,17 @@ export async function calculateSaltAxis(
   maxSalt = 300000,
   count = 600
 ): Promise<AxisResult> {
-  return apiCall<AxisResult>(ENDPOINTS.calculateSaltAxis, {
+  // Axis curves are piecewise linear, so fetch their breakpoints only
+  const encoded = await apiCall<EncodedAxisResult>(ENDPOINTS.calculateSaltAxis, {
     household,
     baselineScenario,
     policyConfig,
     minSalt,
     maxSalt,
     count,
+    encoding: 'breakpoints',
   });
+  return decodeAxisResult(encoded);
 }
 
 export async function calculateIncomeAxis(
@@ -105,14 +113,16 @@ export async function calculateIncomeAxis(
   maxIncome = 1000000,
   count = 1000
 ): Promise<AxisResult> {
-  return apiCall<AxisResult>(ENDPOINTS.calculateIncomeAxis, {
+  const encoded = await apiCall<EncodedAxisResult>(ENDPOINTS.calculateIncomeAxis, {
     household,
     baselineScenario,
     policyConfig,
     minIncome,
     maxIncome,
     count,
+    encoding: 'breakpoints',
   });
+  return decodeAxisResult(encoded);
 }
 
 export async function calculateTwoAxes(
@@ -136,6 +146,36 @@ export async function calculateTwoAxes(
   });
 }
 
+// Fetch the grid tiles covering a viewport with at least `resolution`
+// points across it; tiles computed earlier are served from the server's store
+export async function calculateTiles(
+  household: HouseholdInput,
+  baselineScenario: BaselineScenario,
+  viewport: {
+    minSalt: number;
+    maxSalt: number;
+    minIncome: number;
+    maxIncome: number;
+  },
+  resolution = 128,
+  policyConfig?: PolicyConfig
+): Promise<TilesResult> {
+  const result = await apiCall<TilesResult>(ENDPOINTS.calculateTiles, {
+    household,
+    baselineScenario,
+    policyConfig,
+    ...viewport,
+    resolution,
+  });
+  // toCamelCase leaves objects inside arrays alone, so convert each tile
+  return {
+    ...result,
+    tiles: result.tiles.map(
+      (tile) => toCamelCase(tile as unknown as Record<string, unknown>) as unknown as Tile
+    ),
+  };
+}
+
 export async function healthCheck(): Promise<{ status: string; service: string }> {
   const response = await fetch(ENDPOINTS.health);
   return response.json();
@@ -55,6 +55,23 @@ export interface AxisResult {
   reportedSalt?: number[];
   employmentIncome?: number[];
   gap?: number[];
+  marginalIncomeTax?: number[];
+  marginalRegularTax?: number[];
+  marginalAmt?: number[];
+}
+
+export interface BreakpointSeries {
+  index: number[];
+  value: number[];
+}
+
+// Axis result with each series reduced to its breakpoints; decode with
+// decodeAxisResult to recover the dense AxisResult
+export interface EncodedAxisResult {
+  encoding: 'breakpoints';
+  count: number;
+  tolerance: number;
+  series: Record<string, BreakpointSeries>;
 }
 
 export interface TwoAxesResult {
@@ -69,6 +86,31 @@ export interface TwoAxesResult {
   amtBinds: boolean[];
 }
 
+// One tile of the SALT x income grid; outputs are flat, income major
+export interface Tile {
+  x: number;
+  y: number;
+  saltValues: number[];
+  incomeValues: number[];
+  cached: boolean;
+  regularTax: number[];
+  amt: number[];
+  saltDeduction: number[];
+  incomeTax: number[];
+  taxableIncome: number[];
+  amtIncome: number[];
+  amtBinds: boolean[];
+}
+
+export interface TilesResult {
+  zoom: number;
+  tileSize: number;
+  saltStep: number;
+  incomeStep: number;
+  computedTiles: number;
+  tiles: Tile[];
+}
+
 export interface NationwideImpact {
   reform: string;
   totalIncomeChange: number;
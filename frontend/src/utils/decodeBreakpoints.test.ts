@@ -0,0 +1,38 @@
+/**
+ * Tests for breakpoint decoding.
+ */
+
+import { describe, it, expect } from 'vitest';
+import { decodeAxisResult, decodeSeries } from './decodeBreakpoints';
+
+describe('decodeSeries', () => {
+  it('interpolates between breakpoints', () => {
+    const series = { index: [0, 2, 4], value: [0, 10, 10] };
+    expect(decodeSeries(series, 5)).toEqual([0, 5, 10, 10, 10]);
+  });
+
+  it('keeps adjacent breakpoints as steps', () => {
+    const series = { index: [0, 1, 2, 3], value: [0.1, 0.1, 0.22, 0.22] };
+    expect(decodeSeries(series, 4)).toEqual([0.1, 0.1, 0.22, 0.22]);
+  });
+
+  it('repeats a single breakpoint', () => {
+    expect(decodeSeries({ index: [0], value: [7] }, 1)).toEqual([7]);
+  });
+});
+
+describe('decodeAxisResult', () => {
+  it('decodes every series to the full count', () => {
+    const result = decodeAxisResult({
+      encoding: 'breakpoints',
+      count: 3,
+      tolerance: 0.1,
+      series: {
+        axisValues: { index: [0, 2], value: [0, 200] },
+        incomeTax: { index: [0, 1, 2], value: [0, 0, 30] },
+      },
+    });
+    expect(result.axisValues).toEqual([0, 100, 200]);
+    expect(result.incomeTax).toEqual([0, 0, 30]);
+  });
+});
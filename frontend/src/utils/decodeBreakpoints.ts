@@ -0,0 +1,35 @@
+/**
+ * Decode axis results returned with encoding "breakpoints".
+ * Mirrors salt_amt_api/simulation/encoding.py decode_series().
+ */
+
+import type { AxisResult, BreakpointSeries, EncodedAxisResult } from '@/types';
+
+export function decodeSeries(series: BreakpointSeries, count: number): number[] {
+  const { index, value } = series;
+  if (index.length === 1) {
+    return new Array<number>(count).fill(value[0]);
+  }
+  const values = new Array<number>(count);
+  let segment = 0;
+  for (let i = 0; i < count; i++) {
+    // Advance to the segment [index[segment], index[segment + 1]] holding i
+    while (segment < index.length - 2 && index[segment + 1] <= i) {
+      segment++;
+    }
+    const start = index[segment];
+    const end = index[segment + 1];
+    values[i] =
+      value[segment] +
+      ((value[segment + 1] - value[segment]) * (i - start)) / (end - start);
+  }
+  return values;
+}
+
+export function decodeAxisResult(encoded: EncodedAxisResult): AxisResult {
+  const result: Record<string, number[]> = {};
+  for (const [name, series] of Object.entries(encoded.series)) {
+    result[name] = decodeSeries(series, encoded.count);
+  }
+  return result as unknown as AxisResult;
+}